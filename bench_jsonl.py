@@ -0,0 +1,56 @@
+"""
+Benchmark de throughput de jsonl.py.
+
+Genera un JSONL de turnos con N líneas (1.000.000 por defecto) en un
+directorio temporal y mide, en líneas por segundo:
+
+- escritura con write_shifts,
+- lectura con read_shifts (parseo, validación y construcción de Shift),
+- exportación de un Schedule con write_schedule.
+
+Uso:
+    python bench_jsonl.py [--lines N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from jsonl import read_shifts, write_schedule, write_shifts
+from models import DAYS, Schedule, Shift
+
+
+def _shifts(count: int):
+    """Genera turnos sintéticos sin guardarlos en una lista."""
+    for shift_id in range(count):
+        yield Shift(shift_id, DAYS[shift_id % len(DAYS)], shift_id % 24, 4 + shift_id % 5, 1 + shift_id % 3)
+
+
+def _measure(label: str, lines: int, run):
+    started = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<16} {lines:>10,} líneas  {elapsed:7.2f} s  {lines / elapsed:>12,.0f} líneas/s")
+    return result
+
+
+def main(lines: int):
+    with tempfile.TemporaryDirectory() as directory:
+        shifts_path = os.path.join(directory, 'shifts.jsonl')
+        schedule_path = os.path.join(directory, 'schedule.jsonl')
+
+        _measure('write_shifts', lines, lambda: write_shifts(_shifts(lines), shifts_path))
+        print(f"{'':<16} {os.path.getsize(shifts_path) / 2 ** 20:,.1f} MiB")
+        _measure('read_shifts', lines, lambda: sum(1 for _ in read_shifts(shifts_path)))
+
+        schedule = Schedule()
+        for shift_id in range(lines):
+            schedule.assign_employee_to_shift(shift_id % 1000, shift_id)
+        _measure('write_schedule', lines, lambda: write_schedule(schedule, schedule_path))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=1_000_000, help="Cantidad de líneas (por defecto 1.000.000)")
+    main(parser.parse_args().lines)
@@ -0,0 +1,104 @@
+"""
+Benchmark de memoria de los modelos Employee y Shift.
+
+Crea --count empleados y turnos (workloads.generate_workload da los
+valores) y mide con tracemalloc los bytes por objeto de:
+
+- Employee/Shift (con __slots__, día como entero y días no disponibles
+  como máscara de 7 bits),
+- FrozenEmployee/FrozenShift,
+- la forma anterior de referencia: clases con __dict__, el día como
+  string y unavailable_days como set por empleado (definidas aquí solo
+  para comparar).
+
+También mide el costo de is_available en ambas formas.
+
+Uso:
+    python bench_models.py [--count 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from models import DAYS, Employee, FrozenEmployee, FrozenShift, Shift
+from workloads import generate_workload
+
+
+class _DictEmployee:
+    """Empleado con la representación anterior (__dict__ y set de días)."""
+
+    def __init__(self, id, name, max_hours_per_week, unavailable_days):
+        self.id = id
+        self.name = name
+        self.max_hours_per_week = max_hours_per_week
+        self.unavailable_days = set(unavailable_days)
+
+    def is_available(self, day):
+        return day not in self.unavailable_days
+
+
+class _DictShift:
+    """Turno con la representación anterior (__dict__ y día como string)."""
+
+    def __init__(self, id, day, start_hour, duration_hours, required_employees):
+        self.id = id
+        self.day = day
+        self.start_hour = start_hour
+        self.duration_hours = duration_hours
+        self.required_employees = required_employees
+
+
+def bytes_per_object(build, rows: list) -> float:
+    """Bytes asignados por objeto al construir build(*row) para cada fila."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(*row) for row in rows]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # La lista en sí no es parte del costo por objeto
+    allocated -= objects.__sizeof__()
+    return allocated / len(objects)
+
+
+def availability_ns(employees: list, repeat: int = 5) -> float:
+    """Nanosegundos por llamada a is_available sobre todos los días."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for employee in employees:
+            for day in DAYS:
+                employee.is_available(day)
+        best = min(best, time.perf_counter() - started)
+    return best / (len(employees) * len(DAYS)) * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    employees, shifts = generate_workload(args.count, seed=0)
+    employee_rows = [(e.id, e.name, e.max_hours_per_week, e.unavailable_days) for e in employees]
+    # Los nombres vienen de employee_rows y se comparten entre formas; no se cuentan
+    shift_rows = [(s.id, s.day, s.start_hour, s.duration_hours, s.required_employees)
+                  for s in shifts[:args.count]]
+
+    print(f"{'modelo':<16} {'bytes/obj':>10} {'vs anterior':>12}")
+    for label, reference, variants, rows in (
+        ('Employee', _DictEmployee, (Employee, FrozenEmployee), employee_rows),
+        ('Shift', _DictShift, (Shift, FrozenShift), shift_rows),
+    ):
+        baseline = bytes_per_object(reference, rows)
+        print(f"{label + ' (antes)':<16} {baseline:>10.0f} {'':>12}")
+        for variant in variants:
+            size = bytes_per_object(variant, rows)
+            print(f"{variant.__name__:<16} {size:>10.0f} {size / baseline - 1:>+12.0%}")
+
+    dict_employees = [_DictEmployee(*row) for row in employee_rows]
+    print(f"is_available: {availability_ns(dict_employees):.0f} ns antes, "
+          f"{availability_ns(employees):.0f} ns con máscara")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark de assign_shifts y swap_shifts sobre cargas sintéticas.
+
+Para cada tamaño de plantilla genera una carga con workloads.generate_workload
+(misma semilla, mismo resultado) y reporta:
+
+- tiempo de pared de assign_shifts y asignaciones por segundo,
+- cobertura (puestos cubiertos / puestos requeridos),
+- pico de memoria de assign_shifts (tracemalloc, en una corrida aparte
+  para no inflar el tiempo),
+- intercambios por segundo de swap_shifts sobre el horario resultante.
+
+Con --save-baseline guarda los resultados en JSON; con --baseline los
+compara contra un archivo guardado y termina con código 1 si el tiempo o
+la memoria empeoran más que --tolerance, o si baja la cobertura.
+
+bench_baseline.json es la corrida de referencia con los tamaños y la
+semilla por defecto (Python 3.11, sin NumPy, un núcleo). Los tiempos
+dependen de la máquina: para comparar en otra, o después de un cambio
+que mejora los números a propósito, se regenera con --save-baseline. Solo
+necesita la biblioteca estándar; si NumPy está instalado, las tablas
+columnares (--columnar) lo usan en sus operaciones en bloque.
+
+Uso:
+    python bench_scheduler.py [--sizes 10,100,1000,10000] [--seed 0]
+                              [--baseline bench_baseline.json | --save-baseline bench_baseline.json]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import tables
+from scheduler import assign_shifts, swap_shifts
+from workloads import generate_workload
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_SWAPS = 200
+DEFAULT_TOLERANCE = 0.25
+
+# Métricas donde un valor mayor es una regresión (se comparan con tolerancia)
+_LOWER_IS_BETTER = ('wall_time', 'peak_memory_mib')
+# Por debajo de esto las diferencias de tiempo son ruido y no se comparan
+_MIN_COMPARABLE_SECONDS = 0.01
+
+
+def run_size(employee_count: int, seed: int, columnar: bool, swaps: int, measure_memory: bool) -> dict:
+    """Mide un tamaño de plantilla y retorna sus métricas."""
+    employees, shifts = generate_workload(employee_count, seed=seed, columnar=columnar)
+
+    started = time.perf_counter()
+    result = assign_shifts(employees, shifts)
+    wall_time = time.perf_counter() - started
+
+    schedule = result['schedule']
+    assignments = sum(len(employee_ids) for employee_ids in schedule.get_all_assignments().values())
+    required = sum(shift.required_employees for shift in shifts)
+    covered = sum(min(shift.required_employees, len(schedule.get_employees_for_shift(shift.id))) for shift in shifts)
+    metrics = {
+        'employees': len(employees),
+        'shifts': len(shifts),
+        'wall_time': wall_time,
+        'assignments_per_second': assignments / wall_time if wall_time > 0 else 0.0,
+        'coverage': covered / required if required else 1.0,
+    }
+
+    if measure_memory:
+        tracemalloc.start()
+        assign_shifts(employees, shifts)
+        metrics['peak_memory_mib'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    if swaps:
+        metrics['swaps_per_second'] = _measure_swaps(schedule, list(employees), list(shifts), swaps, seed)
+    return metrics
+
+
+def _measure_swaps(schedule, employees: list, shifts: list, count: int, seed: int) -> float:
+    """Intenta `count` intercambios al azar (exitosos o no) y retorna intercambios por segundo."""
+    rng = random.Random(seed)
+    staffed = [shift for shift in shifts if schedule.get_employees_for_shift(shift.id)]
+    if not staffed or not employees:
+        return 0.0
+    attempts = []
+    for _ in range(count):
+        shift = rng.choice(staffed)
+        attempts.append((rng.choice(employees).id, rng.choice(list(schedule.get_employees_for_shift(shift.id))),
+                         shift.id))
+
+    started = time.perf_counter()
+    for employee1_id, employee2_id, shift_id in attempts:
+        # Si el intercambio de un intento anterior ya movió a employee2, este falla rápido
+        swap_shifts(schedule, employee1_id, employee2_id, shift_id, employees, shifts)
+    elapsed = time.perf_counter() - started
+    return count / elapsed if elapsed > 0 else 0.0
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Retorna las regresiones de `results` respecto de `baseline` (vacía si no hay)."""
+    regressions = []
+    for size, metrics in results.items():
+        reference = baseline.get(size)
+        if reference is None:
+            continue
+        for name in _LOWER_IS_BETTER:
+            if name not in metrics or name not in reference:
+                continue
+            if name == 'wall_time' and metrics[name] < _MIN_COMPARABLE_SECONDS:
+                continue
+            if metrics[name] > reference[name] * (1 + tolerance):
+                regressions.append(f"{size} empleados: {name} {metrics[name]:.3f} > {reference[name]:.3f} "
+                                   f"(+{metrics[name] / reference[name] - 1:.0%})")
+        if metrics['coverage'] < reference['coverage'] - 1e-9:
+            regressions.append(f"{size} empleados: coverage {metrics['coverage']:.4f} < {reference['coverage']:.4f}")
+    return regressions
+
+
+def _print_row(size: str, metrics: dict, reference: dict):
+    ratio = f"{metrics['wall_time'] / reference['wall_time']:.2f}x" if reference else '-'
+    memory = f"{metrics['peak_memory_mib']:.1f}" if 'peak_memory_mib' in metrics else '-'
+    swaps = f"{metrics['swaps_per_second']:,.0f}" if 'swaps_per_second' in metrics else '-'
+    print(f"{size:>9} {metrics['shifts']:>9} {metrics['wall_time']:>9.3f} {ratio:>8} "
+          f"{metrics['assignments_per_second']:>12,.0f} {metrics['coverage']:>8.2%} {memory:>9} {swaps:>10}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Tamaños de plantilla separados por coma (por ejemplo 10,1000,100000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--swaps', type=int, default=DEFAULT_SWAPS, help="Intercambios a medir por tamaño (0 omite)")
+    parser.add_argument('--columnar', action='store_true', help="Usar EmployeeTable/ShiftTable")
+    parser.add_argument('--no-memory', action='store_true', help="No medir el pico de memoria")
+    parser.add_argument('--baseline', help="JSON guardado contra el que comparar")
+    parser.add_argument('--save-baseline', help="Guardar los resultados como baseline en este JSON")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Empeoramiento relativo permitido en tiempo y memoria (por defecto 0.25)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+
+    print(f"Python {platform.python_version()}, NumPy {'sí' if tables.np is not None else 'no'}, "
+          f"semilla {args.seed}{', columnar' if args.columnar else ''}")
+    print(f"{'empleados':>9} {'turnos':>9} {'tiempo s':>9} {'vs base':>8} {'asign./s':>12} "
+          f"{'cobert.':>8} {'mem MiB':>9} {'swaps/s':>10}")
+    results = {}
+    for size in (int(value) for value in args.sizes.split(',')):
+        metrics = run_size(size, args.seed, args.columnar, args.swaps, not args.no_memory)
+        results[str(size)] = metrics
+        _print_row(str(size), metrics, baseline.get(str(size)))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump({'python': platform.python_version(), 'seed': args.seed, 'results': results}, file, indent=2)
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESIÓN: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Prueba de carga del servicio de horarios (service.py).
+
+Carga un horario sintético (workloads.generate_workload) con assign y
+después abre --clients conexiones que repiten, cada una --sessions veces,
+el flujo de un pedido de cambio de turno:
+
+    get_shifts_for_employee de un empleado al azar,
+    who_can_cover de uno de sus turnos (top_k=1),
+    swap para que el candidato tome ese turno.
+
+Reporta latencia p50/p99 por operación, peticiones por segundo e
+intercambios exitosos. Sin --port levanta el servicio en este mismo
+proceso (en un puerto libre) y al final verifica que el horario no rompa
+ninguna regla.
+
+Uso:
+    python bench_service.py [--employees 1000] [--clients 32] [--sessions 50] [--seed 0]
+                            [--host 127.0.0.1 --port 8765]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+
+from jsonl import EMPLOYEE_FIELDS, SHIFT_FIELDS
+from service import DEFAULT_HOST, OP_ASSIGN, OP_GET_SHIFTS_FOR_EMPLOYEE, OP_SWAP, OP_WHO_CAN_COVER, ScheduleService
+from workloads import generate_workload
+
+SCHEDULE_NAME = 'bench'
+
+
+class _Client:
+    """Una conexión que envía una petición por vez y espera su respuesta."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self.latencies = {}     # {op: [segundos]}
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> '_Client':
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 26)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **fields):
+        """Envía una petición y retorna su 'result'; lanza RuntimeError si la respuesta es un error."""
+        self._next_id += 1
+        started = time.perf_counter()
+        self._writer.write(json.dumps({'id': self._next_id, 'op': op, 'schedule': SCHEDULE_NAME, **fields}).encode()
+                           + b'\n')
+        await self._writer.drain()
+        response = json.loads(await self._reader.readline())
+        self.latencies.setdefault(op, []).append(time.perf_counter() - started)
+        if not response['ok']:
+            raise RuntimeError(f"{op}: {response['error']}")
+        return response['result']
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+async def _session_loop(client: _Client, employee_ids: list, sessions: int, rng: random.Random) -> int:
+    """Repite el flujo de cambio de turno y retorna cuántos intercambios resultaron."""
+    swapped = 0
+    for _ in range(sessions):
+        holder = rng.choice(employee_ids)
+        shift_ids = await client.request(OP_GET_SHIFTS_FOR_EMPLOYEE, employee_id=holder)
+        if not shift_ids:
+            continue
+        shift_id = rng.choice(shift_ids)
+        candidates = await client.request(OP_WHO_CAN_COVER, shift_id=shift_id, top_k=1)
+        if not candidates:
+            continue
+        result = await client.request(OP_SWAP, employee1_id=candidates[0]['employee_id'], employee2_id=holder,
+                                      shift_id=shift_id)
+        swapped += result['success']
+    return swapped
+
+
+async def run(host: str, port: int, employee_count: int, clients: int, sessions: int, seed: int) -> dict:
+    """Carga el horario, corre los clientes y retorna las métricas."""
+    employees, shifts = generate_workload(employee_count, seed=seed)
+    loader = await _Client.connect(host, port)
+    await loader.request(OP_ASSIGN,
+                         employees=[{name: (sorted(e.unavailable_days) if name == 'unavailable_days'
+                                            else getattr(e, name)) for name in EMPLOYEE_FIELDS} for e in employees],
+                         shifts=[{name: getattr(s, name) for name in SHIFT_FIELDS} for s in shifts])
+    await loader.close()
+
+    connections = [await _Client.connect(host, port) for _ in range(clients)]
+    employee_ids = [employee.id for employee in employees]
+    started = time.perf_counter()
+    swapped = await asyncio.gather(*(_session_loop(client, employee_ids, sessions, random.Random(seed + index))
+                                     for index, client in enumerate(connections)))
+    elapsed = time.perf_counter() - started
+    for client in connections:
+        await client.close()
+
+    latencies = {}
+    for client in connections:
+        for op, values in client.latencies.items():
+            latencies.setdefault(op, []).extend(values)
+    requests = sum(len(values) for values in latencies.values())
+    return {
+        'elapsed': elapsed,
+        'requests_per_second': requests / elapsed if elapsed > 0 else 0.0,
+        'swaps': sum(swapped),
+        'latency': {op: {'count': len(values), 'p50': percentile(sorted(values), 0.50),
+                         'p99': percentile(sorted(values), 0.99)}
+                    for op, values in latencies.items()},
+    }
+
+
+def _rule_violations(service: ScheduleService) -> list[str]:
+    """Revisa el horario final del servicio contra las reglas de negocio."""
+    entry = service._entries[SCHEDULE_NAME]
+    schedule = entry.schedule
+    violations = []
+    for employee in entry.employees:
+        shifts = sorted((schedule.get_shift(shift_id) for shift_id in schedule.get_shifts_for_employee(employee.id)),
+                        key=lambda shift: shift.week_start())
+        if sum(shift.duration_hours for shift in shifts) > employee.max_hours_per_week:
+            violations.append(f"Employee {employee.id} excede sus horas máximas")
+        violations.extend(f"Employee {employee.id} no está disponible el {shift.day}"
+                          for shift in shifts if not employee.is_available(shift.day))
+        violations.extend(f"Employee {employee.id} tiene turnos solapados {first.id} y {second.id}"
+                          for first, second in zip(shifts, shifts[1:]) if second.week_start() < first.week_end())
+    return violations
+
+
+async def _main(args) -> int:
+    service = None
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        service = ScheduleService()
+        server = await service.serve(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    try:
+        metrics = await run(host, port, args.employees, args.clients, args.sessions, args.seed)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+    print(f"{args.clients} clientes x {args.sessions} sesiones en {metrics['elapsed']:.2f} s, "
+          f"{metrics['requests_per_second']:,.0f} peticiones/s, {metrics['swaps']} intercambios")
+    print(f"{'operación':<24} {'peticiones':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for op, stats in sorted(metrics['latency'].items()):
+        print(f"{op:<24} {stats['count']:>10} {stats['p50'] * 1000:>9.2f} {stats['p99'] * 1000:>9.2f}")
+
+    if service is not None:
+        violations = _rule_violations(service)
+        for violation in violations[:10]:
+            print(f"VIOLACIÓN: {violation}")
+        return 1 if violations else 0
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--sessions', type=int, default=50, help="Flujos de cambio de turno por cliente")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, help="Puerto de un servicio ya levantado (por defecto, uno propio)")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
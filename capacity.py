@@ -0,0 +1,212 @@
+"""
+Análisis de capacidad previo a la asignación.
+
+Antes de resolver, compara la demanda de horas-persona de los turnos
+(required_employees × duration_hours) con la oferta máxima posible de la
+plantilla. Todas las cotas son optimistas para la oferta, así que cada
+faltante que reporta es seguro: ninguna asignación puede evitarlo.
+
+- Por turno: empleados elegibles (disponibles ese día y con
+  max_hours_per_week >= duración). Con menos elegibles que required, el
+  turno queda incompleto; sin ninguno, no se puede cubrir.
+- Por hora de la semana: los turnos activos a la misma hora se solapan
+  entre sí, así que cada empleado cubre como mucho uno. Si la demanda de
+  personas a esa hora supera a los empleados disponibles en alguno de los
+  días de esos turnos, falta gente en esa franja.
+- Por día y por semana: horas-persona requeridas contra horas que la
+  plantilla puede dar como máximo.
+
+La demanda y la oferta por hora se arman con arreglos de diferencias y
+sumas prefijas sobre la línea de tiempo semanal, así que el costo es
+O(E + S log E + horas) y responde en milisegundos aun para plantillas
+grandes.
+"""
+
+import bisect
+import math
+
+from models import ALL_DAYS_MASK, DAYS, HOURS_PER_DAY, HOURS_PER_WEEK
+
+DEFAULT_WINDOW_HOURS = 4
+
+
+def analyze_capacity(employees, shifts, window_hours: int = DEFAULT_WINDOW_HOURS) -> dict:
+    """
+    Calcula cotas de capacidad y faltantes garantizados sin resolver.
+
+    Args:
+        employees: Empleados (lista o tables.EmployeeTable)
+        shifts: Turnos (lista o tables.ShiftTable)
+        window_hours: Ancho de las ventanas del perfil 'windows'
+
+    Returns:
+        dict con estructura:
+        {
+            'required_hours': horas-persona requeridas en la semana,
+            'available_hours': cota superior de horas que puede dar la plantilla,
+            'days': {día: {'required_hours': int, 'available_hours': int}},
+            'windows': [{'start': hora de la semana, 'end': ..., 'required_hours': int,
+                         'available_hours': int}] cada window_hours, desde el lunes 0:00,
+            'shortages': [{'start': ..., 'end': ..., 'required_staff': int, 'available_staff': int}]
+                         franjas contiguas donde se requieren más personas a la vez de las
+                         que pueden estar disponibles (con el máximo de la franja),
+            'shift_limits': {shift_id: puestos que como máximo se pueden cubrir},
+            'infeasible_shift_ids': [turnos con puestos requeridos y ningún elegible],
+            'unfilled_lower_bound': puestos que seguro quedan sin cubrir,
+            'warnings': [mensajes para quien arma la plantilla]
+        }
+        Las horas de la semana cuentan desde el lunes 0:00; un turno del
+        domingo que cruza medianoche sigue más allá de HOURS_PER_WEEK.
+    """
+    if window_hours <= 0:
+        raise ValueError(f"window_hours debe ser positivo: {window_hours}")
+
+    shifts = list(shifts)
+    horizon = max([HOURS_PER_WEEK] + [shift.week_end() for shift in shifts])
+    longest = {day: 0 for day in range(len(DAYS))}
+    for shift in shifts:
+        longest[shift.day_index] = max(longest[shift.day_index], shift.duration_hours)
+
+    # Oferta: máximo semanal de cada empleado disponible, por día (ordenado, para contar con bisect),
+    # y cantidad de empleados por máscara de disponibilidad (para la cota por hora)
+    shortest = min((shift.duration_hours for shift in shifts), default=0)
+    max_hours_by_day = {day: [] for day in range(len(DAYS))}
+    employees_by_mask = [0] * (ALL_DAYS_MASK + 1)
+    day_supply = [0] * len(DAYS)
+    available_hours = 0
+    for employee in employees:
+        if employee.max_hours_per_week < shortest:
+            continue
+        mask = employee.availability_mask()
+        employees_by_mask[mask] += 1
+        reachable = 0
+        for day in range(len(DAYS)):
+            if mask >> day & 1:
+                max_hours_by_day[day].append(employee.max_hours_per_week)
+                # Los turnos que empiezan el mismo día sin solaparse caben en [0:00, 23:00 + el más largo)
+                day_cap = min(employee.max_hours_per_week, HOURS_PER_DAY - 1 + longest[day]) if longest[day] else 0
+                day_supply[day] += day_cap
+                reachable += day_cap
+        available_hours += min(employee.max_hours_per_week, reachable)
+    for hours in max_hours_by_day.values():
+        hours.sort()
+
+    # Demanda: personas requeridas por hora y turnos activos por día de inicio, con arreglos de diferencias
+    demand = [0] * (horizon + 1)
+    active_by_day = [[0] * (horizon + 1) for _ in DAYS]
+    day_demand = [0] * len(DAYS)
+    shift_limits = {}
+    infeasible = []
+    shift_shortfall = 0
+    warnings = []
+    for shift in sorted(shifts, key=lambda s: (s.week_start(), s.id)):
+        start, end = shift.week_start(), shift.week_end()
+        demand[start] += shift.required_employees
+        demand[end] -= shift.required_employees
+        active_by_day[shift.day_index][start] += 1
+        active_by_day[shift.day_index][end] -= 1
+        day_demand[shift.day_index] += shift.required_employees * shift.duration_hours
+
+        candidates = max_hours_by_day[shift.day_index]
+        eligible = len(candidates) - bisect.bisect_left(candidates, shift.duration_hours)
+        shift_limits[shift.id] = min(shift.required_employees, eligible)
+        missing = shift.required_employees - shift_limits[shift.id]
+        if missing > 0:
+            shift_shortfall += missing
+            label = f"Shift {shift.id} ({shift.day} {shift.start_hour}:00)"
+            if eligible == 0:
+                infeasible.append(shift.id)
+                warnings.append(f"{label} no se puede cubrir: ningún empleado disponible ese día "
+                                f"tiene {shift.duration_hours}h de máximo semanal")
+            else:
+                warnings.append(f"{label} puede cubrir como máximo {eligible} de {shift.required_employees} puestos")
+
+    # Sumas prefijas: demanda y oferta por hora, y sus acumulados para las ventanas
+    staff_for_days = [sum(count for mask, count in enumerate(employees_by_mask) if mask & days)
+                      for days in range(ALL_DAYS_MASK + 1)]
+    required_staff = []
+    available_staff = []
+    running = 0
+    running_by_day = [0] * len(DAYS)
+    for hour in range(horizon):
+        running += demand[hour]
+        days = 0
+        for day in range(len(DAYS)):
+            running_by_day[day] += active_by_day[day][hour]
+            if running_by_day[day]:
+                days |= 1 << day
+        required_staff.append(running)
+        available_staff.append(staff_for_days[days])
+    required_prefix = _prefix_sums(required_staff)
+    available_prefix = _prefix_sums(available_staff)
+
+    windows = [{'start': start, 'end': min(start + window_hours, horizon),
+                'required_hours': required_prefix[min(start + window_hours, horizon)] - required_prefix[start],
+                'available_hours': available_prefix[min(start + window_hours, horizon)] - available_prefix[start]}
+               for start in range(0, horizon, window_hours)]
+
+    shortages = []
+    for hour in range(horizon):
+        if required_staff[hour] <= available_staff[hour]:
+            continue
+        if shortages and shortages[-1]['end'] == hour:
+            shortage = shortages[-1]
+            shortage['end'] = hour + 1
+            if required_staff[hour] - available_staff[hour] > shortage['required_staff'] - shortage['available_staff']:
+                shortage['required_staff'], shortage['available_staff'] = required_staff[hour], available_staff[hour]
+        else:
+            shortages.append({'start': hour, 'end': hour + 1, 'required_staff': required_staff[hour],
+                              'available_staff': available_staff[hour]})
+    for shortage in shortages:
+        warnings.append(f"{_format_hour(shortage['start'])}-{_format_hour(shortage['end'])}: se requieren "
+                        f"{shortage['required_staff']} empleados a la vez y solo {shortage['available_staff']} "
+                        f"pueden estar disponibles")
+
+    days = {}
+    hours_shortfall = 0
+    for day, name in enumerate(DAYS):
+        days[name] = {'required_hours': day_demand[day], 'available_hours': day_supply[day]}
+        if day_demand[day] > day_supply[day]:
+            hours_shortfall += day_demand[day] - day_supply[day]
+            warnings.append(f"{name}: se requieren {day_demand[day]}h y la plantilla puede dar como máximo "
+                            f"{day_supply[day]}h (faltan {day_demand[day] - day_supply[day]}h)")
+    required_hours = sum(day_demand)
+    if required_hours > available_hours:
+        hours_shortfall = max(hours_shortfall, required_hours - available_hours)
+        warnings.append(f"La semana requiere {required_hours}h y la plantilla puede dar como máximo "
+                        f"{available_hours}h (faltan {required_hours - available_hours}h)")
+
+    longest_shift = max(longest.values())
+    unfilled_lower_bound = max(
+        shift_shortfall,
+        max((required - available for required, available in zip(required_staff, available_staff)), default=0),
+        math.ceil(hours_shortfall / longest_shift) if longest_shift else 0,
+    )
+    return {
+        'required_hours': required_hours,
+        'available_hours': available_hours,
+        'days': days,
+        'windows': windows,
+        'shortages': shortages,
+        'shift_limits': shift_limits,
+        'infeasible_shift_ids': infeasible,
+        'unfilled_lower_bound': unfilled_lower_bound,
+        'warnings': warnings,
+    }
+
+
+# ============================================================================
+# FUNCIONES AUXILIARES
+# ============================================================================
+
+def _prefix_sums(values: list) -> list:
+    """Helper: prefix[i] = suma de values[:i]."""
+    prefix = [0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+    return prefix
+
+
+def _format_hour(week_hour: int) -> str:
+    """Helper: 'monday 6:00' para una hora de la semana (las de la semana siguiente vuelven al lunes)."""
+    return f"{DAYS[week_hour // HOURS_PER_DAY % len(DAYS)]} {week_hour % HOURS_PER_DAY}:00"
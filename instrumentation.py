@@ -0,0 +1,97 @@
+"""
+Instrumentación opcional de assign_shifts y swap_shifts.
+
+Se activa pasando una Instrumentation a la función; sin ella no se mide
+nada y el código sigue el camino normal (el único costo es comprobar una
+vez por fase que la instrumentación es None).
+
+Con ella se acumulan:
+
+- timings: segundos por fase y por regla ('hours_check',
+  'overlap_check', incluidos dentro de su fase). Las fases son las que
+  scheduler.py abre con _phase(): 'setup', 'sort', 'availability',
+  'selection', 'capacity', 'solver' y 'warnings' en assign_shifts, y
+  'lookup', 'validation' y 'apply' en swap_shifts,
+- counters: candidatos examinados y rechazados por regla
+  ('rejected_unavailable', 'rejected_hours', 'rejected_overlap'),
+  asignaciones hechas, etc.
+
+y se notifican a los hooks registrados los eventos EVENT_*. El resultado
+de la función incluye stats() en la clave 'stats'. Una misma
+Instrumentation puede reutilizarse en varias llamadas para acumular.
+"""
+
+import time
+from contextlib import contextmanager
+
+# Eventos para los hooks, con los argumentos (por nombre) que reciben
+EVENT_PHASE = 'phase'               # name, seconds
+EVENT_REJECTION = 'rejection'       # employee_id, shift_id, reason
+EVENT_ASSIGNMENT = 'assignment'     # employee_id, shift_id
+
+
+class Instrumentation:
+    """
+    Acumula tiempos por fase y contadores, y despacha eventos a hooks.
+
+    Ejemplo:
+        instrumentation = Instrumentation()
+        instrumentation.add_hook(EVENT_REJECTION, lambda **event: print(event))
+        result = assign_shifts(employees, shifts, instrumentation=instrumentation)
+        result['stats']['timings']['overlap_check']
+    """
+
+    def __init__(self, hooks: dict = None):
+        """
+        Args:
+            hooks: {evento: [callbacks]} opcional; ver add_hook
+        """
+        self.timings = {}       # {nombre: segundos}
+        self.counters = {}      # {nombre: cantidad}
+        self._hooks = {}
+        for event, callbacks in (hooks or {}).items():
+            for callback in callbacks:
+                self.add_hook(event, callback)
+
+    def add_hook(self, event: str, callback):
+        """
+        Registra callback(**datos) para un evento (EVENT_PHASE,
+        EVENT_REJECTION o EVENT_ASSIGNMENT). Los hooks corren de forma
+        sincrónica dentro de la función instrumentada.
+        """
+        if event not in (EVENT_PHASE, EVENT_REJECTION, EVENT_ASSIGNMENT):
+            raise ValueError(f"Evento desconocido: {event!r}")
+        self._hooks.setdefault(event, []).append(callback)
+
+    def wants(self, event: str) -> bool:
+        """Indica si hay hooks para el evento (para no armar datos que nadie usa)."""
+        return event in self._hooks
+
+    def emit(self, event: str, **data):
+        """Llama a los hooks del evento con `data` como argumentos por nombre."""
+        for callback in self._hooks.get(event, ()):
+            callback(**data)
+
+    def count(self, name: str, amount: int = 1):
+        """Suma `amount` al contador `name`."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_time(self, name: str, seconds: float):
+        """Suma `seconds` al timer `name`."""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mide el bloque como la fase `name` y emite EVENT_PHASE al terminar."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.add_time(name, seconds)
+            if EVENT_PHASE in self._hooks:
+                self.emit(EVENT_PHASE, name=name, seconds=seconds)
+
+    def stats(self) -> dict:
+        """Retorna una copia de {'timings': {...}, 'counters': {...}}."""
+        return {'timings': dict(self.timings), 'counters': dict(self.counters)}
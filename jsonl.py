@@ -0,0 +1,214 @@
+"""
+Lectura y escritura en streaming de empleados, turnos y horarios en JSONL.
+
+Formato: un objeto JSON por línea; las líneas en blanco se ignoran.
+
+    Empleado: {"id": 1, "name": "Ana", "max_hours_per_week": 40, "unavailable_days": ["sunday"]}
+    Turno:    {"id": 1, "day": "monday", "start_hour": 8, "duration_hours": 8, "required_employees": 2}
+
+unavailable_days es opcional (por defecto, ninguno). Cualquier otra clave,
+una clave faltante o un tipo incorrecto es un error.
+
+Los lectores son generadores: parsean una línea por vez y nunca arman la
+lista completa. Los errores se reportan como ValueError con el número de
+línea. Para plantillas grandes se pueden volcar directamente a tablas
+columnares, por ejemplo EmployeeTable.from_employees(read_employees(path)).
+
+Los escritores emiten una línea por registro a medida que recorren los
+datos, sin construir la salida completa en memoria.
+"""
+
+import itertools
+import json
+import os
+
+from models import Employee, Schedule, Shift
+
+# Esquemas: {campo: tipo exacto}. Se compara con type() para rechazar bool como int.
+EMPLOYEE_FIELDS = {'id': int, 'name': str, 'max_hours_per_week': int, 'unavailable_days': list}
+SHIFT_FIELDS = {'id': int, 'day': str, 'start_hour': int, 'duration_hours': int, 'required_employees': int}
+_OPTIONAL_EMPLOYEE_FIELDS = {'unavailable_days'}
+
+# Tipos de línea en la salida de write_schedule
+RECORD_ASSIGNMENT = 'assignment'
+RECORD_WARNING = 'warning'
+
+# Líneas por llamada a write(): acota la memoria de la salida a un bloque
+_WRITE_BLOCK = 1024
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+_raw_decode = json.JSONDecoder().raw_decode
+
+
+def read_employees(source):
+    """
+    Lee empleados de un JSONL.
+
+    Args:
+        source: Ruta del archivo o iterable de líneas (por ejemplo, un archivo abierto)
+
+    Yields:
+        Employee, uno por línea no vacía
+
+    Raises:
+        ValueError: Si una línea no es JSON válido o no cumple el esquema,
+                    con el número de línea en el mensaje
+    """
+    for line_number, record in _read_records(source, EMPLOYEE_FIELDS, _OPTIONAL_EMPLOYEE_FIELDS):
+        try:
+            yield _employee_from_record(record)
+        except ValueError as error:
+            raise ValueError(f"Línea {line_number}: {error}") from None
+
+
+def read_shifts(source):
+    """
+    Lee turnos de un JSONL. Ver read_employees.
+
+    Yields:
+        Shift, uno por línea no vacía
+    """
+    for line_number, record in _read_records(source, SHIFT_FIELDS, ()):
+        try:
+            yield _shift_from_record(record)
+        except ValueError as error:
+            raise ValueError(f"Línea {line_number}: {error}") from None
+
+
+def write_employees(employees, target) -> int:
+    """
+    Escribe empleados en JSONL, en el formato que lee read_employees.
+
+    Args:
+        employees: Iterable de Employee
+        target: Ruta del archivo o archivo de texto abierto para escritura
+
+    Returns:
+        int: Cantidad de líneas escritas
+    """
+    lines = (f'{{"id":{_value(employee.id)},"name":{_value(employee.name)},'
+             f'"max_hours_per_week":{_value(employee.max_hours_per_week)},'
+             f'"unavailable_days":{_encode(sorted(employee.unavailable_days))}}}\n'
+             for employee in employees)
+    return _write_lines(lines, target)
+
+
+def write_shifts(shifts, target) -> int:
+    """Escribe turnos en JSONL, en el formato que lee read_shifts. Ver write_employees."""
+    lines = (f'{{"id":{_value(shift.id)},"day":{_value(shift.day)},"start_hour":{_value(shift.start_hour)},'
+             f'"duration_hours":{_value(shift.duration_hours)},'
+             f'"required_employees":{_value(shift.required_employees)}}}\n'
+             for shift in shifts)
+    return _write_lines(lines, target)
+
+
+def write_schedule(schedule: Schedule, target, warnings=()) -> int:
+    """
+    Escribe las asignaciones de un horario y sus warnings en JSONL.
+
+    Recorre la vista de get_all_assignments() sin copiarla y emite:
+
+        {"type": "assignment", "shift_id": 1, "employee_ids": [1, 3]}
+        {"type": "warning", "message": "Shift 3 (...) tiene solo 1 empleado asignado, necesita 2"}
+
+    Args:
+        schedule: Horario a exportar
+        target: Ruta del archivo o archivo de texto abierto para escritura
+        warnings: Iterable de mensajes (por ejemplo, result['warnings'])
+
+    Returns:
+        int: Cantidad de líneas escritas
+    """
+    def lines():
+        for shift_id, employee_ids in schedule.get_all_assignments().items():
+            yield (f'{{"type":"{RECORD_ASSIGNMENT}","shift_id":{_value(shift_id)},'
+                   f'"employee_ids":[{",".join(map(_value, employee_ids))}]}}\n')
+        for message in warnings:
+            yield f'{{"type":"{RECORD_WARNING}","message":{_value(message)}}}\n'
+
+    return _write_lines(lines(), target)
+
+
+# ============================================================================
+# FUNCIONES AUXILIARES
+# ============================================================================
+
+def _read_records(source, fields: dict, optional):
+    """
+    Helper: Genera (número de línea, dict) validando claves y tipos contra
+    `fields`. Si `source` es una ruta, abre y cierra el archivo.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as lines:
+            yield from _read_records(lines, fields, optional)
+        return
+
+    all_fields = fields.keys()
+    required = all_fields - set(optional)
+    for line_number, line in enumerate(source, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record, end = _raw_decode(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Línea {line_number}: JSON no válido ({error.msg})") from None
+        if end != len(line):
+            raise ValueError(f"Línea {line_number}: datos extra después del objeto JSON")
+        try:
+            _check_record(record, fields, all_fields, required)
+        except ValueError as error:
+            raise ValueError(f"Línea {line_number}: {error}") from None
+        yield line_number, record
+
+
+def _check_record(record, fields: dict, all_fields, required):
+    """Helper: Valida que `record` sea un objeto con las claves y tipos de `fields`."""
+    if type(record) is not dict:
+        raise ValueError("se esperaba un objeto JSON")
+    keys = record.keys()
+    if keys != all_fields:
+        if keys - all_fields:
+            raise ValueError(f"campos desconocidos {sorted(keys - all_fields)}")
+        if required - keys:
+            raise ValueError(f"faltan campos {sorted(required - keys)}")
+    for name, value in record.items():
+        if type(value) is not fields[name]:
+            raise ValueError(f"{name} debe ser {fields[name].__name__}, no {type(value).__name__}")
+
+
+def _employee_from_record(record: dict) -> Employee:
+    """Helper: Employee a partir de un registro ya validado contra EMPLOYEE_FIELDS."""
+    unavailable_days = record.get('unavailable_days', ())
+    if not all(isinstance(day, str) for day in unavailable_days):
+        raise ValueError("unavailable_days debe ser una lista de strings")
+    return Employee(record['id'], record['name'], record['max_hours_per_week'], unavailable_days)
+
+
+def _shift_from_record(record: dict) -> Shift:
+    """Helper: Shift a partir de un registro ya validado contra SHIFT_FIELDS."""
+    return Shift(record['id'], record['day'], record['start_hour'],
+                 record['duration_hours'], record['required_employees'])
+
+
+def _value(value) -> str:
+    """Helper: Codifica un valor JSON; los int (el caso común) sin pasar por el encoder."""
+    return str(value) if type(value) is int else _encode(value)
+
+
+def _write_lines(lines, target) -> int:
+    """
+    Helper: Escribe líneas ya codificadas, de a bloques para reducir las
+    llamadas a write(). Si `target` es una ruta, abre y cierra el archivo.
+    """
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, 'w', encoding='utf-8') as out:
+            return _write_lines(lines, out)
+
+    count = 0
+    while True:
+        block = list(itertools.islice(lines, _WRITE_BLOCK))
+        if not block:
+            return count
+        target.write(''.join(block))
+        count += len(block)
@@ -1,39 +1,97 @@
 """
 Modelos para el sistema de gestión de turnos.
-
-TODO: Completa la implementación de las clases.
 """
 
+import bisect
+import heapq
+import weakref
+from collections import OrderedDict
+
+# Días válidos de la semana, en orden (lunes primero).
+DAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+DAY_INDEX = {day: index for index, day in enumerate(DAYS)}
+HOURS_PER_DAY = 24
+HOURS_PER_WEEK = len(DAYS) * HOURS_PER_DAY
+ALL_DAYS_MASK = (1 << len(DAYS)) - 1
+# {día o índice: bit del día}, para probar disponibilidad con un solo AND
+DAY_BITS = {**{day: 1 << index for index, day in enumerate(DAYS)}, **{index: 1 << index for index in range(len(DAYS))}}
+
+
+def days_to_mask(days) -> int:
+    """
+    Codifica un conjunto de días (nombres o índices de DAYS) como máscara
+    de 7 bits (bit i = DAYS[i]).
+    """
+    mask = 0
+    invalid = []
+    for day in days:
+        bit = DAY_BITS.get(day) if type(day) in (str, int) else None
+        if bit is None:
+            invalid.append(day)
+        else:
+            mask |= bit
+    if invalid:
+        raise ValueError(f"Días no válidos en unavailable_days: {sorted(map(str, invalid))}")
+    return mask
+
+
 class Employee:
     """
     Representa un empleado con sus restricciones.
-    
+
     Atributos:
         id (int): Identificador único
         name (str): Nombre del empleado
         max_hours_per_week (int): Máximo de horas que puede trabajar por semana
-        unavailable_days (set): Conjunto de días en los que NO puede trabajar
-                                Valores válidos: 'monday', 'tuesday', 'wednesday', 
+        unavailable_days (frozenset): Conjunto de días en los que NO puede trabajar
+                                Valores válidos: 'monday', 'tuesday', 'wednesday',
                                 'thursday', 'friday', 'saturday', 'sunday'
+                                (también se aceptan índices 0-6 de DAYS)
+
+    Usa __slots__ y guarda unavailable_days como máscara de 7 bits, así que
+    is_available es una sola prueba de bit. unavailable_days se puede
+    reasignar, pero el conjunto que retorna es inmutable. Ver FrozenEmployee
+    para una versión de solo lectura.
     """
-    
+
+    __slots__ = ('id', 'name', 'max_hours_per_week', 'unavailable_mask')
+
     def __init__(self, id: int, name: str, max_hours_per_week: int, unavailable_days: set):
-        # TODO: Implementar inicialización
-        pass
-    
-    def is_available(self, day: str) -> bool:
+        if max_hours_per_week < 0:
+            raise ValueError(f"max_hours_per_week no puede ser negativo: {max_hours_per_week}")
+
+        self.id = id
+        self.name = name
+        self.max_hours_per_week = max_hours_per_week
+        self.unavailable_mask = days_to_mask(unavailable_days)
+
+    @property
+    def unavailable_days(self) -> frozenset:
+        """Días no disponibles, derivados de unavailable_mask."""
+        return frozenset(DAYS[index] for index in range(len(DAYS)) if self.unavailable_mask >> index & 1)
+
+    @unavailable_days.setter
+    def unavailable_days(self, days):
+        self.unavailable_mask = days_to_mask(days)
+
+    def is_available(self, day) -> bool:
         """
         Verifica si el empleado está disponible en un día específico.
-        
+
         Args:
-            day: Día de la semana (ej: 'monday')
-            
+            day: Día de la semana (ej: 'monday', o su índice en DAYS)
+
         Returns:
             bool: True si está disponible, False si no
         """
-        # TODO: Implementar
-        pass
-    
+        return not self.unavailable_mask & DAY_BITS[day]
+
+    def availability_mask(self) -> int:
+        """
+        Retorna los días disponibles como máscara de 7 bits (bit i = DAYS[i]).
+        """
+        return ALL_DAYS_MASK & ~self.unavailable_mask
+
     def __repr__(self):
         return f"Employee({self.id}, {self.name})"
 
@@ -41,124 +99,1234 @@ class Employee:
 class Shift:
     """
     Representa un turno de trabajo.
-    
+
     Atributos:
         id (int): Identificador único
-        day (str): Día de la semana
+        day (str): Día de la semana (se acepta también su índice en DAYS)
+        day_index (int): Posición del día en DAYS (lunes = 0)
         start_hour (int): Hora de inicio (0-23)
         duration_hours (int): Duración en horas
         required_employees (int): Cantidad de empleados necesarios
+
+    Usa __slots__ y guarda el día como entero; `day` se deriva de él. Ver
+    FrozenShift para una versión de solo lectura.
     """
-    
-    def __init__(self, id: int, day: str, start_hour: int, duration_hours: int, required_employees: int):
-        # TODO: Implementar inicialización
-        # Considera agregar validaciones básicas
-        pass
-    
+
+    __slots__ = ('id', 'day_index', 'start_hour', 'duration_hours', 'required_employees')
+
+    def __init__(self, id: int, day, start_hour: int, duration_hours: int, required_employees: int):
+        if not 0 <= start_hour <= 23:
+            raise ValueError(f"start_hour debe estar entre 0 y 23: {start_hour}")
+        if duration_hours <= 0:
+            raise ValueError(f"duration_hours debe ser positivo: {duration_hours}")
+        if required_employees < 0:
+            raise ValueError(f"required_employees no puede ser negativo: {required_employees}")
+
+        self.id = id
+        self.day_index = _day_index(day)
+        self.start_hour = start_hour
+        self.duration_hours = duration_hours
+        self.required_employees = required_employees
+
+    @property
+    def day(self) -> str:
+        """Nombre del día, derivado de day_index."""
+        return DAYS[self.day_index]
+
+    @day.setter
+    def day(self, day):
+        self.day_index = _day_index(day)
+
     def end_hour(self) -> int:
         """
         Calcula la hora de finalización del turno.
-        
+
         Returns:
             int: Hora de finalización (puede ser >= 24 si cruza medianoche)
         """
-        # TODO: Implementar
-        pass
-    
+        return self.start_hour + self.duration_hours
+
+    def week_start(self) -> int:
+        """
+        Hora absoluta de inicio dentro de la semana (lunes 0:00 = 0).
+        """
+        return self.day_index * HOURS_PER_DAY + self.start_hour
+
+    def week_end(self) -> int:
+        """
+        Hora absoluta de fin dentro de la semana. Un turno que cruza
+        medianoche termina en el día siguiente de la línea de tiempo.
+        """
+        return self.day_index * HOURS_PER_DAY + self.start_hour + self.duration_hours
+
     def overlaps_with(self, other_shift) -> bool:
         """
         Verifica si este turno se solapa con otro turno.
-        Dos turnos se solapan si son el mismo día y sus horarios se cruzan.
-        
+        Dos turnos se solapan si sus horarios se cruzan en la línea de tiempo
+        semanal: normalmente son del mismo día, pero un turno que cruza
+        medianoche (end_hour() > 24) también solapa con los del día siguiente.
+
         Args:
             other_shift (Shift): Otro turno para comparar
-            
+
         Returns:
             bool: True si hay solapamiento, False si no
         """
-        # TODO: Implementar
-        # Pista: primero verifica si son el mismo día
-        pass
-    
+        # Intervalos semiabiertos [inicio, fin): turnos consecutivos no se solapan
+        return self.week_start() < other_shift.week_end() and other_shift.week_start() < self.week_end()
+
     def __repr__(self):
         return f"Shift({self.id}, {self.day}, {self.start_hour}:00-{self.end_hour()}:00)"
 
 
+class FrozenEmployee(Employee):
+    """
+    Employee de solo lectura: no admite asignar atributos después de
+    construirse, y se compara y hashea por valor (sirve como clave de dict).
+    """
+
+    __slots__ = ()
+
+    def __init__(self, id: int, name: str, max_hours_per_week: int, unavailable_days: set):
+        _freeze_from(self, Employee(id, name, max_hours_per_week, unavailable_days))
+
+    def __setattr__(self, name, value):
+        _read_only(self)
+
+    def __delattr__(self, name):
+        _read_only(self)
+
+    def _key(self) -> tuple:
+        return self.id, self.name, self.max_hours_per_week, self.unavailable_mask
+
+    def __eq__(self, other):
+        return self._key() == other._key() if isinstance(other, FrozenEmployee) else NotImplemented
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+class FrozenShift(Shift):
+    """Shift de solo lectura, comparable y hasheable por valor. Ver FrozenEmployee."""
+
+    __slots__ = ()
+
+    def __init__(self, id: int, day, start_hour: int, duration_hours: int, required_employees: int):
+        _freeze_from(self, Shift(id, day, start_hour, duration_hours, required_employees))
+
+    def __setattr__(self, name, value):
+        _read_only(self)
+
+    def __delattr__(self, name):
+        _read_only(self)
+
+    def _key(self) -> tuple:
+        return self.id, self.day_index, self.start_hour, self.duration_hours, self.required_employees
+
+    def __eq__(self, other):
+        return self._key() == other._key() if isinstance(other, FrozenShift) else NotImplemented
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+def _freeze_from(frozen, template):
+    """Copia los slots ya validados de `template` sin pasar por el __setattr__ bloqueado."""
+    for name in type(template).__slots__:
+        object.__setattr__(frozen, name, getattr(template, name))
+
+
+def _read_only(instance):
+    raise AttributeError(f"{type(instance).__name__} es de solo lectura")
+
+
+def _day_index(day) -> int:
+    """Índice en DAYS de un día dado por nombre o por índice."""
+    index = DAY_INDEX.get(day) if isinstance(day, str) else day
+    if type(index) is not int or not 0 <= index < len(DAYS):
+        raise ValueError(f"Día no válido: {day!r}")
+    return index
+
+
+class AvailabilityIndex:
+    """
+    Índice invertido día -> empleados disponibles, guardado como bitsets.
+
+    Cada empleado recibe una posición de bit fija; por cada día se guarda un
+    entero cuyo bit `position` vale 1 si el empleado está disponible ese
+    día. Filtrar candidatos de un turno es entonces un AND entre enteros en
+    lugar de llamar a is_available por empleado.
+
+    El índice no observa los objetos Employee: si cambian los
+    unavailable_days de un empleado, llama a update_employee() para
+    actualizar solo sus bits (O(7)).
+    """
+
+    def __init__(self, employees=()):
+        self._positions = {}                # {employee_id: posición de bit}
+        self._ids = []                      # [employee_id por posición]
+        self._masks = {}                    # {employee_id: máscara de días disponibles}
+        self._day_bits = [0] * len(DAYS)    # Un bitset de empleados por día
+        for employee in employees:
+            self.update_employee(employee)
+
+    def update_employee(self, employee: Employee):
+        """
+        Agrega un empleado o refleja un cambio en sus unavailable_days.
+        """
+        position = self._positions.get(employee.id)
+        if position is None:
+            position = self._positions[employee.id] = len(self._ids)
+            self._ids.append(employee.id)
+        new_mask = employee.availability_mask()
+        changed = self._masks.get(employee.id, 0) ^ new_mask
+        self._masks[employee.id] = new_mask
+        self._flip_days(changed, 1 << position)
+
+    def remove_employee(self, employee_id: int):
+        """
+        Quita un empleado del índice. Su posición de bit no se reutiliza.
+        """
+        mask = self._masks.pop(employee_id, 0)
+        if employee_id in self._positions:
+            self._flip_days(mask, 1 << self._positions[employee_id])
+
+    def copy(self) -> 'AvailabilityIndex':
+        """Retorna una copia independiente del índice, en O(E)."""
+        clone = AvailabilityIndex()
+        clone._positions = dict(self._positions)
+        clone._ids = list(self._ids)
+        clone._masks = dict(self._masks)
+        clone._day_bits = list(self._day_bits)
+        return clone
+
+    def _flip_days(self, day_mask: int, bit: int):
+        for day_index in range(len(DAYS)):
+            if day_mask >> day_index & 1:
+                self._day_bits[day_index] ^= bit
+
+    def bit(self, employee_id: int) -> int:
+        """Retorna el bit asignado al empleado (0 si no está indexado)."""
+        position = self._positions.get(employee_id)
+        return 0 if position is None else 1 << position
+
+    def available_bits(self, day: str) -> int:
+        """Retorna el bitset de empleados disponibles ese día."""
+        return self._day_bits[DAY_INDEX[day]]
+
+    def is_available(self, employee_id: int, day: str) -> bool:
+        """Equivalente a Employee.is_available, con un único AND de bits."""
+        return bool(self.available_bits(day) & self.bit(employee_id))
+
+    def employees_available(self, day: str) -> list:
+        """Retorna los IDs de empleados disponibles ese día, en orden de indexación."""
+        # Recorrer la representación binaria es O(E); ir aislando el bit más
+        # bajo costaría O(E) por cada empleado disponible.
+        bits = bin(self.available_bits(day))[:1:-1]
+        return [self._ids[position] for position, bit in enumerate(bits) if bit == '1']
+
+
+class _RemainingHoursIndex:
+    """
+    Por día, los empleados disponibles ordenados por horas restantes
+    (max_hours_per_week - horas asignadas) de mayor a menor, con desempate
+    por id. Cada día es una lista ordenada de (-restantes, employee_id).
+
+    Schedule lo arma la primera vez que se pide (O(E log E)) y desde ahí lo
+    actualiza en cada cambio de horas o de plantilla: mover a un empleado
+    cuesta una bisección y un memmove por cada día en que está disponible.
+    Las listas son compartidas por todos los empleados, así que no admiten
+    escrituras concurrentes desde varios hilos.
+    """
+
+    def __init__(self):
+        self._days = [[] for _ in DAYS]     # Por día: [(-restantes, employee_id)] ordenada
+        self._entries = {}                  # {employee_id: (-restantes, máscara de días)}
+
+    def update(self, employee_id: int, remaining: int, mask: int):
+        """Agrega un empleado o refleja un cambio en sus horas restantes o su disponibilidad."""
+        self.remove(employee_id)
+        key = (-remaining, employee_id)
+        self._entries[employee_id] = (-remaining, mask)
+        for day_index in range(len(DAYS)):
+            if mask >> day_index & 1:
+                bisect.insort(self._days[day_index], key)
+
+    def remove(self, employee_id: int):
+        """Quita un empleado del índice (si estaba)."""
+        entry = self._entries.pop(employee_id, None)
+        if entry is None:
+            return
+        key = (entry[0], employee_id)
+        for day_index in range(len(DAYS)):
+            if entry[1] >> day_index & 1:
+                ranked = self._days[day_index]
+                del ranked[bisect.bisect_left(ranked, key)]
+
+    def ranked(self, day) -> list:
+        """Lista ordenada (-restantes, employee_id) del día; no debe modificarse."""
+        return self._days[_day_index(day)]
+
+
+class ConflictGraph:
+    """
+    Grafo precalculado de solapamientos entre turnos.
+
+    Se construye con un barrido (sweep line) sobre la línea de tiempo
+    semanal: los turnos se ordenan por week_start y se mantiene un heap de
+    los turnos "activos" ordenado por week_end. Al llegar a un turno se
+    descartan los activos que ya terminaron y todos los que quedan se
+    solapan con él. Costo O(S log S + K), con K = cantidad de pares que se
+    solapan, en lugar de llamar overlaps_with para los S² pares. Los turnos
+    que cruzan medianoche se manejan solos porque week_end pasa al día
+    siguiente.
+
+    Después, conflicting_shifts(shift_id) es una consulta O(1).
+    """
+
+    def __init__(self, shifts=()):
+        self._shifts = {}           # {shift_id: Shift}
+        self._adjacency = {}        # {shift_id: {shift_id: None}}
+        self._starts = []           # [(week_start, week_end, shift_id)] ordenada, para add_shift
+        self._max_duration = 0
+
+        ordered = sorted((shift.week_start(), shift.week_end(), shift.id, shift) for shift in shifts)
+        active = []                 # heap de (week_end, shift_id)
+        for start, end, shift_id, shift in ordered:
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            neighbors = self._adjacency[shift_id] = {}
+            for _, other_id in active:
+                neighbors[other_id] = None
+                self._adjacency[other_id][shift_id] = None
+            heapq.heappush(active, (end, shift_id))
+            self._shifts[shift_id] = shift
+            self._starts.append((start, end, shift_id))
+            self._max_duration = max(self._max_duration, shift.duration_hours)
+
+    def __contains__(self, shift_id) -> bool:
+        return shift_id in self._shifts
+
+    def __len__(self):
+        return len(self._shifts)
+
+    def get_shift(self, shift_id: int):
+        """Retorna el Shift con ese ID, o None si no está en el grafo."""
+        return self._shifts.get(shift_id)
+
+    def conflicting_shifts(self, shift_id: int):
+        """
+        Retorna en O(1) una vista de solo lectura con los IDs de turnos que
+        se solapan con `shift_id` (sin incluirlo).
+        """
+        return self._adjacency.get(shift_id, _EMPTY_BUCKET).keys()
+
+    def add_shift(self, shift):
+        """
+        Agrega un turno, buscando sus vecinos por bisección. Si ya existía un
+        turno con ese ID, se reemplaza.
+        """
+        self.remove_shift(shift.id)
+        start, end = shift.week_start(), shift.week_end()
+        self._max_duration = max(self._max_duration, shift.duration_hours)
+        position = bisect.bisect_left(self._starts, (start,))
+
+        neighbors = self._adjacency[shift.id] = {}
+        index = position - 1
+        while index >= 0 and self._starts[index][0] > start - self._max_duration:
+            if self._starts[index][1] > start:
+                neighbors[self._starts[index][2]] = None
+            index -= 1
+        index = position
+        while index < len(self._starts) and self._starts[index][0] < end:
+            neighbors[self._starts[index][2]] = None
+            index += 1
+
+        for other_id in neighbors:
+            self._adjacency[other_id][shift.id] = None
+        self._shifts[shift.id] = shift
+        bisect.insort(self._starts, (start, end, shift.id))
+
+    def copy(self) -> 'ConflictGraph':
+        """Retorna una copia independiente del grafo, en O(S + K) y sin barrido."""
+        clone = ConflictGraph()
+        clone._shifts = dict(self._shifts)
+        clone._adjacency = {shift_id: dict(neighbors) for shift_id, neighbors in self._adjacency.items()}
+        clone._starts = list(self._starts)
+        clone._max_duration = self._max_duration
+        return clone
+
+    def remove_shift(self, shift_id: int):
+        """Quita un turno y sus aristas. Si no existe no hace nada."""
+        shift = self._shifts.pop(shift_id, None)
+        if shift is None:
+            return
+        for other_id in self._adjacency.pop(shift_id):
+            del self._adjacency[other_id][shift_id]
+        entry = (shift.week_start(), shift.week_end(), shift_id)
+        del self._starts[bisect.bisect_left(self._starts, entry)]
+
+
+class FeasibilityCache:
+    """
+    Memo acotado (LRU) de verificaciones de factibilidad por (empleado, turno).
+
+    Guarda el resultado de las reglas que dependen del horario (horas
+    máximas y solapamiento; ver scheduler._schedule_rejection_reason): None
+    si el empleado puede tomar el turno, o el motivo de rechazo.
+
+    Adjunto a un Schedule (attach_feasibility_cache), se invalida de forma
+    dirigida: cuando cambian los turnos u horas de un empleado solo se
+    descartan sus entradas, y cuando cambia la definición de un turno, las
+    de ese turno y las de los empleados asignados a él (cuyas líneas de
+    tiempo cambiaron, que es lo que afecta a los turnos que se solapan).
+
+    Las entradas valen solo para el Schedule al que está adjunto: adjuntarlo
+    a otro (por ejemplo, al reutilizarlo en otra llamada a assign_shifts)
+    lo vacía.
+    """
+
+    # Centinela de get(): la entrada no está (None es un valor válido)
+    MISS = object()
+
+    def __init__(self, max_size: int = 100_000):
+        if max_size <= 0:
+            raise ValueError(f"max_size debe ser positivo: {max_size}")
+        self.max_size = max_size
+        self._entries = OrderedDict()   # {(employee_id, shift_id): motivo o None}, en orden LRU
+        self._by_employee = {}          # {employee_id: {shift_id: None}}
+        self._by_shift = {}             # {shift_id: {employee_id: None}}
+        self._owner = None              # weakref al Schedule adjunto
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, employee_id: int, shift_id: int):
+        """Retorna el valor cacheado o FeasibilityCache.MISS."""
+        key = (employee_id, shift_id)
+        value = self._entries.get(key, self.MISS)
+        if value is self.MISS:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, employee_id: int, shift_id: int, value):
+        """Guarda un resultado, desalojando el menos usado si hace falta."""
+        key = (employee_id, shift_id)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._by_employee.setdefault(employee_id, {})[shift_id] = None
+        self._by_shift.setdefault(shift_id, {})[employee_id] = None
+        if len(self._entries) > self.max_size:
+            (old_employee_id, old_shift_id), _ = self._entries.popitem(last=False)
+            self._forget(old_employee_id, old_shift_id)
+            self.evictions += 1
+
+    def invalidate_employee(self, employee_id: int):
+        """Descarta todas las entradas de un empleado."""
+        for shift_id in self._by_employee.pop(employee_id, _EMPTY_BUCKET):
+            del self._entries[(employee_id, shift_id)]
+            self._discard(self._by_shift, shift_id, employee_id)
+            self.invalidations += 1
+
+    def invalidate_shift(self, shift_id: int):
+        """Descarta todas las entradas de un turno."""
+        for employee_id in self._by_shift.pop(shift_id, _EMPTY_BUCKET):
+            del self._entries[(employee_id, shift_id)]
+            self._discard(self._by_employee, employee_id, shift_id)
+            self.invalidations += 1
+
+    def clear(self):
+        """Descarta todas las entradas (los contadores se conservan)."""
+        self._entries.clear()
+        self._by_employee.clear()
+        self._by_shift.clear()
+
+    def bind(self, schedule):
+        """
+        Asocia el cache a `schedule`. Si estaba asociado a otro Schedule, sus
+        entradas no valen para este y se descartan.
+        """
+        owner = self._owner() if self._owner is not None else None
+        if owner is not schedule:
+            self.clear()
+            self._owner = weakref.ref(schedule)
+
+    def stats(self) -> dict:
+        """Contadores para verificar que el cache rinde."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+        }
+
+    def _forget(self, employee_id, shift_id):
+        self._discard(self._by_employee, employee_id, shift_id)
+        self._discard(self._by_shift, shift_id, employee_id)
+
+    @staticmethod
+    def _discard(index: dict, key, member):
+        bucket = index[key]
+        del bucket[member]
+        if not bucket:
+            del index[key]
+
+
+class _ReadOnlyDict(dict):
+    """
+    dict que rechaza modificaciones desde fuera.
+
+    Se usa para exponer los índices internos de Schedule sin copiarlos:
+    sigue siendo un dict (isinstance funciona), pero cualquier intento de
+    mutarlo lanza TypeError. Schedule lo actualiza vía dict.__setitem__.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Las asignaciones son de solo lectura; usa los métodos de Schedule")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+# Bucket vacío compartido para consultas sobre IDs sin asignaciones
+_EMPTY_BUCKET = {}
+
+# Marcadores internos de _LayeredDict
+_ABSENT = object()
+_DELETED = object()
+
+
+class _LayeredDict:
+    """
+    Mapa por capas para Schedule.fork(): una capa local mutable sobre una
+    cadena de capas congeladas que pueden compartir varios horarios.
+
+    Las lecturas bajan por la cadena hasta encontrar la clave; las
+    escrituras van siempre a la capa local y los borrados de claves de
+    capas inferiores dejan una lápida (_DELETED). Recorrer el mapa completo
+    (items, keys, values, iteración) lo aplana en O(n).
+    """
+
+    __slots__ = ('_local', '_parent', '_depth', '_len')
+
+    # Con más capas que esto, fork() aplana la cadena para acotar las lecturas
+    MAX_DEPTH = 16
+
+    def __init__(self, local: dict, parent: '_LayeredDict' = None, length: int = None):
+        self._local = local
+        self._parent = parent
+        self._depth = 0 if parent is None else parent._depth + 1
+        self._len = len(local) if length is None else length
+
+    def get(self, key, default=None):
+        layer = self
+        while layer is not None:
+            value = layer._local.get(key, _ABSENT)
+            if value is not _ABSENT:
+                return default if value is _DELETED else value
+            layer = layer._parent
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _ABSENT) is not _ABSENT
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._len += 1
+        self._local[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._len -= 1
+        if self._parent is not None and key in self._parent:
+            self._local[key] = _DELETED
+        else:
+            del self._local[key]
+
+    def pop(self, key, default=None):
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            return default
+        del self[key]
+        return value
+
+    def setdefault(self, key, default):
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            self[key] = value = default
+        return value
+
+    def __len__(self):
+        return self._len
+
+    def _layers(self) -> list:
+        """Retorna las capas desde la local hasta la base."""
+        layers = []
+        layer = self
+        while layer is not None:
+            layers.append(layer)
+            layer = layer._parent
+        return layers
+
+    def flatten(self) -> dict:
+        """Retorna un dict con el contenido visible, en O(n)."""
+        merged = {}
+        for layer in reversed(self._layers()):
+            for key, value in layer._local.items():
+                if value is _DELETED:
+                    merged.pop(key, None)
+                else:
+                    merged[key] = value
+        return merged
+
+    def keys(self):
+        return self.flatten().keys()
+
+    def values(self):
+        return self.flatten().values()
+
+    def items(self):
+        return self.flatten().items()
+
+    def __iter__(self):
+        return iter(self.flatten())
+
+
+def _fork_mapping(mapping) -> tuple:
+    """
+    Congela el contenido de `mapping` (dict o _LayeredDict) como capa
+    compartida y retorna dos _LayeredDict vacíos encima de ella: uno para
+    quien se bifurca y otro para la copia. `mapping` no debe volver a
+    modificarse. O(1), salvo cuando la cadena supera MAX_DEPTH.
+    """
+    if not isinstance(mapping, _LayeredDict):
+        base = _LayeredDict(mapping)
+    elif not mapping._local and mapping._parent is not None:
+        # Nada escrito desde el último fork: se reutiliza la capa vacía para
+        # que bifurcar muchas veces el mismo horario no alargue la cadena.
+        return mapping, _LayeredDict({}, mapping._parent, len(mapping))
+    elif mapping._depth >= _LayeredDict.MAX_DEPTH:
+        base = _LayeredDict(mapping.flatten())
+    else:
+        base = mapping
+    return _LayeredDict({}, base, len(base)), _LayeredDict({}, base, len(base))
+
+
+def _changed_keys(first, second):
+    """
+    Retorna las claves que pueden diferir entre dos mapas bifurcados del
+    mismo origen (las escritas por encima de su capa común), o None si no
+    comparten capas y hay que compararlos completos.
+    """
+    if not isinstance(first, _LayeredDict) or not isinstance(second, _LayeredDict):
+        return None
+    first_layers = first._layers()
+    shared = {id(layer) for layer in first_layers}
+    keys = set()
+    for layer in second._layers():
+        if id(layer) in shared:
+            break
+        keys.update(layer._local)
+    else:
+        return None
+    for own in first_layers:
+        if own is layer:
+            break
+        keys.update(own._local)
+    return keys
+
+
+# Índices de Schedule que fork() congela y comparte por capas
+_FORKED_FIELDS = ('_employees_by_shift', '_shifts_by_employee', '_shifts', '_timelines',
+                  '_hours', '_open_shifts', '_busy_until', '_employees')
+
+
 class Schedule:
     """
     Representa un horario de turnos asignados.
-    
+
     Mantiene el registro de qué empleados están asignados a qué turnos.
+
+    Decisión de diseño: se mantienen dos índices sincronizados,
+    turno -> empleados y empleado -> turnos. Cada bucket es un dict con
+    valores None, que funciona como un conjunto ordenado por inserción:
+    pertenencia, alta y baja son O(1) y el orden de iteración es
+    determinista. Las consultas devuelven vistas de solo lectura
+    (dict_keys) sobre esos buckets en lugar de copias.
+
+    Para detectar conflictos de horario y controlar horas, el Schedule
+    guarda un catálogo de turnos conocidos (ver register_shifts) y, por
+    empleado, una línea de tiempo ordenada de intervalos
+    [week_start, week_end) y un acumulado de horas asignadas. Las
+    asignaciones a turnos que no están en el catálogo se registran igual,
+    pero no cuentan en la línea de tiempo ni en las horas hasta que el
+    turno se registra. También lleva el conjunto de turnos registrados que
+    aún no tienen required_employees (ver get_open_shift_ids).
+
+    Opcionalmente guarda la plantilla de empleados (ver register_employees)
+    con su índice de disponibilidad, para operaciones que reparan el
+    horario sin recibir la lista completa (scheduler.update_schedule).
+
+    Si se le adjunta un ConflictGraph (attach_conflict_graph), has_conflict
+    lo usa para los turnos que contiene, y el grafo se mantiene al día con
+    los cambios del catálogo. Del mismo modo, un FeasibilityCache adjunto
+    (attach_feasibility_cache) se invalida con cada cambio relevante.
+
+    fork() crea en O(1) una copia copy-on-write para evaluar alternativas
+    (what-if): padre e hijo comparten los buckets y cada uno copia solo el
+    bucket que modifica por primera vez. diff() lista las asignaciones que
+    difieren entre dos horarios.
+
+    Un Schedule admite un solo escritor a la vez: cada alta o baja
+    actualiza índices compartidos por todos los empleados (horas, índice de
+    horas restantes, caches adjuntos), así que dos hilos no deben
+    modificarlo a la vez aunque toquen empleados y turnos distintos. Quien
+    lo use desde varios hilos debe serializar las modificaciones (ver
+    service._Entry.swap).
     """
-    
-    def __init__(self):
+
+    def __init__(self, shifts=None, employees=None):
         """
         Inicializa un horario vacío.
-        
-        Sugerencia de estructura de datos:
-        - Un diccionario {shift_id: [employee_ids]}
-        - O la estructura que prefieras
-        """
-        # TODO: Implementar inicialización
-        pass
-    
+
+        Args:
+            shifts: Turnos opcionales para registrar en el catálogo
+            employees: Empleados opcionales para registrar en la plantilla
+        """
+        self._employees_by_shift = {}   # {shift_id: {employee_id: None}}
+        self._shifts_by_employee = {}   # {employee_id: {shift_id: None}}
+        # Vista pública {shift_id: vista de employee_ids}, actualizada solo
+        # cuando se crea o se elimina un bucket de turno.
+        self._assignments_view = _ReadOnlyDict()
+
+        self._shifts = {}               # {shift_id: Shift}
+        self._timelines = {}            # {employee_id: [(week_start, week_end, shift_id)] ordenada}
+        self._hours = {}                # {employee_id: horas de turnos registrados}
+        self._max_duration = 0          # Acota cuánto hay que retroceder en la línea de tiempo
+        self._open_shifts = {}          # {shift_id: None} registrados con menos de required_employees
+        self._busy_until = {}           # {employee_id: hora de la semana} ocupado desde la semana anterior
+
+        self._employees = {}            # {employee_id: Employee}
+        self._availability = AvailabilityIndex()
+        self._conflict_graph = None
+        self._feasibility_cache = None
+        self._remaining_index = None    # _RemainingHoursIndex, armado al primer pedido
+
+        # Tras fork(): {'shift'|'employee'|'timeline': claves de buckets propios}.
+        # None significa que todos los buckets son propios (nunca se bifurcó).
+        self._owned_buckets = None
+        self._availability_shared = False
+        self._graph_shared = False
+        if shifts is not None:
+            self.register_shifts(shifts)
+        if employees is not None:
+            self.register_employees(employees)
+
+    def register_shifts(self, shifts):
+        """
+        Registra turnos en el catálogo del horario.
+
+        Es idempotente: los turnos ya registrados se ignoran. Si un turno
+        nuevo ya tenía empleados asignados, se agrega a sus líneas de tiempo
+        y a sus horas.
+
+        Args:
+            shifts: Iterable de Shift
+        """
+        for shift in shifts:
+            if shift.id in self._shifts:
+                continue
+            self._shifts[shift.id] = shift
+            self._max_duration = max(self._max_duration, shift.duration_hours)
+            for employee_id in self._employees_by_shift.get(shift.id, _EMPTY_BUCKET):
+                self._index_shift(employee_id, shift)
+            self._refresh_open(shift.id)
+            if self._conflict_graph is not None and self._conflict_graph.get_shift(shift.id) is not shift:
+                self._own_conflict_graph().add_shift(shift)
+            if self._feasibility_cache is not None:
+                self._feasibility_cache.invalidate_shift(shift.id)
+
+    def attach_conflict_graph(self, graph: ConflictGraph):
+        """
+        Adjunta un grafo de solapamientos precalculado. Los turnos del
+        catálogo que no estén en el grafo se agregan; desde aquí, los
+        cambios del catálogo también lo actualizan.
+        """
+        self._conflict_graph = graph
+        self._graph_shared = False
+        for shift in self._shifts.values():
+            if graph.get_shift(shift.id) is not shift:
+                graph.add_shift(shift)
+
+    def get_conflict_graph(self):
+        """Retorna el ConflictGraph adjunto, o None."""
+        return self._conflict_graph
+
+    def attach_feasibility_cache(self, cache: FeasibilityCache):
+        """
+        Adjunta un cache de factibilidad; desde aquí, cada cambio del horario
+        invalida solo las entradas afectadas. Si el cache venía de otro
+        Schedule, se vacía (FeasibilityCache.bind).
+        """
+        cache.bind(self)
+        self._feasibility_cache = cache
+
+    def get_feasibility_cache(self):
+        """Retorna el FeasibilityCache adjunto, o None."""
+        return self._feasibility_cache
+
+    def replace_shift(self, shift):
+        """
+        Reemplaza la definición de un turno registrado (o lo registra),
+        recalculando líneas de tiempo y horas de sus empleados asignados.
+        No valida que las asignaciones sigan cumpliendo las reglas.
+        """
+        self.unregister_shift(shift.id, keep_assignments=True)
+        self.register_shifts([shift])
+
+    def unregister_shift(self, shift_id: int, keep_assignments: bool = False):
+        """
+        Quita un turno del catálogo y, salvo keep_assignments, también sus
+        asignaciones.
+        """
+        shift = self._shifts.pop(shift_id, None)
+        employee_ids = list(self._employees_by_shift.get(shift_id, _EMPTY_BUCKET))
+        if shift is not None:
+            for employee_id in employee_ids:
+                self._unindex_shift(employee_id, shift)
+            if self._conflict_graph is not None:
+                self._own_conflict_graph().remove_shift(shift_id)
+            if self._feasibility_cache is not None:
+                self._feasibility_cache.invalidate_shift(shift_id)
+        if not keep_assignments:
+            for employee_id in employee_ids:
+                self.remove_employee_from_shift(employee_id, shift_id)
+        self._open_shifts.pop(shift_id, None)
+
+    def get_shift(self, shift_id: int):
+        """
+        Retorna el Shift registrado con ese ID, o None si no está en el catálogo.
+        """
+        return self._shifts.get(shift_id)
+
+    def get_open_shift_ids(self):
+        """
+        Retorna una vista de solo lectura con los turnos registrados que
+        tienen menos empleados de los requeridos, en orden de registro.
+        En un horario bifurcado (fork) la vista es una instantánea.
+        """
+        return self._open_shifts.keys()
+
+    def _refresh_open(self, shift_id: int):
+        """Actualiza en O(1) si un turno registrado está incompleto."""
+        shift = self._shifts.get(shift_id)
+        if shift is not None and len(self._employees_by_shift.get(shift_id, _EMPTY_BUCKET)) < shift.required_employees:
+            self._open_shifts[shift_id] = None
+        else:
+            self._open_shifts.pop(shift_id, None)
+
+    def register_employees(self, employees):
+        """
+        Registra empleados en la plantilla del horario. Los ya registrados
+        se reemplazan, actualizando solo sus bits de disponibilidad.
+
+        Args:
+            employees: Iterable de Employee
+        """
+        for employee in employees:
+            self._employees[employee.id] = employee
+            self._own_availability().update_employee(employee)
+            self._refresh_remaining(employee.id)
+            if self._feasibility_cache is not None:
+                self._feasibility_cache.invalidate_employee(employee.id)
+
+    def unregister_employee(self, employee_id: int):
+        """Quita un empleado de la plantilla y de todos sus turnos."""
+        for shift_id in list(self.get_shifts_for_employee(employee_id)):
+            self.remove_employee_from_shift(employee_id, shift_id)
+        self._employees.pop(employee_id, None)
+        self._own_availability().remove_employee(employee_id)
+        if self._remaining_index is not None:
+            self._remaining_index.remove(employee_id)
+        if self._feasibility_cache is not None:
+            self._feasibility_cache.invalidate_employee(employee_id)
+
+    def get_employee(self, employee_id: int):
+        """
+        Retorna el Employee registrado con ese ID, o None si no está en la plantilla.
+        """
+        return self._employees.get(employee_id)
+
+    def get_employees_available(self, day: str) -> list:
+        """Retorna los IDs de empleados registrados disponibles ese día."""
+        return self._availability.employees_available(day)
+
+    def get_employees_by_remaining_hours(self, day) -> list:
+        """
+        Retorna, para un día (nombre o índice), los empleados registrados
+        disponibles como lista ordenada de (-horas restantes, employee_id):
+        de más a menos horas restantes y, a igualdad, por id. Sirve para
+        recorrer solo el comienzo de la lista (who_can_cover con top_k).
+
+        El índice se arma en el primer pedido y desde ahí se mantiene al día
+        en cada alta, baja o cambio de plantilla (register_employees). La
+        lista es del índice: no debe modificarse ni recorrerse mientras
+        cambia el horario (ver la nota sobre un solo escritor en Schedule).
+        """
+        if self._remaining_index is None:
+            self._remaining_index = _RemainingHoursIndex()
+            for employee_id in self._employees:
+                self._refresh_remaining(employee_id)
+        return self._remaining_index.ranked(day)
+
+    def _refresh_remaining(self, employee_id: int):
+        """Actualiza las horas restantes del empleado en el índice, si está armado."""
+        if self._remaining_index is None:
+            return
+        employee = self._employees.get(employee_id)
+        if employee is None:
+            self._remaining_index.remove(employee_id)
+        else:
+            self._remaining_index.update(employee_id, employee.max_hours_per_week - self._hours.get(employee_id, 0),
+                                         employee.availability_mask())
+
+    def is_fully_registered(self, employee_id: int) -> bool:
+        """
+        Indica si todos los turnos del empleado están en el catálogo, es
+        decir, si has_conflict y get_employee_hours pueden responder sin
+        consultar otra fuente.
+        """
+        timeline = self._timelines.get(employee_id, ())
+        return len(timeline) == len(self._shifts_by_employee.get(employee_id, _EMPTY_BUCKET))
+
+    def set_busy_until(self, employee_id: int, week_hour: int):
+        """
+        Marca al empleado como ocupado desde el inicio de la semana hasta
+        `week_hour` (exclusivo), por ejemplo por un turno nocturno del
+        domingo de la semana anterior. Esas horas no cuentan para
+        get_employee_hours. Un valor <= 0 quita la marca.
+        """
+        if week_hour > 0:
+            self._busy_until[employee_id] = week_hour
+        else:
+            self._busy_until.pop(employee_id, None)
+        if self._feasibility_cache is not None:
+            self._feasibility_cache.invalidate_employee(employee_id)
+
+    def get_busy_until(self, employee_id: int) -> int:
+        """Retorna la hora de la semana hasta la que el empleado está ocupado (0 si no lo está)."""
+        return self._busy_until.get(employee_id, 0)
+
+    def get_employee_hours(self, employee_id: int) -> int:
+        """
+        Retorna en O(1) las horas asignadas a un empleado, según el acumulado
+        que se mantiene en cada alta y baja.
+
+        Args:
+            employee_id: ID del empleado
+
+        Returns:
+            int: Horas de los turnos registrados asignados al empleado
+        """
+        return self._hours.get(employee_id, 0)
+
+    def has_conflict(self, employee_id: int, shift, exclude=None) -> bool:
+        """
+        Verifica si `shift` se solapa con algún turno del empleado.
+
+        Si hay un ConflictGraph adjunto que contiene este mismo turno, cruza
+        sus vecinos con los turnos del empleado (recorriendo el conjunto más
+        chico). Si no, usa la línea de tiempo en O(log n): busca por
+        bisección la posición de inicio del turno en la línea de tiempo del
+        empleado y revisa solo los vecinos que pueden cruzarse: los
+        siguientes que empiezan antes de que termine y los anteriores que
+        empiezan a menos de la duración máxima registrada. El propio turno
+        (mismo id) no cuenta como conflicto. También hay conflicto si el
+        turno empieza antes de get_busy_until(employee_id).
+
+        Args:
+            employee_id: ID del empleado
+            shift: Turno candidato (no necesita estar registrado)
+            exclude: ID de un turno del empleado a ignorar (por ejemplo, uno
+                     que soltaría para tomar `shift`)
+
+        Returns:
+            bool: True si hay solapamiento
+        """
+        if self._busy_until and shift.week_start() < self._busy_until.get(employee_id, 0):
+            return True
+        ignored = (shift.id, exclude)
+
+        graph = self._conflict_graph
+        if graph is not None and graph.get_shift(shift.id) is shift:
+            owned = self._shifts_by_employee.get(employee_id, _EMPTY_BUCKET)
+            neighbors = graph.conflicting_shifts(shift.id)
+            smaller, larger = (owned, neighbors) if len(owned) <= len(neighbors) else (neighbors, owned)
+            return any(shift_id in larger and shift_id not in ignored for shift_id in smaller)
+
+        timeline = self._timelines.get(employee_id)
+        if not timeline:
+            return False
+
+        start, end = shift.week_start(), shift.week_end()
+        position = bisect.bisect_left(timeline, (start,))
+
+        index = position
+        while index < len(timeline) and timeline[index][0] < end:
+            if timeline[index][2] not in ignored:
+                return True
+            index += 1
+
+        earliest_relevant_start = start - max(self._max_duration, shift.duration_hours)
+        index = position - 1
+        while index >= 0 and timeline[index][0] > earliest_relevant_start:
+            if timeline[index][1] > start and timeline[index][2] not in ignored:
+                return True
+            index -= 1
+        return False
+
+    def _index_shift(self, employee_id: int, shift):
+        """Agrega un turno registrado a la línea de tiempo y a las horas del empleado."""
+        bisect.insort(self._writable_bucket(self._timelines, 'timeline', employee_id, list),
+                      (shift.week_start(), shift.week_end(), shift.id))
+        self._hours[employee_id] = self._hours.get(employee_id, 0) + shift.duration_hours
+        self._refresh_remaining(employee_id)
+        if self._feasibility_cache is not None:
+            self._feasibility_cache.invalidate_employee(employee_id)
+
+    def _unindex_shift(self, employee_id: int, shift):
+        """Quita un turno registrado de la línea de tiempo y de las horas del empleado."""
+        timeline = self._writable_bucket(self._timelines, 'timeline', employee_id, list)
+        entry = (shift.week_start(), shift.week_end(), shift.id)
+        del timeline[bisect.bisect_left(timeline, entry)]
+        if not timeline:
+            del self._timelines[employee_id]
+            del self._hours[employee_id]
+        else:
+            self._hours[employee_id] -= shift.duration_hours
+        self._refresh_remaining(employee_id)
+        if self._feasibility_cache is not None:
+            self._feasibility_cache.invalidate_employee(employee_id)
+
     def assign_employee_to_shift(self, employee_id: int, shift_id: int):
         """
-        Asigna un empleado a un turno.
-        
+        Asigna un empleado a un turno. Si ya estaba asignado no hace nada.
+
         Args:
             employee_id: ID del empleado
             shift_id: ID del turno
         """
-        # TODO: Implementar
-        pass
-    
-    def get_employees_for_shift(self, shift_id: int) -> list:
+        if self.is_assigned(employee_id, shift_id):
+            return
+
+        previous = self._employees_by_shift.get(shift_id)
+        employees = self._writable_bucket(self._employees_by_shift, 'shift', shift_id, dict)
+        if employees is not previous and self._assignments_view is not None:
+            dict.__setitem__(self._assignments_view, shift_id, employees.keys())
+
+        employees[employee_id] = None
+        self._writable_bucket(self._shifts_by_employee, 'employee', employee_id, dict)[shift_id] = None
+
+        shift = self._shifts.get(shift_id)
+        if shift is not None:
+            self._index_shift(employee_id, shift)
+            self._refresh_open(shift_id)
+
+    def is_assigned(self, employee_id: int, shift_id: int) -> bool:
+        """
+        Indica en O(1) si un empleado está asignado a un turno.
+        """
+        return employee_id in self._employees_by_shift.get(shift_id, _EMPTY_BUCKET)
+
+    def get_employees_for_shift(self, shift_id: int):
         """
-        Obtiene la lista de empleados asignados a un turno.
-        
+        Obtiene los empleados asignados a un turno.
+
         Args:
             shift_id: ID del turno
-            
+
         Returns:
-            list: Lista de IDs de empleados asignados
+            Vista de solo lectura (set-like, en orden de asignación) con los
+            IDs de empleados asignados. Refleja cambios posteriores del
+            horario; usa list() si necesitas una copia.
         """
-        # TODO: Implementar
-        pass
-    
-    def get_shifts_for_employee(self, employee_id: int) -> list:
+        return self._employees_by_shift.get(shift_id, _EMPTY_BUCKET).keys()
+
+    def get_shifts_for_employee(self, employee_id: int):
         """
-        Obtiene la lista de turnos asignados a un empleado.
-        
+        Obtiene los turnos asignados a un empleado.
+
         Args:
             employee_id: ID del empleado
-            
+
         Returns:
-            list: Lista de IDs de turnos asignados
+            Vista de solo lectura (set-like, en orden de asignación) con los
+            IDs de turnos asignados. Refleja cambios posteriores del
+            horario; usa list() si necesitas una copia.
         """
-        # TODO: Implementar
-        pass
-    
+        return self._shifts_by_employee.get(employee_id, _EMPTY_BUCKET).keys()
+
     def remove_employee_from_shift(self, employee_id: int, shift_id: int):
         """
-        Remueve un empleado de un turno.
-        
+        Remueve un empleado de un turno. Si no estaba asignado no hace nada.
+
         Args:
             employee_id: ID del empleado
             shift_id: ID del turno
         """
-        # TODO: Implementar
-        pass
-    
+        if not self.is_assigned(employee_id, shift_id):
+            return
+
+        previous = self._employees_by_shift[shift_id]
+        employees = self._writable_bucket(self._employees_by_shift, 'shift', shift_id, dict)
+        del employees[employee_id]
+        if not employees:
+            del self._employees_by_shift[shift_id]
+            if self._assignments_view is not None:
+                dict.__delitem__(self._assignments_view, shift_id)
+        elif employees is not previous and self._assignments_view is not None:
+            dict.__setitem__(self._assignments_view, shift_id, employees.keys())
+
+        shifts = self._writable_bucket(self._shifts_by_employee, 'employee', employee_id, dict)
+        del shifts[shift_id]
+        if not shifts:
+            del self._shifts_by_employee[employee_id]
+
+        shift = self._shifts.get(shift_id)
+        if shift is not None:
+            self._unindex_shift(employee_id, shift)
+            self._refresh_open(shift_id)
+
     def get_all_assignments(self) -> dict:
         """
         Retorna todas las asignaciones.
-        
+
         Returns:
-            dict: {shift_id: [employee_ids]}
+            dict: {shift_id: vista de employee_ids}. Es una vista de solo
+            lectura sobre el estado interno (no una copia): intentar
+            modificarla lanza TypeError.
         """
-        # TODO: Implementar
-        pass
-    
+        if self._assignments_view is None:
+            # Un horario bifurcado arma la vista recién cuando se pide
+            self._assignments_view = _ReadOnlyDict(
+                (shift_id, employees.keys()) for shift_id, employees in self._employees_by_shift.items())
+        return self._assignments_view
+
+    def fork(self) -> 'Schedule':
+        """
+        Crea en O(1) una copia copy-on-write del horario.
+
+        Padre e hijo comparten los índices congelados en este momento y sus
+        buckets; cada uno copia solo el bucket que modifica por primera vez
+        (y, si hace falta, el índice de disponibilidad o el ConflictGraph),
+        así que ninguno ve los cambios del otro. El hijo no hereda el
+        FeasibilityCache, y arma su propio índice de horas restantes
+        (get_employees_by_remaining_hours) recién si se lo piden.
+
+        Returns:
+            Schedule: Horario independiente con las mismas asignaciones,
+            catálogo y plantilla
+        """
+        child = Schedule.__new__(Schedule)
+        for name in _FORKED_FIELDS:
+            mine, theirs = _fork_mapping(getattr(self, name))
+            setattr(self, name, mine)
+            setattr(child, name, theirs)
+
+        child._max_duration = self._max_duration
+        child._assignments_view = None
+        child._availability = self._availability
+        child._conflict_graph = self._conflict_graph
+        child._feasibility_cache = None
+        child._remaining_index = None
+        for schedule in (self, child):
+            schedule._owned_buckets = {'shift': set(), 'employee': set(), 'timeline': set()}
+            schedule._availability_shared = True
+            schedule._graph_shared = self._conflict_graph is not None
+        return child
+
+    def diff(self, other: 'Schedule') -> dict:
+        """
+        Compara las asignaciones de este horario con las de `other`.
+
+        Si ambos provienen de fork() del mismo horario, solo se revisan los
+        turnos escritos desde la bifurcación, y los buckets que siguen
+        compartidos se saltean sin recorrerlos: el costo es proporcional a
+        los cambios, no al tamaño del horario.
+
+        Args:
+            other: Horario a comparar
+
+        Returns:
+            dict: {
+                'added': [(employee_id, shift_id) en other y no en self],
+                'removed': [(employee_id, shift_id) en self y no en other]
+            }, ordenadas por turno y luego por empleado
+        """
+        mine, theirs = self._employees_by_shift, other._employees_by_shift
+        shift_ids = _changed_keys(mine, theirs)
+        if shift_ids is None:
+            shift_ids = set(mine.keys()) | set(theirs.keys())
+
+        added, removed = [], []
+        for shift_id in sorted(shift_ids):
+            before = mine.get(shift_id, _EMPTY_BUCKET)
+            after = theirs.get(shift_id, _EMPTY_BUCKET)
+            if before is after:
+                continue
+            added.extend((employee_id, shift_id) for employee_id in sorted(after.keys() - before.keys()))
+            removed.extend((employee_id, shift_id) for employee_id in sorted(before.keys() - after.keys()))
+        return {'added': added, 'removed': removed}
+
+    def _writable_bucket(self, index, kind: str, key, factory):
+        """
+        Retorna el bucket `key` de `index` listo para modificar: lo crea con
+        `factory` si no existe y, tras un fork(), lo copia la primera vez
+        que este horario lo toca.
+        """
+        bucket = index.get(key)
+        owned = self._owned_buckets
+        if bucket is None:
+            bucket = index[key] = factory()
+        elif owned is None or key in owned[kind]:
+            return bucket
+        else:
+            bucket = index[key] = bucket.copy()
+        if owned is not None:
+            owned[kind].add(key)
+        return bucket
+
+    def _own_availability(self) -> AvailabilityIndex:
+        """Retorna el índice de disponibilidad, copiándolo si se comparte tras un fork()."""
+        if self._availability_shared:
+            self._availability = self._availability.copy()
+            self._availability_shared = False
+        return self._availability
+
+    def _own_conflict_graph(self) -> ConflictGraph:
+        """Retorna el ConflictGraph adjunto, copiándolo si se comparte tras un fork()."""
+        if self._graph_shared:
+            self._conflict_graph = self._conflict_graph.copy()
+            self._graph_shared = False
+        return self._conflict_graph
+
     def __repr__(self):
-        return f"Schedule(assignments={self.get_all_assignments()})"
+        assignments = {shift_id: list(employees) for shift_id, employees in self.get_all_assignments().items()}
+        return f"Schedule(assignments={assignments})"
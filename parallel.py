@@ -0,0 +1,188 @@
+"""
+Asignación de muchos problemas independientes en paralelo.
+
+Cada problema (empleados, turnos) es, por ejemplo, una sede. Además, cada
+problema se parte en componentes independientes: grupos de turnos y
+empleados tales que ningún empleado puede tomar turnos de dos grupos
+distintos (no está disponible ese día o el turno no le cabe en su máximo
+semanal). El greedy de assign_shifts decide cada turno solo entre
+empleados elegibles, y esos empleados solo acumulan horas de turnos de su
+propio componente. Por eso resolver los componentes por separado da
+exactamente el mismo horario que resolver el problema entero, y una sede
+grande con departamentos separados también aprovecha todos los núcleos.
+
+Los componentes se envían a un ProcessPoolExecutor como tuplas de enteros
+y strings (no objetos Employee/Shift), y cada proceso devuelve solo las
+asignaciones. El Schedule de cada problema se arma en el proceso principal
+cuando terminan todos sus componentes. El resultado no depende de
+max_workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from models import DAY_INDEX, DAYS, Employee, Schedule, Shift
+from scheduler import MODE_GREEDY, _check_mode, _day_order, _understaffed_warnings, assign_shifts
+
+# Los componentes chicos se agrupan en tareas de al menos esta cantidad de
+# turnos, para no pagar el costo de una tarea por cada turno aislado.
+_MIN_TASK_SHIFTS = 256
+
+
+def assign_shifts_parallel(problems, mode: str = MODE_GREEDY, time_budget: float = 1.0, max_workers: int = None):
+    """
+    Resuelve muchos problemas de asignación en paralelo.
+
+    Args:
+        problems: Iterable de pares (employees, shifts), uno por sede
+        mode: "greedy" (por defecto) u "optimal", como en assign_shifts
+        time_budget: Segundos máximos por tarea en modo "optimal"
+        max_workers: Procesos del pool (por defecto, uno por núcleo)
+
+    Yields:
+        (índice del problema, dict con 'schedule', 'warnings' y
+        'employee_hours' como en assign_shifts), a medida que termina cada
+        problema (no en orden de índice)
+    """
+    _check_mode(mode)
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        pending = {}        # {índice: [empleados, turnos, tareas sin terminar, asignaciones]}
+        futures = {}
+        for index, (employees, shifts) in enumerate(problems):
+            employees, shifts = list(employees), list(shifts)
+            tasks = _pack_tasks(_components(employees, shifts))
+            pending[index] = [employees, shifts, len(tasks), []]
+            for task_employees, task_shifts in tasks:
+                payload = (mode, time_budget, [_employee_row(e) for e in task_employees],
+                           [_shift_row(s) for s in task_shifts])
+                futures[executor.submit(_solve_task, payload)] = index
+            if not tasks:
+                yield index, _build_result(employees, shifts, [])
+                del pending[index]
+
+        for future in as_completed(futures):
+            index = futures[future]
+            state = pending[index]
+            state[3].extend(future.result())
+            state[2] -= 1
+            if state[2] == 0:
+                del pending[index]
+                yield index, _build_result(state[0], state[1], state[3])
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+# ============================================================================
+# FUNCIONES AUXILIARES
+# ============================================================================
+
+def _components(employees: list[Employee], shifts: list[Shift]) -> list[tuple]:
+    """
+    Helper: Parte un problema en componentes conexos del grafo de
+    elegibilidad empleado-turno (disponible ese día y max_hours_per_week >=
+    duración), con union-find.
+
+    No arma las E x S aristas: por día, los empleados disponibles ordenados
+    por máximo semanal forman sufijos anidados de elegibles, así que basta
+    unir el sufijo del turno más corto y conectar cada turno con el empleado
+    de mayor máximo.
+
+    Returns:
+        list: [(empleados, turnos)] de los componentes con al menos un
+        turno, en el orden de su primer turno. Los empleados que no pueden
+        tomar ningún turno se omiten.
+    """
+    parent = list(range(len(employees) + len(shifts)))   # Empleados primero, luego turnos
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(first, second):
+        parent[find(first)] = find(second)
+
+    shifts_by_day = {}
+    for position, shift in enumerate(shifts):
+        shifts_by_day.setdefault(shift.day, []).append(position)
+
+    for day, positions in shifts_by_day.items():
+        available = sorted((employee.max_hours_per_week, row) for row, employee in enumerate(employees)
+                           if employee.is_available(day))
+        if not available:
+            continue
+        shortest = min(shifts[position].duration_hours for position in positions)
+        eligible = [row for max_hours, row in available if max_hours >= shortest]
+        for row in eligible[:-1]:
+            union(row, eligible[-1])
+        for position in positions:
+            if available[-1][0] >= shifts[position].duration_hours:
+                union(len(employees) + position, available[-1][1])
+
+    components = {}
+    for position, shift in enumerate(shifts):
+        components.setdefault(find(len(employees) + position), ([], []))[1].append(shift)
+    for row, employee in enumerate(employees):
+        component = components.get(find(row))
+        if component is not None:
+            component[0].append(employee)
+    return list(components.values())
+
+
+def _pack_tasks(components: list[tuple]) -> list[tuple]:
+    """Helper: Agrupa componentes consecutivos hasta juntar _MIN_TASK_SHIFTS turnos por tarea."""
+    tasks = []
+    current = None
+    for employees, shifts in components:
+        if current is None or len(current[1]) >= _MIN_TASK_SHIFTS:
+            current = ([], [])
+            tasks.append(current)
+        current[0].extend(employees)
+        current[1].extend(shifts)
+    return tasks
+
+
+def _employee_row(employee: Employee) -> tuple:
+    """Helper: Forma compacta de un empleado para enviar al proceso."""
+    return employee.id, employee.name, employee.max_hours_per_week, employee.availability_mask()
+
+
+def _shift_row(shift: Shift) -> tuple:
+    """Helper: Forma compacta de un turno para enviar al proceso."""
+    return shift.id, DAY_INDEX[shift.day], shift.start_hour, shift.duration_hours, shift.required_employees
+
+
+def _solve_task(payload: tuple) -> list[tuple]:
+    """
+    Helper: Corre en el proceso del pool. Reconstruye empleados y turnos,
+    ejecuta assign_shifts y retorna [(employee_id, shift_id)].
+    """
+    mode, time_budget, employee_rows, shift_rows = payload
+    employees = [Employee(id, name, max_hours, {day for bit, day in enumerate(DAYS) if not mask >> bit & 1})
+                 for id, name, max_hours, mask in employee_rows]
+    shifts = [Shift(id, DAYS[day], start_hour, duration, required)
+              for id, day, start_hour, duration, required in shift_rows]
+    schedule = assign_shifts(employees, shifts, mode=mode, time_budget=time_budget)['schedule']
+    return [(employee_id, shift_id)
+            for shift_id, employee_ids in schedule.get_all_assignments().items()
+            for employee_id in employee_ids]
+
+
+def _build_result(employees: list[Employee], shifts: list[Shift], assignments: list[tuple]) -> dict:
+    """Helper: Arma el resultado de un problema con las asignaciones de todos sus componentes."""
+    day_order = _day_order()
+    ordered_shifts = sorted(shifts, key=lambda s: (day_order[s.day], s.start_hour, s.id))
+    position = {shift.id: index for index, shift in enumerate(ordered_shifts)}
+
+    # Se asigna en el mismo orden que assign_shifts (por turno, en orden de
+    # la semana), no en el orden en que terminaron los procesos
+    schedule = Schedule(shifts, employees)
+    for employee_id, shift_id in sorted(assignments, key=lambda pair: position[pair[1]]):
+        schedule.assign_employee_to_shift(employee_id, shift_id)
+
+    return {
+        'schedule': schedule,
+        'warnings': _understaffed_warnings(schedule, ordered_shifts),
+        'employee_hours': {emp.id: schedule.get_employee_hours(emp.id) for emp in employees},
+    }
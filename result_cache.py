@@ -0,0 +1,146 @@
+"""
+Cache de resultados de assign_shifts direccionado por contenido.
+
+La clave es un SHA-256 de las entradas normalizadas: las restricciones de
+cada empleado (id, máximo semanal, días disponibles) y la definición de
+cada turno, en orden canónico (por id), más el modo. El nombre del
+empleado y el orden de las listas no cambian el horario, así que no
+forman parte de la clave.
+
+Se guardan solo las asignaciones (en el orden en que se hicieron) y los
+warnings. Un acierto se reconstruye como un Schedule nuevo sobre los
+objetos que recibió esa llamada, reproduciendo las asignaciones en el
+mismo orden: el resultado es idéntico al de calcularlo de nuevo e
+independiente de cualquier otro resultado.
+
+Dos niveles: un LRU acotado en memoria y, opcionalmente, un directorio
+local con un archivo JSON por clave (escrito de forma atómica). Un
+acierto en disco se promueve a memoria.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+# Cambiar si cambia el algoritmo de asignación o el formato guardado, para
+# no servir resultados de una versión anterior
+_FORMAT_VERSION = 1
+
+
+class ResultCache:
+    """
+    LRU de resultados de assign_shifts, con un nivel opcional en disco.
+
+    Ejemplo:
+        cache = ResultCache(max_size=32, directory='.schedule_cache')
+        result = assign_shifts(employees, shifts, result_cache=cache)
+        cache.stats()['hit_rate']
+    """
+
+    # Centinela de get(): la clave no está
+    MISS = object()
+
+    def __init__(self, max_size: int = 128, directory: str = None):
+        """
+        Args:
+            max_size: Resultados que se guardan en memoria
+            directory: Directorio para el nivel en disco (se crea si no
+                       existe). Sin él, solo se usa memoria
+        """
+        if max_size <= 0:
+            raise ValueError(f"max_size debe ser positivo: {max_size}")
+        self.max_size = max_size
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()   # {clave: entrada}, en orden LRU
+        self.hits = 0
+        self.disk_hits = 0              # Incluidos en hits
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0        # Tiempo de cálculo evitado por los aciertos
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def content_key(employees, shifts, mode: str) -> str:
+        """Clave hexadecimal de las entradas normalizadas."""
+        digest = hashlib.sha256(f"{_FORMAT_VERSION}|{mode}|".encode())
+        digest.update(repr(sorted((employee.id, employee.max_hours_per_week, employee.availability_mask())
+                                  for employee in employees)).encode())
+        digest.update(b'|')
+        digest.update(repr(sorted((shift.id, shift.day_index, shift.start_hour, shift.duration_hours,
+                                   shift.required_employees) for shift in shifts)).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """
+        Retorna la entrada guardada o ResultCache.MISS. Una entrada es un
+        dict con 'assignments' ([[shift_id, [employee_ids]]] en orden de
+        asignación), 'warnings' y 'compute_seconds'.
+        """
+        entry = self._entries.get(key, self.MISS)
+        if entry is not self.MISS:
+            self._entries.move_to_end(key)
+        elif self.directory is not None:
+            entry = self._read(key)
+            if entry is not self.MISS:
+                self.disk_hits += 1
+                self._remember(key, entry)
+
+        if entry is self.MISS:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """Guarda una entrada en memoria (desalojando la menos usada) y en disco si hay directorio."""
+        self._remember(key, entry)
+        if self.directory is not None:
+            self._write(key, entry)
+
+    def stats(self) -> dict:
+        """Contadores para verificar que el cache rinde."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'saved_seconds': self.saved_seconds,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+        }
+
+    def _remember(self, key: str, entry: dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str):
+        """Lee una entrada del disco; un archivo ilegible cuenta como ausente."""
+        try:
+            with open(self._path(key), encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return self.MISS
+
+    def _write(self, key: str, entry: dict):
+        """Escribe en un temporal y lo renombra, para que un lector nunca vea un archivo a medias."""
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                json.dump(entry, file, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
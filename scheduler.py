@@ -1,16 +1,56 @@
 """
 Lógica de asignación y gestión de turnos.
-
-TODO: Implementa las funciones principales del sistema.
 """
 
-from models import Employee, Shift, Schedule
+import heapq
+import itertools
+import random
+import time
+from contextlib import nullcontext
+
+from capacity import analyze_capacity
+from instrumentation import EVENT_ASSIGNMENT, EVENT_REJECTION, Instrumentation
+from models import DAY_INDEX, DAYS, HOURS_PER_WEEK, ConflictGraph, Employee, FeasibilityCache, Shift, Schedule
+from result_cache import ResultCache
+
+# Motivos de rechazo de un candidato para un turno
+REJECT_UNAVAILABLE = 'unavailable'
+REJECT_HOURS = 'hours'
+REJECT_OVERLAP = 'overlap'
+
+
+SWAP_SUCCESS_MESSAGE = 'Intercambio realizado exitosamente'
+
+# Modos de swap_shifts_batch
+BATCH_ALL_OR_NOTHING = 'all_or_nothing'
+BATCH_BEST_EFFORT = 'best_effort'
+
+# Modos de assign_shifts
+MODE_GREEDY = 'greedy'
+MODE_OPTIMAL = 'optimal'
+
+# Reglas que reporta validate_schedule (las tres primeras son los motivos de rechazo)
+VIOLATION_UNAVAILABLE = REJECT_UNAVAILABLE
+VIOLATION_HOURS = REJECT_HOURS
+VIOLATION_OVERLAP = REJECT_OVERLAP
+VIOLATION_UNDERSTAFFED = 'understaffed'
+VIOLATION_UNKNOWN_EMPLOYEE = 'unknown_employee'
+VIOLATION_UNKNOWN_SHIFT = 'unknown_shift'
 
 
-def assign_shifts(employees: list[Employee], shifts: list[Shift]) -> dict:
+def assign_shifts(
+    employees: list[Employee],
+    shifts: list[Shift],
+    mode: str = MODE_GREEDY,
+    time_budget: float = 1.0,
+    conflict_graph: ConflictGraph = None,
+    feasibility_cache: FeasibilityCache = None,
+    instrumentation: Instrumentation = None,
+    result_cache: ResultCache = None
+) -> dict:
     """
     Asigna turnos a empleados de forma automática.
-    
+
     Estrategia:
     1. Ordenar turnos por día y hora (lunes primero, etc.)
     2. Para cada turno, buscar empleados disponibles que:
@@ -19,11 +59,42 @@ def assign_shifts(employees: list[Employee], shifts: list[Shift]) -> dict:
        - No tengan conflicto de horario con otros turnos asignados
     3. Priorizar empleados con menos horas acumuladas (para balancear)
     4. Asignar hasta alcanzar required_employees o hasta que no haya más disponibles
-    
+
+    Con mode="optimal", el resultado greedy se toma como punto de partida y
+    se mejora con el solver de solver.py: primero maximiza la cobertura
+    (caminos de aumento sobre el grafo turnos-empleados) y después balancea
+    horas. Si se agota `time_budget`, se retorna la mejor solución
+    alcanzada, que nunca es peor que la greedy. Antes del solver,
+    capacity.analyze_capacity acota cuántos puestos puede cubrir cada turno,
+    así que no se buscan caminos de aumento para puestos imposibles.
+
     Args:
-        employees: Lista de empleados disponibles
-        shifts: Lista de turnos a asignar
-        
+        employees: Lista de empleados disponibles (o una tables.EmployeeTable)
+        shifts: Lista de turnos a asignar (o una tables.ShiftTable)
+        mode: "greedy" (por defecto) u "optimal"
+        time_budget: Segundos máximos de reloj para el modo "optimal"
+        conflict_graph: ConflictGraph precalculado de `shifts` (opcional). Si
+                        se pasa, se adjunta al Schedule y las verificaciones
+                        de solapamiento lo usan en lugar de la línea de tiempo
+        feasibility_cache: FeasibilityCache (opcional) a adjuntar al Schedule;
+                           sirve sobre todo si el horario resultante se sigue
+                           usando (swap_shifts, optimizadores)
+        instrumentation: instrumentation.Instrumentation (opcional). Si se
+                         pasa, mide las fases 'setup', 'sort',
+                         'availability', 'selection', 'capacity',
+                         'solver' y 'warnings', y dentro de 'selection' los timers
+                         'hours_check' y 'overlap_check'; cuenta
+                         'candidates_examined', 'rejected_unavailable'
+                         (empleados descartados por el índice de
+                         disponibilidad, sin examinarlos), 'rejected_hours',
+                         'rejected_overlap' y 'assignments'. Sin ella no se
+                         mide nada
+        result_cache: result_cache.ResultCache (opcional). Si las mismas
+                      restricciones y turnos ya se resolvieron, retorna un
+                      Schedule nuevo con las mismas asignaciones sin
+                      recalcular. Solo aplica al modo "greedy" (el
+                      "optimal" depende del reloj) y sin instrumentation
+
     Returns:
         dict con estructura:
         {
@@ -31,22 +102,158 @@ def assign_shifts(employees: list[Employee], shifts: list[Shift]) -> dict:
             'warnings': [lista de strings con problemas encontrados],
             'employee_hours': {employee_id: total_hours_asignadas}
         }
-        
+        En modo "optimal" además incluye 'solve_time' (segundos) y
+        'optimality_gap' (fracción de puestos sin cubrir respecto a una
+        cota superior de cobertura; 0.0 significa cobertura óptima).
+        Con instrumentation, además 'stats': instrumentation.stats().
+
     Ejemplo de warning:
         "Shift 3 (tuesday 8:00) tiene solo 1 empleado asignado, necesita 2"
     """
-    # TODO: Implementar
-    
-    schedule = Schedule()
-    warnings = []
-    employee_hours = {emp.id: 0 for emp in employees}
-    
-    # Tu código aquí
-    
+    _check_mode(mode)
+    if result_cache is not None and mode == MODE_GREEDY and instrumentation is None:
+        return _cached_assign_week(employees, shifts, mode, time_budget, conflict_graph, feasibility_cache,
+                                   result_cache)
+    return _assign_week(employees, shifts, mode, time_budget, conflict_graph, feasibility_cache,
+                        instrumentation=instrumentation)
+
+
+def assign_shifts_horizon(
+    employees: list[Employee],
+    weekly_shifts,
+    mode: str = MODE_GREEDY,
+    time_budget: float = 1.0
+):
+    """
+    Asigna turnos de varias semanas, una semana por vez.
+
+    Cada semana se resuelve como en assign_shifts, con un Schedule propio:
+    max_hours_per_week se aplica por semana. Los turnos nocturnos del
+    domingo que terminan en la semana siguiente bloquean a sus empleados
+    al inicio de esa semana (ver Schedule.set_busy_until), aunque sus horas
+    cuentan en la semana en que empiezan.
+
+    Es un generador: consume `weekly_shifts` semana a semana y entrega cada
+    semana apenas termina, así que la memoria depende de una sola semana y
+    no del horizonte completo.
+
+    Args:
+        employees: Lista de empleados
+        weekly_shifts: Iterable de pares (week_index, Shift) ordenado por
+                       semana. Los IDs de turno pueden repetirse entre semanas
+        mode: "greedy" (por defecto) u "optimal"
+        time_budget: Segundos máximos por semana para el modo "optimal"
+
+    Yields:
+        dict como el de assign_shifts, más 'week': week_index
+
+    Raises:
+        ValueError: Si el modo no es válido o las semanas no vienen en orden
+                    creciente (al llegar a la semana desordenada)
+    """
+    _check_mode(mode)
+    busy_until = {}
+    previous_week = None
+    for week, pairs in itertools.groupby(weekly_shifts, key=lambda pair: pair[0]):
+        if previous_week is not None and week <= previous_week:
+            raise ValueError(f"Las semanas deben venir en orden creciente: {week} después de {previous_week}")
+        if previous_week is not None and week != previous_week + 1:
+            busy_until = {}
+        shifts = [shift for _, shift in pairs]
+
+        result = _assign_week(employees, shifts, mode, time_budget, busy_until=busy_until)
+        busy_until = _spillover(result['schedule'], shifts)
+        previous_week = week
+        yield {'week': week, **result}
+
+
+def _assign_week(employees, shifts, mode, time_budget, conflict_graph=None, feasibility_cache=None,
+                 busy_until=None, instrumentation=None) -> dict:
+    """
+    Helper: Cuerpo de assign_shifts para una semana. `busy_until` es
+    {employee_id: hora} de ocupación arrastrada de la semana anterior.
+    """
+    started = time.perf_counter()
+
+    with _phase(instrumentation, 'setup'):
+        schedule = Schedule(shifts, employees)
+        for employee_id, week_hour in (busy_until or {}).items():
+            schedule.set_busy_until(employee_id, week_hour)
+        if conflict_graph is not None:
+            schedule.attach_conflict_graph(conflict_graph)
+        if feasibility_cache is not None:
+            schedule.attach_feasibility_cache(feasibility_cache)
+
+    with _phase(instrumentation, 'sort'):
+        day_order = _day_order()
+        ordered_shifts = sorted(shifts, key=lambda s: (day_order[s.day], s.start_hour, s.id))
+
+    with _phase(instrumentation, 'availability'):
+        queue = _LoadQueue(employees, schedule, [shift.duration_hours for shift in shifts])
+
+    with _phase(instrumentation, 'selection'):
+        if instrumentation is None:
+            for shift in ordered_shifts:
+                chosen = queue.take(shift, lambda employee: _schedule_rejection_reason(schedule, employee, shift,
+                                                                                       shifts))
+                for employee in chosen:
+                    schedule.assign_employee_to_shift(employee.id, shift.id)
+                queue.restore(shift.day, chosen)
+        else:
+            _instrumented_selection(schedule, queue, ordered_shifts, shifts, instrumentation)
+
+    result = {'schedule': schedule}
+    if mode == MODE_OPTIMAL:
+        from solver import solve_optimal
+        with _phase(instrumentation, 'capacity'):
+            # Puestos que cada turno puede llegar a cubrir: el solver no busca caminos para los imposibles
+            limits = analyze_capacity(employees, shifts)['shift_limits']
+        with _phase(instrumentation, 'solver'):
+            solve_optimal(schedule, ordered_shifts, deadline=started + time_budget, limits=limits)
+        result['solve_time'] = time.perf_counter() - started
+        result['optimality_gap'] = _optimality_gap(schedule, ordered_shifts, limits)
+
+    with _phase(instrumentation, 'warnings'):
+        result['warnings'] = _understaffed_warnings(schedule, ordered_shifts)
+    result['employee_hours'] = {emp.id: schedule.get_employee_hours(emp.id) for emp in employees}
+    if instrumentation is not None:
+        result['stats'] = instrumentation.stats()
+    return result
+
+
+def _cached_assign_week(employees, shifts, mode, time_budget, conflict_graph, feasibility_cache,
+                        result_cache: ResultCache) -> dict:
+    """
+    Helper: _assign_week a través del ResultCache. Un acierto reproduce las
+    asignaciones guardadas, en su orden, sobre un Schedule nuevo armado con
+    estos employees y shifts, igual que lo haría _assign_week.
+    """
+    started = time.perf_counter()
+    key = ResultCache.content_key(employees, shifts, mode)
+    entry = result_cache.get(key)
+    if entry is ResultCache.MISS:
+        result = _assign_week(employees, shifts, mode, time_budget, conflict_graph, feasibility_cache)
+        result_cache.put(key, {
+            'assignments': [[shift_id, list(employee_ids)]
+                            for shift_id, employee_ids in result['schedule'].get_all_assignments().items()],
+            'warnings': list(result['warnings']),
+            'compute_seconds': time.perf_counter() - started,
+        })
+        return result
+
+    schedule = Schedule(shifts, employees)
+    if conflict_graph is not None:
+        schedule.attach_conflict_graph(conflict_graph)
+    if feasibility_cache is not None:
+        schedule.attach_feasibility_cache(feasibility_cache)
+    for shift_id, employee_ids in entry['assignments']:
+        for employee_id in employee_ids:
+            schedule.assign_employee_to_shift(employee_id, shift_id)
+    result_cache.saved_seconds += max(0.0, entry['compute_seconds'] - (time.perf_counter() - started))
     return {
         'schedule': schedule,
-        'warnings': warnings,
-        'employee_hours': employee_hours
+        'warnings': list(entry['warnings']),
+        'employee_hours': {emp.id: schedule.get_employee_hours(emp.id) for emp in employees},
     }
 
 
@@ -56,11 +263,12 @@ def swap_shifts(
     employee2_id: int,
     shift_id: int,
     employees: list[Employee],
-    shifts: list[Shift]
+    shifts: list[Shift],
+    instrumentation: Instrumentation = None
 ) -> dict:
     """
     Intenta intercambiar asignaciones: employee1 toma el turno de employee2.
-    
+
     Proceso:
     1. Verificar que employee2 esté asignado al turno
     2. Verificar que employee1 cumpla todas las restricciones para ese turno:
@@ -69,7 +277,13 @@ def swap_shifts(
        - No tenga conflicto de horario
     3. Si todo es válido, hacer el intercambio
     4. Si no es válido, retornar la razón del fallo
-    
+
+    El intercambio se aplica sobre el mismo `schedule` recibido, que se
+    retorna como `updated_schedule`. Si falla, `schedule` no se modifica.
+    Para evaluar el intercambio sin tocar el original, pasa schedule.fork()
+    y compara con schedule.diff(). Si el Schedule tiene un ConflictGraph
+    adjunto, el solapamiento se verifica con él.
+
     Args:
         schedule: Horario actual
         employee1_id: ID del empleado que quiere tomar el turno
@@ -77,7 +291,14 @@ def swap_shifts(
         shift_id: ID del turno a intercambiar
         employees: Lista de todos los empleados (para validar restricciones)
         shifts: Lista de todos los turnos (para validar horarios)
-        
+        instrumentation: instrumentation.Instrumentation (opcional). Si se
+                         pasa, mide las fases 'lookup', 'validation' y
+                         'apply' (con los timers 'availability_check',
+                         'hours_check' y 'overlap_check' dentro de
+                         'validation') y cuenta 'candidates_examined',
+                         'rejected_<motivo>', 'swaps_applied' y
+                         'swaps_failed'
+
     Returns:
         dict con estructura:
         {
@@ -85,65 +306,898 @@ def swap_shifts(
             'message': str (explicación del resultado),
             'updated_schedule': Schedule (solo si success=True, None si no)
         }
-        
+        Con instrumentation, además 'stats': instrumentation.stats().
+
     Ejemplos de mensajes:
         - Success: "Intercambio realizado exitosamente"
         - Failure: "Employee 2 no está asignado al turno 5"
         - Failure: "Employee 1 no está disponible el monday"
         - Failure: "Employee 1 excedería sus horas máximas (40h)"
     """
-    # TODO: Implementar
-    
-    # Pistas:
-    # - Necesitas buscar el objeto Employee por su id
-    # - Necesitas buscar el objeto Shift por su id
-    # - Necesitas calcular las horas actuales del employee1
-    # - Necesitas verificar solapamientos con otros turnos de employee1
-    
+    with _phase(instrumentation, 'lookup'):
+        schedule.register_shifts(shifts)
+        employee1 = _get_employee_by_id(employees, employee1_id)
+        shift = _get_shift_by_id(shifts, shift_id)
+
+    with _phase(instrumentation, 'validation'):
+        error = _swap_error(schedule, employee1_id, employee2_id, shift_id, employee1, shift, shifts,
+                            instrumentation)
+    if error is not None:
+        result = {
+            'success': False,
+            'message': error,
+            'updated_schedule': None
+        }
+    else:
+        with _phase(instrumentation, 'apply'):
+            schedule.remove_employee_from_shift(employee2_id, shift_id)
+            schedule.assign_employee_to_shift(employee1_id, shift_id)
+        result = {
+            'success': True,
+            'message': SWAP_SUCCESS_MESSAGE,
+            'updated_schedule': schedule
+        }
+
+    if instrumentation is not None:
+        instrumentation.count('swaps_applied' if result['success'] else 'swaps_failed')
+        result['stats'] = instrumentation.stats()
+    return result
+
+
+def swap_shifts_batch(
+    schedule: Schedule,
+    swaps: list[tuple],
+    employees: list[Employee],
+    shifts: list[Shift],
+    mode: str = BATCH_ALL_OR_NOTHING
+) -> dict:
+    """
+    Aplica un lote de intercambios en orden, como una transacción.
+
+    Cada intercambio se valida con las mismas reglas que swap_shifts, pero
+    contra el estado que dejaron los anteriores del lote. Los índices por
+    id de empleados y turnos se arman una sola vez para todo el lote.
+
+    Los cambios aplicados se anotan en un journal; para revertir se
+    recorre al revés deshaciendo cada operación, sin copiar el Schedule.
+
+    Args:
+        schedule: Horario actual (se modifica en sitio)
+        swaps: Lista de tuplas (employee1_id, employee2_id, shift_id), con el
+               mismo significado que en swap_shifts
+        employees: Lista de todos los empleados
+        shifts: Lista de todos los turnos
+        mode: "all_or_nothing" (por defecto): si un intercambio falla se
+              revierte todo el lote y los siguientes no se evalúan.
+              "best_effort": se aplican los válidos y se reportan los demás.
+
+    Returns:
+        dict con estructura:
+        {
+            'success': bool (True si todos los intercambios fueron válidos),
+            'applied': int (intercambios que quedaron aplicados),
+            'results': [{'success': bool, 'message': str} por intercambio, en orden],
+            'updated_schedule': Schedule (None si all_or_nothing falló)
+        }
+    """
+    if mode not in (BATCH_ALL_OR_NOTHING, BATCH_BEST_EFFORT):
+        raise ValueError(f"mode debe ser {BATCH_ALL_OR_NOTHING!r} o {BATCH_BEST_EFFORT!r}: {mode!r}")
+
+    schedule.register_shifts(shifts)
+    employees_by_id = {employee.id: employee for employee in employees}
+    shifts_by_id = {shift.id: shift for shift in shifts}
+
+    journal = []        # [(employee_id, shift_id, asignado: bool)], en orden de aplicación
+    results = []
+    for employee1_id, employee2_id, shift_id in swaps:
+        error = _swap_error(schedule, employee1_id, employee2_id, shift_id,
+                            employees_by_id.get(employee1_id), shifts_by_id.get(shift_id), shifts)
+        if error is None:
+            schedule.remove_employee_from_shift(employee2_id, shift_id)
+            journal.append((employee2_id, shift_id, False))
+            schedule.assign_employee_to_shift(employee1_id, shift_id)
+            journal.append((employee1_id, shift_id, True))
+            results.append({'success': True, 'message': SWAP_SUCCESS_MESSAGE})
+            continue
+
+        results.append({'success': False, 'message': error})
+        if mode == BATCH_ALL_OR_NOTHING:
+            _rollback(schedule, journal)
+            skipped = len(swaps) - len(results)
+            results.extend({'success': False, 'message': 'No evaluado: el lote se revirtió'} for _ in range(skipped))
+            return {
+                'success': False,
+                'applied': 0,
+                'results': results,
+                'updated_schedule': None
+            }
+
+    return {
+        'success': all(result['success'] for result in results),
+        'applied': len(journal) // 2,
+        'results': results,
+        'updated_schedule': schedule
+    }
+
+
+def validate_schedule(schedule: Schedule, employees: list[Employee], shifts: list[Shift]) -> list[dict]:
+    """
+    Audita un horario completo contra las reglas de negocio.
+
+    Pensado para horarios editados a mano antes de publicarlos. Recorre
+    cada asignación una vez: por empleado ordena sus turnos por hora de la
+    semana y detecta solapamientos con un barrido, en O(n log n) total.
+    Para no armar la lista completa, usar iter_violations.
+
+    Args:
+        schedule: Horario a auditar (no se modifica)
+        employees: Empleados (lista o tables.EmployeeTable)
+        shifts: Turnos (lista o tables.ShiftTable)
+
+    Returns:
+        list: Violaciones como las de iter_violations, en el mismo orden.
+        Vacía si el horario cumple todas las reglas.
+    """
+    return list(iter_violations(schedule, employees, shifts))
+
+
+def iter_violations(schedule: Schedule, employees: list[Employee], shifts: list[Shift]):
+    """
+    Genera las violaciones de validate_schedule a medida que las encuentra.
+
+    Cada violación es un dict con 'rule', 'employee_id' y 'shift_id', más:
+    - VIOLATION_UNAVAILABLE: el empleado no está disponible el día del turno.
+    - VIOLATION_OVERLAP: el turno empieza antes de que termine otro del
+      empleado, 'conflicting_shift_id' (None si lo bloquea la ocupación
+      arrastrada de la semana anterior, ver Schedule.set_busy_until).
+    - VIOLATION_HOURS: una por empleado, con 'excess_hours' (horas por
+      encima de su máximo) y el turno con el que lo supera, en orden de la
+      semana.
+    - VIOLATION_UNKNOWN_SHIFT / VIOLATION_UNKNOWN_EMPLOYEE: la asignación
+      apunta a un turno o empleado que no está en `shifts`/`employees`.
+    - VIOLATION_UNDERSTAFFED: el turno tiene menos empleados que
+      required_employees; 'employee_id' es None y 'missing' dice cuántos
+      faltan.
+
+    Primero salen las violaciones por empleado (en el orden de
+    `employees`, y las de cada uno en orden de la semana) y después las
+    de turnos.
+    """
+    # {shift_id: (week_start, week_end, duración, bit del día)}, calculado una vez por turno
+    timing = {shift.id: (shift.week_start(), shift.week_end(), shift.duration_hours, 1 << DAY_INDEX[shift.day])
+              for shift in shifts}
+    known = set()
+    checked = 0
+    for employee in employees:
+        employee_id = employee.id
+        known.add(employee_id)
+        assigned = schedule.get_shifts_for_employee(employee_id)
+        if not assigned:
+            continue
+        checked += len(assigned)
+        entries = []
+        for shift_id in assigned:
+            entry = timing.get(shift_id)
+            if entry is None:
+                yield {'rule': VIOLATION_UNKNOWN_SHIFT, 'employee_id': employee_id, 'shift_id': shift_id}
+            else:
+                entries.append((entry[0], entry[1], shift_id, entry[2], entry[3]))
+        entries.sort()
+        yield from _employee_violations(employee, entries, schedule.get_busy_until(employee_id))
+
+    assignments = schedule.get_all_assignments()
+    if sum(map(len, assignments.values())) != checked:
+        for shift_id, employee_ids in assignments.items():
+            for employee_id in employee_ids:
+                if employee_id not in known:
+                    yield {'rule': VIOLATION_UNKNOWN_EMPLOYEE, 'employee_id': employee_id, 'shift_id': shift_id}
+
+    for shift in shifts:
+        missing = shift.required_employees - len(schedule.get_employees_for_shift(shift.id))
+        if missing > 0:
+            yield {'rule': VIOLATION_UNDERSTAFFED, 'employee_id': None, 'shift_id': shift.id, 'missing': missing}
+
+
+def who_can_cover(schedule: Schedule, shift_id: int, top_k: int = None) -> list[dict]:
+    """
+    Responde "¿quién puede tomar este turno ahora?".
+
+    Retorna los empleados que hoy podrían agregarse al turno sin romper
+    ninguna regla (disponibles ese día, con horas suficientes y sin
+    solapamiento), ordenados por horas restantes de mayor a menor
+    (desempate por id). Recorre el índice por día de horas restantes del
+    Schedule (get_employees_by_remaining_hours), que se mantiene al día en
+    cada alta y baja, desde el empleado con más horas restantes: con top_k
+    se detiene al juntar top_k candidatos, y en cualquier caso al llegar a
+    alguien sin horas suficientes. El solapamiento (línea de tiempo o
+    ConflictGraph) solo se consulta para los que se recorren.
+
+    Con top_k, el costo depende de cuántos empleados con más horas
+    restantes se descartan antes de juntar top_k (ya asignados al turno o
+    con solapamiento), no del tamaño de la plantilla. La primera consulta
+    sobre un horario arma el índice, en O(E log E).
+
+    El horario debe tener registrados sus turnos y su plantilla de empleados
+    (como el que retorna assign_shifts).
+
+    Args:
+        schedule: Horario actual (no se modifica)
+        shift_id: ID del turno a cubrir
+        top_k: Máximo de candidatos a retornar (None = todos)
+
+    Returns:
+        list: [{'employee_id': int, 'remaining_hours': int}, ...]
+    """
+    shift = schedule.get_shift(shift_id)
+    if shift is None:
+        raise ValueError(f"Shift {shift_id} no está registrado en el horario")
+    return _cover_candidates(schedule, shift, top_k)
+
+
+def who_can_cover_batch(schedule: Schedule, shift_ids: list[int], top_k: int = None) -> dict:
+    """
+    Versión por lotes de who_can_cover: cada turno se evalúa por separado
+    contra el horario actual.
+
+    Returns:
+        dict: {shift_id: [{'employee_id': int, 'remaining_hours': int}, ...]}
+    """
+    results = {}
+    for shift_id in shift_ids:
+        shift = schedule.get_shift(shift_id)
+        if shift is None:
+            raise ValueError(f"Shift {shift_id} no está registrado en el horario")
+        results[shift_id] = _cover_candidates(schedule, shift, top_k)
+    return results
+
+
+def update_schedule(schedule: Schedule, delta: dict) -> dict:
+    """
+    Repara un horario existente ante cambios puntuales, sin recalcularlo.
+
+    Solo se tocan los turnos y empleados afectados; el resto de las
+    asignaciones se conserva tal cual, para que las notificaciones al
+    personal se limiten a lo que realmente cambió.
+
+    - Empleado eliminado: sale de todos sus turnos, que se vuelven a cubrir.
+    - Empleado modificado: sale de los turnos que ya no puede cumplir (días
+      no disponibles, o los más tardíos de la semana si bajó su máximo).
+    - Empleado nuevo o modificado: puede cubrir turnos incompletos de los
+      días en que está disponible.
+    - Turno eliminado: se quitan sus asignaciones.
+    - Turno modificado: conserva a los empleados que aún pueden cumplirlo.
+    - Turno nuevo: se cubre con los empleados menos cargados.
+
+    El horario debe tener registrados sus turnos y su plantilla de empleados
+    (como el que retorna assign_shifts).
+
+    Args:
+        schedule: Horario a actualizar (se modifica en sitio)
+        delta: dict con claves opcionales:
+            'added_employees', 'changed_employees': listas de Employee
+            'removed_employees': lista de IDs de empleado
+            'added_shifts', 'changed_shifts': listas de Shift
+            'removed_shifts': lista de IDs de turno
+
+    Returns:
+        dict con estructura:
+        {
+            'schedule': el mismo Schedule actualizado,
+            'warnings': [warnings solo de los turnos afectados que quedaron incompletos],
+            'added': [(employee_id, shift_id) asignaciones nuevas],
+            'removed': [(employee_id, shift_id) asignaciones quitadas]
+        }
+
+    Raises:
+        ValueError: Si un turno de 'added_shifts' ya está registrado (y no
+                    se quita en el mismo delta) o aparece dos veces. Se
+                    valida antes de aplicar cualquier cambio
+    """
+    removed_shift_ids = set(delta.get('removed_shifts', ()))
+    added_shift_ids = set()
+    for shift in delta.get('added_shifts', ()):
+        if shift.id in added_shift_ids or (schedule.get_shift(shift.id) is not None
+                                           and shift.id not in removed_shift_ids):
+            raise ValueError(f"Shift {shift.id} ya está registrado en el horario; "
+                             f"usa 'changed_shifts' para modificarlo")
+        added_shift_ids.add(shift.id)
+
+    changes = {}        # {(employee_id, shift_id): +1 alta / -1 baja}, neto
+    affected = {}       # {shift_id: None} turnos a revisar
+
+    def assign(employee_id, shift_id):
+        schedule.assign_employee_to_shift(employee_id, shift_id)
+        _record_change(changes, (employee_id, shift_id), 1)
+
+    def unassign(employee_id, shift_id):
+        schedule.remove_employee_from_shift(employee_id, shift_id)
+        _record_change(changes, (employee_id, shift_id), -1)
+        affected[shift_id] = None
+
+    for employee_id in delta.get('removed_employees', ()):
+        for shift_id in list(schedule.get_shifts_for_employee(employee_id)):
+            unassign(employee_id, shift_id)
+        schedule.unregister_employee(employee_id)
+
+    for shift_id in delta.get('removed_shifts', ()):
+        for employee_id in list(schedule.get_employees_for_shift(shift_id)):
+            unassign(employee_id, shift_id)
+        schedule.unregister_shift(shift_id)
+
+    new_capacity = list(delta.get('added_employees', ())) + list(delta.get('changed_employees', ()))
+    for employee in delta.get('changed_employees', ()):
+        schedule.register_employees([employee])
+        own_shifts = sorted((schedule.get_shift(shift_id)
+                             for shift_id in schedule.get_shifts_for_employee(employee.id)),
+                            key=lambda shift: (shift.week_start(), shift.id))
+        for shift in own_shifts:
+            if not employee.is_available(shift.day):
+                unassign(employee.id, shift.id)
+        for shift in reversed(own_shifts):
+            if schedule.get_employee_hours(employee.id) <= employee.max_hours_per_week:
+                break
+            if schedule.is_assigned(employee.id, shift.id):
+                unassign(employee.id, shift.id)
+
+    for shift in delta.get('changed_shifts', ()):
+        previous = list(schedule.get_employees_for_shift(shift.id))
+        for employee_id in previous:
+            unassign(employee_id, shift.id)
+        schedule.replace_shift(shift)
+        affected[shift.id] = None
+        for employee_id in previous:
+            employee = schedule.get_employee(employee_id)
+            if (len(schedule.get_employees_for_shift(shift.id)) < shift.required_employees
+                    and employee is not None and _rejection_reason(schedule, employee, shift, ()) is None):
+                assign(employee_id, shift.id)
+
+    for shift in delta.get('added_shifts', ()):
+        schedule.register_shifts([shift])
+        affected[shift.id] = None
+
+    schedule.register_employees(delta.get('added_employees', ()))
+
+    day_order = _day_order()
+    by_week_order = lambda s: (day_order[s.day], s.start_hour, s.id)
+    warnings = []
+    pending = sorted((schedule.get_shift(shift_id) for shift_id in affected
+                      if schedule.get_shift(shift_id) is not None),
+                     key=by_week_order)
+    for shift in pending:
+        _fill_shift(schedule, shift, _ranked_candidates(schedule, shift), assign)
+        assigned = len(schedule.get_employees_for_shift(shift.id))
+        if assigned < shift.required_employees:
+            warnings.append(_understaffed_warning(shift, assigned))
+
+    # Los empleados nuevos o con más margen solo se ofrecen a los demás
+    # turnos incompletos; esos turnos no generan warnings porque no cambiaron.
+    if new_capacity:
+        open_shifts = sorted((schedule.get_shift(shift_id) for shift_id in schedule.get_open_shift_ids()
+                              if shift_id not in affected), key=by_week_order)
+        for shift in open_shifts:
+            offers = sorted((employee for employee in new_capacity
+                             if employee.is_available(shift.day) and not schedule.is_assigned(employee.id, shift.id)),
+                            key=lambda employee: (schedule.get_employee_hours(employee.id), employee.id))
+            _fill_shift(schedule, shift, offers, assign)
+
+    return {
+        'schedule': schedule,
+        'warnings': warnings,
+        'added': [pair for pair, change in changes.items() if change > 0],
+        'removed': [pair for pair, change in changes.items() if change < 0],
+    }
+
+
+def improve_schedule(
+    schedule: Schedule,
+    employees: list[Employee],
+    shifts: list[Shift],
+    time_budget: float = 1.0,
+    seed: int = None
+) -> dict:
+    """
+    Mejora un horario con búsqueda local hasta agotar `time_budget`.
+
+    Pensado para el resultado de assign_shifts: aplica simulated annealing
+    (ver solver.local_search) con movimientos de cubrir un puesto libre,
+    reasignar un turno y cruzar turnos entre dos empleados. Primero reduce
+    los puestos sin cubrir y después el desbalance de horas. Cada movimiento
+    cumple las reglas de swap_shifts (disponibilidad, horas máximas y
+    solapamiento), y al terminar queda la mejor solución vista, que nunca es
+    peor que la inicial.
+
+    Args:
+        schedule: Horario válido a mejorar (se modifica en sitio)
+        employees: Lista de empleados
+        shifts: Lista de turnos
+        time_budget: Segundos máximos de reloj
+        seed: Semilla para reproducir la secuencia de movimientos
+
+    Returns:
+        dict con estructura:
+        {
+            'schedule': el mismo Schedule mejorado,
+            'warnings': [turnos que siguen incompletos],
+            'employee_hours': {employee_id: total_hours_asignadas},
+            'iterations': movimientos evaluados,
+            'iterations_per_second': float,
+            'elapsed': segundos usados
+        }
+    """
+    if time_budget < 0:
+        raise ValueError(f"time_budget no puede ser negativo: {time_budget}")
+    started = time.perf_counter()
+    schedule.register_shifts(shifts)
+
+    from solver import local_search
+    iterations = local_search(schedule, employees, list(shifts), deadline=started + time_budget,
+                              rng=random.Random(seed))
+    elapsed = time.perf_counter() - started
+
+    day_order = _day_order()
+    ordered_shifts = sorted(shifts, key=lambda s: (day_order[s.day], s.start_hour, s.id))
     return {
-        'success': False,
-        'message': 'No implementado',
-        'updated_schedule': None
+        'schedule': schedule,
+        'warnings': _understaffed_warnings(schedule, ordered_shifts),
+        'employee_hours': {emp.id: schedule.get_employee_hours(emp.id) for emp in employees},
+        'iterations': iterations,
+        'iterations_per_second': iterations / elapsed if elapsed > 0 else 0.0,
+        'elapsed': elapsed,
     }
 
 
 # ============================================================================
-# FUNCIONES AUXILIARES (OPCIONALES)
+# FUNCIONES AUXILIARES
 # ============================================================================
-# Puedes agregar funciones auxiliares aquí para hacer tu código más limpio
+
+class _LoadQueue:
+    """
+    Colas de prioridad de empleados ordenadas por (horas acumuladas, id),
+    para recorrer los turnos en orden de la semana.
+
+    Son min-heaps que no se reconstruyen entre turnos: take() saca
+    candidatos en orden de carga y los elegidos se reinsertan con su nueva
+    carga al llamar restore(). Para no sacar y volver a meter en cada turno
+    a candidatos que no pueden tomarlo, los heaps se separan así:
+
+    - Por día, solo con los empleados disponibles ese día.
+    - Dentro del día, por horas restantes (hasta la duración del turno más
+      largo): un turno de d horas solo mira los heaps con al menos d horas
+      restantes. Los empleados con menos horas restantes que el turno más
+      corto se descartan definitivamente.
+    - Los rechazados por solapamiento se estacionan hasta el siguiente
+      horario de inicio: los turnos que empiezan a la misma hora los
+      rechazarían igual, porque todos sus turnos asignados empezaron antes.
+
+    Cuando un empleado toma un turno, sus entradas en los demás heaps quedan
+    con una carga vieja (menor que la real). Se corrigen de forma perezosa:
+    al salir se comparan con el Schedule y, si cambió, se reinsertan con la
+    carga actual. Así el orden de salida es el mismo que con una sola cola
+    siempre al día.
+
+    Requiere que los empleados estén registrados en el Schedule y que los
+    turnos se pidan en orden de week_start.
+    """
+
+    def __init__(self, employees: list[Employee], schedule: Schedule, durations: list[int]):
+        self._schedule = schedule
+        self._employees = {employee.id: employee for employee in employees}
+        self._min_duration = min(durations, default=1)
+        self._max_duration = max(durations, default=1)
+        # {día: [heap de (horas, id) por horas restantes, con tope _max_duration]}
+        self._heaps = {day: [[] for _ in range(self._max_duration + 1)] for day in DAYS}
+        self._parked = []   # heap de (week_start a partir del cual vuelve, día, horas, id)
+
+        for day in DAYS:
+            for employee_id in schedule.get_employees_available(day):
+                hours = schedule.get_employee_hours(employee_id)
+                heap = self._heap_for(day, hours, employee_id)
+                if heap is not None:
+                    heap.append((hours, employee_id))
+            for heap in self._heaps[day]:
+                heapq.heapify(heap)
+
+    def _heap_for(self, day: str, hours: int, employee_id: int):
+        """Retorna el heap de sus horas restantes, o None si ya no le cabe ningún turno."""
+        remaining = self._employees[employee_id].max_hours_per_week - hours
+        if remaining < self._min_duration:
+            return None
+        return self._heaps[day][min(remaining, self._max_duration)]
+
+    def _push(self, day: str, hours: int, employee_id: int):
+        heap = self._heap_for(day, hours, employee_id)
+        if heap is not None:
+            heapq.heappush(heap, (hours, employee_id))
+
+    def take(self, shift: Shift, reason) -> list[Employee]:
+        """
+        Saca hasta required_employees empleados disponibles el día del
+        turno, de menor a mayor carga, para los que reason(employee) es
+        None (puede tomarlo). Los elegidos quedan fuera de las colas hasta
+        que se pasen a restore().
+        """
+        start = shift.week_start()
+        while self._parked and self._parked[0][0] <= start:
+            _, day, hours, employee_id = heapq.heappop(self._parked)
+            self._push(day, hours, employee_id)
+
+        heaps = self._heaps[shift.day][shift.duration_hours:]
+        chosen = []
+        skipped = []
+        while len(chosen) < shift.required_employees:
+            heap = min((heap for heap in heaps if heap), key=lambda heap: heap[0], default=None)
+            if heap is None:
+                break
+            hours, employee_id = heapq.heappop(heap)
+            current = self._schedule.get_employee_hours(employee_id)
+            if current != hours:
+                self._push(shift.day, current, employee_id)
+                continue
+            employee = self._employees[employee_id]
+            rejection = reason(employee)
+            if rejection is None:
+                chosen.append(employee)
+            elif rejection == REJECT_OVERLAP:
+                heapq.heappush(self._parked, (start + 1, shift.day, hours, employee_id))
+            else:
+                skipped.append((hours, employee_id))
+
+        for hours, employee_id in skipped:
+            self._push(shift.day, hours, employee_id)
+        return chosen
+
+    def restore(self, day: str, employees: list[Employee]):
+        """Reinserta en las colas de `day` a empleados con su carga actual según el Schedule."""
+        for employee in employees:
+            self._push(day, self._schedule.get_employee_hours(employee.id), employee.id)
+
+
+def _swap_error(schedule: Schedule, employee1_id: int, employee2_id: int, shift_id: int,
+                employee1: Employee, shift: Shift, shifts: list[Shift], instrumentation: Instrumentation = None):
+    """
+    Helper: Valida que employee1 pueda tomar el turno de employee2. Con
+    `instrumentation`, las reglas se miden y cuentan.
+
+    Returns:
+        None si el intercambio es válido, o el mensaje de error.
+    """
+    if employee1 is None:
+        return f"Employee {employee1_id} no existe"
+    if shift is None:
+        return f"Shift {shift_id} no existe"
+    if not schedule.is_assigned(employee2_id, shift_id):
+        return f"Employee {employee2_id} no está asignado al turno {shift_id}"
+    if schedule.is_assigned(employee1_id, shift_id):
+        return f"Employee {employee1_id} ya está asignado al turno {shift_id}"
+    if instrumentation is None:
+        reason = _rejection_reason(schedule, employee1, shift, shifts)
+    else:
+        reason = _instrumented_rejection_reason(schedule, employee1, shift, shifts, instrumentation, check_day=True)
+    if reason is not None:
+        return _rejection_message(employee1, shift, reason)
+    return None
+
+
+def _employee_violations(employee: Employee, entries: list[tuple], busy_until: int):
+    """
+    Helper de iter_violations: revisa los turnos de un empleado, ya
+    ordenados como (week_start, week_end, shift_id, duración, bit del día).
+
+    Para el solapamiento basta comparar cada turno con el que termina más
+    tarde entre los anteriores.
+    """
+    employee_id = employee.id
+    available = employee.availability_mask()
+    latest_end, latest_id = busy_until, None
+    total = 0
+    limit = employee.max_hours_per_week
+    exceeded_at = None
+    for start, end, shift_id, duration, day_bit in entries:
+        if not available & day_bit:
+            yield {'rule': VIOLATION_UNAVAILABLE, 'employee_id': employee_id, 'shift_id': shift_id}
+        if start < latest_end:
+            yield {'rule': VIOLATION_OVERLAP, 'employee_id': employee_id, 'shift_id': shift_id,
+                   'conflicting_shift_id': latest_id}
+        if end > latest_end:
+            latest_end, latest_id = end, shift_id
+        total += duration
+        if exceeded_at is None and total > limit:
+            exceeded_at = shift_id
+    if exceeded_at is not None:
+        yield {'rule': VIOLATION_HOURS, 'employee_id': employee_id, 'shift_id': exceeded_at,
+               'excess_hours': total - limit}
+
+
+def _rollback(schedule: Schedule, journal: list):
+    """Helper: Deshace las operaciones del journal en orden inverso."""
+    for employee_id, shift_id, assigned in reversed(journal):
+        if assigned:
+            schedule.remove_employee_from_shift(employee_id, shift_id)
+        else:
+            schedule.assign_employee_to_shift(employee_id, shift_id)
+    journal.clear()
+
+
+def _rejection_reason(schedule: Schedule, employee: Employee, shift: Shift, shifts: list[Shift]):
+    """
+    Helper: Verifica si un empleado puede tomar un turno.
+
+    Returns:
+        None si puede, o el motivo de rechazo (REJECT_UNAVAILABLE,
+        REJECT_HOURS o REJECT_OVERLAP), en ese orden de prioridad.
+    """
+    if not employee.is_available(shift.day):
+        return REJECT_UNAVAILABLE
+    return _schedule_rejection_reason(schedule, employee, shift, shifts)
+
+
+def _schedule_rejection_reason(schedule: Schedule, employee: Employee, shift: Shift, shifts: list[Shift]):
+    """
+    Helper: Como _rejection_reason, pero sin revisar el día; solo las reglas
+    que dependen del horario actual (horas máximas y solapamiento).
+
+    Si el Schedule tiene un FeasibilityCache adjunto, el resultado se
+    memoriza por (employee.id, shift.id).
+    """
+    cache = schedule.get_feasibility_cache()
+    if cache is None:
+        return _compute_schedule_rejection_reason(schedule, employee, shift, shifts)
+
+    reason = cache.get(employee.id, shift.id)
+    if reason is FeasibilityCache.MISS:
+        reason = _compute_schedule_rejection_reason(schedule, employee, shift, shifts)
+        cache.put(employee.id, shift.id, reason)
+    return reason
+
+
+def _compute_schedule_rejection_reason(schedule: Schedule, employee: Employee, shift: Shift, shifts: list[Shift]):
+    """Helper: Evalúa horas máximas y solapamiento sin cache."""
+    if _calculate_total_hours(schedule, employee.id, shifts) + shift.duration_hours > employee.max_hours_per_week:
+        return REJECT_HOURS
+    if _has_schedule_conflict(schedule, employee.id, shift, shifts):
+        return REJECT_OVERLAP
+    return None
+
+
+def _instrumented_selection(schedule: Schedule, queue: '_LoadQueue', ordered_shifts: list[Shift],
+                            shifts: list[Shift], instrumentation: Instrumentation):
+    """
+    Helper: El bucle greedy de _assign_week, midiendo cada regla y contando
+    candidatos. Va aparte para que el camino sin instrumentación no pague
+    ni una comprobación por candidato.
+    """
+    unavailable = _unavailable_counts(schedule)
+    notify = instrumentation.wants(EVENT_ASSIGNMENT)
+    for shift in ordered_shifts:
+        instrumentation.count('rejected_unavailable', unavailable[shift.day])
+        chosen = queue.take(shift, lambda employee: _instrumented_rejection_reason(schedule, employee, shift, shifts,
+                                                                                   instrumentation))
+        for employee in chosen:
+            schedule.assign_employee_to_shift(employee.id, shift.id)
+            if notify:
+                instrumentation.emit(EVENT_ASSIGNMENT, employee_id=employee.id, shift_id=shift.id)
+        instrumentation.count('assignments', len(chosen))
+        queue.restore(shift.day, chosen)
+
+
+def _unavailable_counts(schedule: Schedule) -> dict:
+    """Helper: {día: cantidad de empleados registrados no disponibles ese día}."""
+    registered = set()
+    for day in DAYS:
+        registered.update(schedule.get_employees_available(day))
+    return {day: len(registered) - len(schedule.get_employees_available(day)) for day in DAYS}
+
+
+def _instrumented_rejection_reason(schedule: Schedule, employee: Employee, shift: Shift, shifts: list[Shift],
+                                   instrumentation: Instrumentation, check_day: bool = False):
+    """
+    Helper: Como _schedule_rejection_reason (o _rejection_reason si
+    `check_day`), pero acumula el tiempo de cada regla en
+    'availability_check', 'hours_check' y 'overlap_check', cuenta el
+    candidato y su rechazo, y emite EVENT_REJECTION.
+    """
+    clock = time.perf_counter
+    instrumentation.count('candidates_examined')
+    reason = None
+    if check_day:
+        checked = clock()
+        if not employee.is_available(shift.day):
+            reason = REJECT_UNAVAILABLE
+        instrumentation.add_time('availability_check', clock() - checked)
+
+    if reason is None:
+        cache = schedule.get_feasibility_cache()
+        reason = FeasibilityCache.MISS if cache is None else cache.get(employee.id, shift.id)
+        if reason is FeasibilityCache.MISS:
+            checked = clock()
+            exceeds = (_calculate_total_hours(schedule, employee.id, shifts) + shift.duration_hours
+                       > employee.max_hours_per_week)
+            hours_checked = clock()
+            instrumentation.add_time('hours_check', hours_checked - checked)
+            if exceeds:
+                reason = REJECT_HOURS
+            else:
+                reason = REJECT_OVERLAP if _has_schedule_conflict(schedule, employee.id, shift, shifts) else None
+                instrumentation.add_time('overlap_check', clock() - hours_checked)
+            if cache is not None:
+                cache.put(employee.id, shift.id, reason)
+        else:
+            instrumentation.count('cache_hits')
+
+    if reason is not None:
+        instrumentation.count(f'rejected_{reason}')
+        if instrumentation.wants(EVENT_REJECTION):
+            instrumentation.emit(EVENT_REJECTION, employee_id=employee.id, shift_id=shift.id, reason=reason)
+    return reason
+
+
+def _rejection_message(employee: Employee, shift: Shift, reason: str) -> str:
+    """Helper: Mensaje legible para un motivo de rechazo."""
+    if reason == REJECT_UNAVAILABLE:
+        return f"Employee {employee.id} no está disponible el {shift.day}"
+    if reason == REJECT_HOURS:
+        return f"Employee {employee.id} excedería sus horas máximas ({employee.max_hours_per_week}h)"
+    return f"Employee {employee.id} tiene conflicto de horario con el turno {shift.id}"
+
 
 def _get_employee_by_id(employees: list[Employee], employee_id: int) -> Employee:
-    """Helper: Busca un empleado por ID."""
-    # TODO: Implementar si lo necesitas
-    pass
+    """Helper: Busca un empleado por ID. Retorna None si no existe."""
+    for employee in employees:
+        if employee.id == employee_id:
+            return employee
+    return None
 
 
 def _get_shift_by_id(shifts: list[Shift], shift_id: int) -> Shift:
-    """Helper: Busca un turno por ID."""
-    # TODO: Implementar si lo necesitas
-    pass
+    """Helper: Busca un turno por ID. Retorna None si no existe."""
+    for shift in shifts:
+        if shift.id == shift_id:
+            return shift
+    return None
 
 
 def _calculate_total_hours(schedule: Schedule, employee_id: int, shifts: list[Shift]) -> int:
-    """Helper: Calcula horas totales asignadas a un empleado."""
-    # TODO: Implementar si lo necesitas
-    pass
+    """
+    Helper: Calcula horas totales asignadas a un empleado.
+
+    Lee el acumulado de horas del Schedule (O(1)). Si el empleado tiene
+    turnos que el Schedule aún no conoce, los registra primero desde `shifts`.
+    """
+    if not schedule.is_fully_registered(employee_id):
+        schedule.register_shifts(shifts)
+    return schedule.get_employee_hours(employee_id)
 
 
 def _has_schedule_conflict(schedule: Schedule, employee_id: int, new_shift: Shift, shifts: list[Shift]) -> bool:
-    """Helper: Verifica si un nuevo turno genera conflicto de horario."""
-    # TODO: Implementar si lo necesitas
-    pass
+    """
+    Helper: Verifica si un nuevo turno genera conflicto de horario.
+
+    Usa el ConflictGraph adjunto al Schedule si lo hay (O(1) por vecino) o
+    si no la línea de tiempo por empleado (O(log n)). Si el empleado tiene
+    turnos que el Schedule aún no conoce, los registra primero desde `shifts`.
+    """
+    if not schedule.is_fully_registered(employee_id):
+        schedule.register_shifts(shifts)
+    return schedule.has_conflict(employee_id, new_shift)
+
+
+def _record_change(changes: dict, pair: tuple, change: int):
+    """Helper: Acumula altas/bajas de una asignación; las que se anulan desaparecen."""
+    net = changes.pop(pair, 0) + change
+    if net:
+        changes[pair] = net
+
+
+def _ranked_candidates(schedule: Schedule, shift: Shift):
+    """
+    Helper: Genera los empleados registrados disponibles el día del turno y
+    aún no asignados a él, de menor a mayor carga (desempate por id).
+
+    Usa heapify + pops en lugar de ordenar todo, porque normalmente se
+    consumen solo los primeros. La carga se lee al crear el heap: si el
+    horario cambia mientras se consume, el orden restante no se ajusta.
+    """
+    heap = [(schedule.get_employee_hours(employee_id), employee_id)
+            for employee_id in schedule.get_employees_available(shift.day)
+            if not schedule.is_assigned(employee_id, shift.id)]
+    heapq.heapify(heap)
+    while heap:
+        yield schedule.get_employee(heapq.heappop(heap)[1])
+
+
+def _cover_candidates(schedule: Schedule, shift: Shift, top_k: int) -> list[dict]:
+    """
+    Helper de who_can_cover: recorre los disponibles del día de más a menos
+    horas restantes y verifica el solapamiento solo de los que recorre,
+    hasta juntar top_k o llegar a alguien sin horas para el turno.
+    """
+    limit = float('inf') if top_k is None else top_k
+    ranked = []
+    if limit <= 0:
+        return ranked
+    for negative_remaining, employee_id in schedule.get_employees_by_remaining_hours(shift.day):
+        if -negative_remaining < shift.duration_hours:
+            break
+        if schedule.is_assigned(employee_id, shift.id) or schedule.has_conflict(employee_id, shift):
+            continue
+        ranked.append({'employee_id': employee_id, 'remaining_hours': -negative_remaining})
+        if len(ranked) >= limit:
+            break
+    return ranked
+
+
+def _fill_shift(schedule: Schedule, shift: Shift, candidates, assign):
+    """
+    Helper: Asigna candidatos (en el orden recibido) que cumplan las reglas
+    hasta completar required_employees. `assign(employee_id, shift_id)` hace
+    la asignación, para que el llamador pueda registrarla.
+    """
+    missing = shift.required_employees - len(schedule.get_employees_for_shift(shift.id))
+    for employee in candidates:
+        if missing <= 0:
+            break
+        if _schedule_rejection_reason(schedule, employee, shift, ()) is None:
+            assign(employee.id, shift.id)
+            missing -= 1
+
+
+def _optimality_gap(schedule: Schedule, shifts: list[Shift], limits: dict) -> float:
+    """
+    Helper: Brecha de cobertura respecto a una cota superior.
+
+    La cota suma, por turno, min(required_employees, empleados disponibles
+    ese día cuyo máximo semanal admite el turno), que es el 'shift_limits'
+    de capacity.analyze_capacity. Retorna (cota - puestos cubiertos) / cota,
+    o 0.0 si no hay nada que cubrir.
+    """
+    upper_bound = covered = 0
+    for shift in shifts:
+        upper_bound += limits[shift.id]
+        covered += min(shift.required_employees, len(schedule.get_employees_for_shift(shift.id)))
+    return (upper_bound - covered) / upper_bound if upper_bound else 0.0
+
+
+def _check_mode(mode: str):
+    """Helper: Valida el modo de assign_shifts."""
+    if mode not in (MODE_GREEDY, MODE_OPTIMAL):
+        raise ValueError(f"mode debe ser {MODE_GREEDY!r} u {MODE_OPTIMAL!r}: {mode!r}")
+
+
+def _spillover(schedule: Schedule, shifts: list[Shift]) -> dict:
+    """
+    Helper: {employee_id: hora} que los turnos de esta semana ocupan al
+    inicio de la siguiente (turnos del domingo que cruzan medianoche).
+    """
+    busy_until = {}
+    for shift in shifts:
+        overflow = shift.week_end() - HOURS_PER_WEEK
+        if overflow > 0:
+            for employee_id in schedule.get_employees_for_shift(shift.id):
+                busy_until[employee_id] = max(busy_until.get(employee_id, 0), overflow)
+    return busy_until
+
+
+def _understaffed_warnings(schedule: Schedule, ordered_shifts: list[Shift]) -> list[str]:
+    """Helper: Warnings de los turnos con menos empleados de los requeridos, en el orden recibido."""
+    return [
+        _understaffed_warning(shift, len(schedule.get_employees_for_shift(shift.id)))
+        for shift in ordered_shifts
+        if len(schedule.get_employees_for_shift(shift.id)) < shift.required_employees
+    ]
+
+
+def _understaffed_warning(shift: Shift, assigned: int) -> str:
+    """Helper: Mensaje de warning para un turno con menos empleados de los requeridos."""
+    plural = '' if assigned == 1 else 's'
+    return (f"Shift {shift.id} ({shift.day} {shift.start_hour}:00) tiene solo {assigned} "
+            f"empleado{plural} asignado{plural}, necesita {shift.required_employees}")
+
+
+def _phase(instrumentation: Instrumentation, name: str):
+    """Helper: instrumentation.phase(name), o un contexto vacío sin instrumentación."""
+    return nullcontext() if instrumentation is None else instrumentation.phase(name)
 
 
 def _day_order() -> dict:
     """Helper: Retorna orden de días para ordenamiento."""
-    return {
-        'monday': 1,
-        'tuesday': 2,
-        'wednesday': 3,
-        'thursday': 4,
-        'friday': 5,
-        'saturday': 6,
-        'sunday': 7
-    }
+    return {day: position for position, day in enumerate(DAYS, start=1)}
@@ -0,0 +1,392 @@
+"""
+Servicio local de horarios sobre asyncio, con protocolo JSON lines por TCP.
+
+Mantiene horarios en memoria, identificados por nombre, y atiende una
+petición por línea. Cada respuesta es una línea con el mismo "id" que la
+petición:
+
+    {"id": 1, "op": "assign", "schedule": "sede-1", "employees": [...], "shifts": [...]}
+    {"id": 1, "ok": true, "result": {"warnings": [...], "employee_hours": {"1": 16, ...}}}
+
+    {"id": 2, "op": "swap", "schedule": "sede-1", "employee1_id": 3, "employee2_id": 1, "shift_id": 5}
+    {"id": 2, "ok": true, "result": {"success": false, "message": "Employee 3 no está disponible el monday"}}
+
+    {"id": 3, "op": "who_can_cover", "schedule": "sede-1", "shift_id": 5, "top_k": 3}
+    {"id": 4, "op": "get_shifts_for_employee", "schedule": "sede-1", "employee_id": 3}
+    {"id": 5, "op": "nope"}
+    {"id": 5, "ok": false, "error": "Operación desconocida: 'nope'"}
+
+Empleados y turnos usan el mismo formato que jsonl.py. "mode" y
+"time_budget" de assign son opcionales, como en assign_shifts.
+
+Concurrencia: cada petición corre como su propia tarea (también las de una
+misma conexión, así que las respuestas pueden llegar en otro orden) y el
+trabajo sobre el Schedule se hace en un hilo, para no bloquear el event
+loop. Antes de tocar el horario, la petición toma locks por empleado y por
+turno (swap: employee1, employee2 y el turno; get_shifts_for_employee:
+el empleado), siempre en el mismo orden para no trabarse. Dos intercambios
+que comparten un empleado o un turno se serializan, así que las reglas se
+validan contra un estado que nadie más está cambiando; los independientes
+avanzan a la vez. Con el GIL eso no es paralelismo de CPU, pero los
+intercambios independientes se intercalan y ninguno espera a los demás.
+
+who_can_cover lee las horas y líneas de tiempo de todos los candidatos,
+así que no corre a la vez que ningún intercambio: espera a que terminen
+los que están en curso, y los intercambios que llegan esperan a que
+terminen las consultas (con prioridad para los intercambios, para que un
+flujo continuo de consultas no los postergue). La respuesta es una foto
+consistente, que puede quedar vieja: swap vuelve a validar. assign
+reemplaza el horario completo: espera a que terminen las peticiones en
+curso sobre ese horario y bloquea las nuevas hasta instalar el resultado.
+
+Cada horario instalado guarda sus índices por id de empleados y turnos,
+así que un swap valida y aplica en O(1), sin recorrer las listas. Los
+locks por clave no alcanzan para modificar el Schedule desde varios hilos
+a la vez, porque cada alta o baja también actualiza índices compartidos
+por todos los empleados (ver Schedule). Por eso la validación y la
+aplicación de un swap corren bajo un threading.Lock por horario. Esa
+sección dura microsegundos, y lo que se intercala entre intercambios
+independientes es todo lo demás: parseo, locks y respuesta.
+
+Uso:
+    python service.py [--host 127.0.0.1] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+
+from jsonl import (EMPLOYEE_FIELDS, SHIFT_FIELDS, _OPTIONAL_EMPLOYEE_FIELDS, _check_record, _employee_from_record,
+                   _shift_from_record)
+from scheduler import MODE_GREEDY, SWAP_SUCCESS_MESSAGE, _swap_error, assign_shifts, who_can_cover
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Operaciones del protocolo
+OP_ASSIGN = 'assign'
+OP_SWAP = 'swap'
+OP_WHO_CAN_COVER = 'who_can_cover'
+OP_GET_SHIFTS_FOR_EMPLOYEE = 'get_shifts_for_employee'
+
+# Límite de una línea de petición (una plantilla grande entra en un assign)
+_LINE_LIMIT = 2 ** 26
+
+# Cómo usa una petición el horario en modo compartido (ver _Entry.shared)
+_ROLE_READ = 'read'         # Lee solo lo de sus claves
+_ROLE_WRITE = 'write'       # Modifica lo de sus claves (swap)
+_ROLE_SCAN = 'scan'         # Lee todo el horario (who_can_cover)
+
+
+class ScheduleService:
+    """
+    Horarios en memoria y las operaciones del protocolo.
+
+    handle(request) atiende una petición ya parseada; serve() la expone por
+    TCP. Se puede usar sin sockets desde otro código asyncio.
+    """
+
+    def __init__(self):
+        self._entries = {}      # {nombre: _Entry}
+
+    async def handle(self, request) -> dict:
+        """
+        Atiende una petición y retorna la respuesta (nunca lanza por errores
+        de la petición: los reporta como {"ok": false, "error": ...}).
+        """
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("La petición debe ser un objeto JSON")
+            handler = self._handlers().get(request.get('op'))
+            if handler is None:
+                raise ValueError(f"Operación desconocida: {request.get('op')!r}")
+            result = await handler(request)
+        except (ValueError, KeyError) as error:
+            message = f"Falta el campo {error}" if isinstance(error, KeyError) else str(error)
+            return {'id': request_id, 'ok': False, 'error': message}
+        return {'id': request_id, 'ok': True, 'result': result}
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Abre el servidor TCP (usa port=0 para un puerto libre) y lo retorna ya escuchando."""
+        return await asyncio.start_server(self._serve_connection, host, port, limit=_LINE_LIMIT)
+
+    def _handlers(self) -> dict:
+        return {
+            OP_ASSIGN: self._assign,
+            OP_SWAP: self._swap,
+            OP_WHO_CAN_COVER: self._who_can_cover,
+            OP_GET_SHIFTS_FOR_EMPLOYEE: self._get_shifts_for_employee,
+        }
+
+    async def _assign(self, request: dict) -> dict:
+        name = _field(request, 'schedule', str)
+        employees = _records(request, 'employees', EMPLOYEE_FIELDS, _OPTIONAL_EMPLOYEE_FIELDS, _employee_from_record)
+        shifts = _records(request, 'shifts', SHIFT_FIELDS, (), _shift_from_record)
+        mode = request.get('mode', MODE_GREEDY)
+        time_budget = request.get('time_budget', 1.0)
+        if type(time_budget) not in (int, float):
+            raise ValueError(f"time_budget debe ser un número, no {type(time_budget).__name__}")
+
+        result = await asyncio.to_thread(assign_shifts, employees, shifts, mode, time_budget)
+        entry = self._entries.setdefault(name, _Entry())
+        async with entry.exclusive():
+            entry.install(result['schedule'], employees, shifts)
+        return {'warnings': result['warnings'], 'employee_hours': result['employee_hours']}
+
+    async def _swap(self, request: dict) -> dict:
+        entry = self._entry(request)
+        employee1_id = _field(request, 'employee1_id', int)
+        employee2_id = _field(request, 'employee2_id', int)
+        shift_id = _field(request, 'shift_id', int)
+        keys = [('employee', employee1_id), ('employee', employee2_id), ('shift', shift_id)]
+        async with entry.shared(keys, _ROLE_WRITE):
+            return await asyncio.to_thread(entry.swap, employee1_id, employee2_id, shift_id)
+
+    async def _who_can_cover(self, request: dict) -> list:
+        entry = self._entry(request)
+        shift_id = _field(request, 'shift_id', int)
+        top_k = request.get('top_k')
+        if top_k is not None and type(top_k) is not int:
+            raise ValueError(f"top_k debe ser int, no {type(top_k).__name__}")
+        async with entry.shared([], _ROLE_SCAN):
+            return await asyncio.to_thread(who_can_cover, entry.schedule, shift_id, top_k)
+
+    async def _get_shifts_for_employee(self, request: dict) -> list:
+        entry = self._entry(request)
+        employee_id = _field(request, 'employee_id', int)
+        async with entry.shared([('employee', employee_id)]):
+            return list(entry.schedule.get_shifts_for_employee(employee_id))
+
+    def _entry(self, request: dict) -> '_Entry':
+        name = _field(request, 'schedule', str)
+        entry = self._entries.get(name)
+        if entry is None or entry.schedule is None:
+            raise ValueError(f"No existe el horario {name!r}")
+        return entry
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Lee peticiones línea por línea y responde cada una apenas termina."""
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(self._respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(line)
+        except ValueError as error:      # JSONDecodeError o UnicodeDecodeError
+            response = {'id': None, 'ok': False, 'error': f"JSON no válido ({getattr(error, 'msg', error)})"}
+        else:
+            try:
+                response = await self.handle(request)
+            except Exception as error:
+                # Un error inesperado no debe dejar al cliente esperando la respuesta
+                response = {'id': request.get('id') if isinstance(request, dict) else None, 'ok': False,
+                            'error': f"Error interno: {error!r}"}
+        # write() no cede el control, así que las líneas de respuesta no se mezclan
+        writer.write(json.dumps(response, ensure_ascii=False).encode() + b'\n')
+        await writer.drain()
+
+
+class _Entry:
+    """
+    Un horario del servicio con sus locks.
+
+    Las peticiones comunes lo toman en modo compartido más los locks de sus
+    claves; assign lo toma en modo exclusivo. Dentro del modo compartido,
+    las de rol _ROLE_SCAN no coinciden con ninguna de rol _ROLE_WRITE.
+    """
+
+    def __init__(self):
+        self.schedule = None
+        self.employees = []
+        self.shifts = []
+        self._employees_by_id = {}
+        self._shifts_by_id = {}
+        self._locks = {}        # {clave: [asyncio.Lock, peticiones que la usan o esperan]}
+        self._active = 0        # Peticiones en modo compartido en curso
+        self._roles = {_ROLE_READ: 0, _ROLE_WRITE: 0, _ROLE_SCAN: 0}   # En curso, por rol
+        self._writers_waiting = 0
+        self._write_lock = threading.Lock()     # Un solo hilo modifica el Schedule a la vez
+        self._exclusive = False
+        self._changed = asyncio.Condition()
+
+    def install(self, schedule, employees: list, shifts: list):
+        self.schedule, self.employees, self.shifts = schedule, employees, shifts
+        self._employees_by_id = {employee.id: employee for employee in employees}
+        self._shifts_by_id = {shift.id: shift for shift in shifts}
+
+    def swap(self, employee1_id: int, employee2_id: int, shift_id: int) -> dict:
+        """
+        Mismas reglas y mensajes que scheduler.swap_shifts, con los índices
+        por id del horario instalado (el Schedule ya tiene todos sus turnos
+        registrados), así que no recorre plantilla ni turnos.
+
+        Corre en un hilo bajo _write_lock: valida y aplica sin que otro
+        hilo modifique el Schedule en el medio. Si el alta falla, la baja se
+        revierte, así que el turno nunca queda sin ninguno de los dos.
+        """
+        schedule = self.schedule
+        with self._write_lock:
+            error = _swap_error(schedule, employee1_id, employee2_id, shift_id,
+                                self._employees_by_id.get(employee1_id), self._shifts_by_id.get(shift_id), self.shifts)
+            if error is not None:
+                return {'success': False, 'message': error}
+            schedule.remove_employee_from_shift(employee2_id, shift_id)
+            try:
+                schedule.assign_employee_to_shift(employee1_id, shift_id)
+            except BaseException:
+                schedule.assign_employee_to_shift(employee2_id, shift_id)
+                raise
+        return {'success': True, 'message': SWAP_SUCCESS_MESSAGE}
+
+    def _admits(self, role: str) -> bool:
+        """Indica si una petición de `role` puede entrar en modo compartido ahora."""
+        if self._exclusive:
+            return False
+        if role == _ROLE_WRITE:
+            return self._roles[_ROLE_SCAN] == 0
+        if role == _ROLE_SCAN:
+            return self._roles[_ROLE_WRITE] == 0 and self._writers_waiting == 0
+        return True
+
+    async def _enter_shared(self, role: str):
+        async with self._changed:
+            if role == _ROLE_WRITE:
+                self._writers_waiting += 1
+            try:
+                await self._changed.wait_for(lambda: self._admits(role))
+            finally:
+                if role == _ROLE_WRITE:
+                    self._writers_waiting -= 1
+            self._active += 1
+            self._roles[role] += 1
+
+    async def _leave_shared(self, role: str):
+        async with self._changed:
+            self._active -= 1
+            self._roles[role] -= 1
+            self._changed.notify_all()
+
+    def shared(self, keys: list, role: str = _ROLE_READ):
+        """Contexto: modo compartido con `role` y locks de `keys`, tomados en orden."""
+        return _SharedHold(self, sorted(set(keys)), role)
+
+    def exclusive(self):
+        """Contexto: espera a que no haya peticiones en curso y bloquea las nuevas."""
+        return _ExclusiveHold(self)
+
+    def _lock_for(self, key) -> asyncio.Lock:
+        """Retorna el lock de `key`, creándolo si hace falta, y anota un usuario más."""
+        slot = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        slot[1] += 1
+        return slot[0]
+
+    def _unlock(self, key, acquired: bool):
+        """Suelta `key` (si se llegó a tomar) y borra el lock cuando nadie más lo usa."""
+        slot = self._locks[key]
+        if acquired:
+            slot[0].release()
+        slot[1] -= 1
+        if slot[1] == 0:
+            del self._locks[key]
+
+
+class _SharedHold:
+    """Contexto de _Entry.shared()."""
+
+    def __init__(self, entry: _Entry, keys: list, role: str):
+        self._entry = entry
+        self._keys = keys
+        self._role = role
+        self._held = []
+
+    async def __aenter__(self):
+        entry = self._entry
+        await entry._enter_shared(self._role)
+        try:
+            for key in self._keys:
+                lock = entry._lock_for(key)
+                try:
+                    await lock.acquire()
+                except BaseException:
+                    entry._unlock(key, acquired=False)
+                    raise
+                self._held.append(key)
+        except BaseException:
+            await self.__aexit__(None, None, None)
+            raise
+
+    async def __aexit__(self, *exc_info):
+        while self._held:
+            self._entry._unlock(self._held.pop(), acquired=True)
+        await self._entry._leave_shared(self._role)
+
+
+class _ExclusiveHold:
+    """Contexto de _Entry.exclusive()."""
+
+    def __init__(self, entry: _Entry):
+        self._entry = entry
+
+    async def __aenter__(self):
+        entry = self._entry
+        async with entry._changed:
+            await entry._changed.wait_for(lambda: not entry._exclusive)
+            entry._exclusive = True
+            await entry._changed.wait_for(lambda: entry._active == 0)
+
+    async def __aexit__(self, *exc_info):
+        entry = self._entry
+        async with entry._changed:
+            entry._exclusive = False
+            entry._changed.notify_all()
+
+
+def _field(request: dict, name: str, kind: type):
+    """Helper: Campo obligatorio de la petición, con su tipo exacto."""
+    value = request[name]
+    if type(value) is not kind:
+        raise ValueError(f"{name} debe ser {kind.__name__}, no {type(value).__name__}")
+    return value
+
+
+def _records(request: dict, name: str, fields: dict, optional, build) -> list:
+    """Helper: Valida y convierte la lista `name` de la petición con el esquema de jsonl.py."""
+    all_fields = fields.keys()
+    required = all_fields - set(optional)
+    objects = []
+    for position, record in enumerate(_field(request, name, list)):
+        try:
+            _check_record(record, fields, all_fields, required)
+            objects.append(build(record))
+        except ValueError as error:
+            raise ValueError(f"{name}[{position}]: {error}") from None
+    return objects
+
+
+async def _main(host: str, port: int):
+    server = await ScheduleService().serve(host, port)
+    print(f"Escuchando en {host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
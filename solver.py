@@ -0,0 +1,313 @@
+"""
+Solver de cobertura para assign_shifts(mode="optimal").
+
+El problema se modela como un b-matching entre turnos y empleados: cada
+turno tiene capacidad required_employees y cada empleado está limitado por
+max_hours_per_week y por no solaparse consigo mismo. Como esas dos
+restricciones del empleado dependen de qué turnos concretos tiene (no solo
+de cuántos), no caben en las capacidades de un grafo de flujo clásico; en
+su lugar se aplica la misma idea que el algoritmo de caminos mínimos
+sucesivos de min-cost flow, verificando las reglas en cada arista:
+
+1. Cobertura: para cada puesto sin cubrir se busca (BFS) un camino de
+   aumento turno -> empleado -> turno que ese empleado suelta -> otro
+   empleado ... hasta un empleado que puede tomar el último turno sin
+   soltar nada. Aplicar el camino cubre un puesto más sin descubrir
+   ninguno. Los candidatos se exploran de menor a mayor carga.
+2. Balance: se mueven turnos de empleados cargados a otros con menos
+   horas mientras eso reduzca la diferencia entre ambos.
+
+Cada paso deja el horario válido, así que si se agota el tiempo se
+conserva la mejor solución encontrada (nunca peor que la inicial).
+
+También contiene local_search, la búsqueda local (simulated annealing)
+detrás de scheduler.improve_schedule.
+"""
+
+import math
+import time
+from collections import deque
+
+from models import DAYS, Employee, Schedule, Shift
+from scheduler import _ranked_candidates
+
+
+def solve_optimal(schedule: Schedule, shifts: list[Shift], deadline: float, limits: dict = None) -> bool:
+    """
+    Mejora `schedule` en sitio: primero cobertura, después balance de horas.
+
+    Args:
+        schedule: Horario inicial válido (por ejemplo, el greedy), con todos
+                  los turnos y empleados registrados
+        shifts: Turnos, en el orden en que se intentan completar
+        deadline: Instante límite según time.perf_counter()
+        limits: {shift_id: puestos que se pueden llegar a cubrir} (el
+                'shift_limits' de capacity.analyze_capacity). Un turno no
+                se intenta completar más allá de su límite, porque no hay
+                camino de aumento posible. Por defecto, required_employees
+
+    Returns:
+        bool: True si terminó ambas fases, False si se agotó el tiempo
+    """
+    for shift in shifts:
+        target = shift.required_employees if limits is None else limits.get(shift.id, shift.required_employees)
+        while len(schedule.get_employees_for_shift(shift.id)) < target:
+            if time.perf_counter() >= deadline:
+                return False
+            if not _augment(schedule, shift):
+                break
+
+    return _balance(schedule, shifts, deadline)
+
+
+def _can_take(schedule: Schedule, employee: Employee, shift: Shift, drop: Shift = None) -> bool:
+    """
+    Indica si `employee` puede tomar `shift`, opcionalmente soltando `drop`.
+    Asume que ya está disponible ese día (lo filtra _ranked_candidates).
+    """
+    hours = schedule.get_employee_hours(employee.id) + shift.duration_hours
+    if drop is not None:
+        hours -= drop.duration_hours
+    if hours > employee.max_hours_per_week:
+        return False
+    return not schedule.has_conflict(employee.id, shift, exclude=None if drop is None else drop.id)
+
+
+def _augment(schedule: Schedule, root: Shift) -> bool:
+    """
+    Busca y aplica un camino de aumento que cubre un puesto más de `root`.
+
+    Returns:
+        bool: True si encontró y aplicó un camino
+    """
+    # {shift_id: (employee_id, parent_shift_id)}: employee deja ese turno para tomar el padre
+    parents = {root.id: None}
+    seen_employees = set()
+    queue = deque([root])
+
+    while queue:
+        shift = queue.popleft()
+        for employee in _ranked_candidates(schedule, shift):
+            if employee.id in seen_employees:
+                continue
+            seen_employees.add(employee.id)
+
+            if _can_take(schedule, employee, shift):
+                _apply_path(schedule, parents, employee.id, shift.id)
+                return True
+
+            for drop_id in list(schedule.get_shifts_for_employee(employee.id)):
+                if drop_id in parents:
+                    continue
+                drop = schedule.get_shift(drop_id)
+                if _can_take(schedule, employee, shift, drop):
+                    parents[drop_id] = (employee.id, shift.id)
+                    queue.append(drop)
+    return False
+
+
+def _apply_path(schedule: Schedule, parents: dict, employee_id: int, shift_id: int):
+    """Aplica un camino de aumento, desde el final hasta el turno raíz."""
+    schedule.assign_employee_to_shift(employee_id, shift_id)
+    while parents[shift_id] is not None:
+        moving_employee_id, parent_shift_id = parents[shift_id]
+        schedule.remove_employee_from_shift(moving_employee_id, shift_id)
+        schedule.assign_employee_to_shift(moving_employee_id, parent_shift_id)
+        shift_id = parent_shift_id
+
+
+def _balance(schedule: Schedule, shifts: list[Shift], deadline: float) -> bool:
+    """
+    Mueve turnos de empleados cargados a otros con menos horas.
+
+    Un movimiento de d horas de A (h_A) a B (h_B) solo se hace si
+    h_B + d < h_A, lo que reduce estrictamente la suma de cuadrados de las
+    horas; por eso el proceso termina. La cobertura no cambia.
+    """
+    improved = True
+    while improved:
+        improved = False
+        for shift in shifts:
+            if time.perf_counter() >= deadline:
+                return False
+            assigned = sorted(schedule.get_employees_for_shift(shift.id),
+                              key=lambda employee_id: (-schedule.get_employee_hours(employee_id), employee_id))
+            for heavy_id in assigned:
+                heavy_hours = schedule.get_employee_hours(heavy_id)
+                for light in _ranked_candidates(schedule, shift):
+                    if schedule.get_employee_hours(light.id) + shift.duration_hours >= heavy_hours:
+                        break
+                    if _can_take(schedule, light, shift):
+                        schedule.remove_employee_from_shift(heavy_id, shift.id)
+                        schedule.assign_employee_to_shift(light.id, shift.id)
+                        improved = True
+                        break
+    return True
+
+
+# ============================================================================
+# BÚSQUEDA LOCAL (improve_schedule)
+# ============================================================================
+
+# Temperatura final del recocido, relativa a la inicial
+_FINAL_TEMPERATURE_RATIO = 0.01
+
+
+def local_search(schedule: Schedule, employees: list[Employee], shifts: list[Shift],
+                 deadline: float, rng) -> int:
+    """
+    Mejora `schedule` en sitio con simulated annealing hasta `deadline`.
+
+    El costo es deficit_weight * puestos sin cubrir + suma de cuadrados de
+    las horas por empleado (con las horas totales fijas, minimizar la suma
+    de cuadrados es minimizar la varianza). deficit_weight se elige para
+    que cubrir un puesto siempre baje el costo. Movimientos:
+
+    - fill: un empleado toma un puesto libre de un turno incompleto.
+    - reassign: un turno pasa de un empleado a otro.
+    - swap: dos empleados intercambian un turno cada uno.
+
+    Cada movimiento se evalúa por su delta en O(1) a partir del acumulado de
+    horas del Schedule, y solo se proponen movimientos que cumplen las mismas
+    reglas que swap_shifts. Los que empeoran se aceptan con probabilidad
+    exp(-delta / T), con T decreciendo geométricamente según el tiempo
+    consumido. Al terminar se restaura la mejor solución vista (guardada con
+    Schedule.fork() solo al alejarse de ella).
+
+    Args:
+        schedule: Horario válido, con todos los turnos registrados
+        employees: Empleados que pueden recibir turnos
+        shifts: Turnos que se pueden mover
+        deadline: Instante límite según time.perf_counter()
+        rng: random.Random para elegir movimientos
+
+    Returns:
+        int: Cantidad de movimientos evaluados
+    """
+    if not employees or not shifts:
+        return 0
+
+    employees_by_id = {employee.id: employee for employee in employees}
+    available_by_day = {day: [employee for employee in employees if employee.is_available(day)] for day in DAYS}
+    max_duration = max(shift.duration_hours for shift in shifts)
+    max_hours = max(employee.max_hours_per_week for employee in employees)
+    deficit_weight = max_duration * (2 * max_hours + max_duration) + 1
+
+    deficit = sum(max(0, shift.required_employees - len(schedule.get_employees_for_shift(shift.id)))
+                  for shift in shifts)
+    cost = deficit_weight * deficit + sum(schedule.get_employee_hours(employee.id) ** 2 for employee in employees)
+    best_cost, best = cost, None        # best es None mientras el horario actual sea el mejor
+    open_ids, open_ids_deficit = [], None
+
+    started = time.perf_counter()
+    initial_temperature = float(max_duration ** 2)
+    iterations = 0
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        iterations += 1
+
+        if deficit and rng.random() < 1 / 3:
+            if open_ids_deficit != deficit:
+                # Solo los fill cambian qué turnos están incompletos
+                open_ids, open_ids_deficit = list(schedule.get_open_shift_ids()), deficit
+            move = _fill_move(schedule, rng, open_ids, available_by_day) if open_ids else None
+        elif rng.random() < 0.5:
+            move = _reassign_move(schedule, rng, shifts, employees_by_id, available_by_day)
+        else:
+            move = _swap_move(schedule, rng, shifts, employees_by_id, available_by_day)
+        if move is None:
+            continue
+
+        delta, covered, changes = move
+        delta -= deficit_weight * covered
+        if delta > 0:
+            progress = (now - started) / max(deadline - started, 1e-9)
+            temperature = initial_temperature * _FINAL_TEMPERATURE_RATIO ** progress
+            if rng.random() >= math.exp(-delta / temperature):
+                continue
+            if best is None:
+                best = schedule.fork()
+
+        for employee_id, shift_id, assigned in changes:
+            if assigned:
+                schedule.assign_employee_to_shift(employee_id, shift_id)
+            else:
+                schedule.remove_employee_from_shift(employee_id, shift_id)
+        cost += delta
+        deficit -= covered
+        if cost < best_cost:
+            best_cost, best = cost, None
+
+    if best is not None:
+        changes = schedule.diff(best)
+        for employee_id, shift_id in changes['removed']:
+            schedule.remove_employee_from_shift(employee_id, shift_id)
+        for employee_id, shift_id in changes['added']:
+            schedule.assign_employee_to_shift(employee_id, shift_id)
+    return iterations
+
+
+def _fill_move(schedule: Schedule, rng, open_ids: list, available_by_day: dict):
+    """
+    Propone que un empleado disponible tome un puesto libre.
+
+    Returns:
+        (delta de horas², puestos cubiertos, [(employee_id, shift_id, asignado)]) o None
+    """
+    shift = schedule.get_shift(rng.choice(open_ids))
+    candidates = available_by_day[shift.day]
+    if not candidates:
+        return None
+    employee = rng.choice(candidates)
+    if schedule.is_assigned(employee.id, shift.id) or not _can_take(schedule, employee, shift):
+        return None
+    hours, duration = schedule.get_employee_hours(employee.id), shift.duration_hours
+    return 2 * hours * duration + duration * duration, 1, [(employee.id, shift.id, True)]
+
+
+def _reassign_move(schedule: Schedule, rng, shifts: list[Shift], employees_by_id: dict, available_by_day: dict):
+    """Propone pasar un turno de un empleado asignado a otro disponible (ver _fill_move)."""
+    shift = rng.choice(shifts)
+    assigned = schedule.get_employees_for_shift(shift.id)
+    candidates = available_by_day[shift.day]
+    if not assigned or not candidates:
+        return None
+    giver_id = rng.choice(list(assigned))
+    taker = rng.choice(candidates)
+    if giver_id not in employees_by_id or schedule.is_assigned(taker.id, shift.id):
+        return None
+    if not _can_take(schedule, taker, shift):
+        return None
+    duration = shift.duration_hours
+    delta = 2 * duration * (schedule.get_employee_hours(taker.id) - schedule.get_employee_hours(giver_id) + duration)
+    return delta, 0, [(giver_id, shift.id, False), (taker.id, shift.id, True)]
+
+
+def _swap_move(schedule: Schedule, rng, shifts: list[Shift], employees_by_id: dict, available_by_day: dict):
+    """
+    Propone que dos empleados intercambien un turno cada uno: `first` deja
+    `shift` y toma `other`; `second` deja `other` y toma `shift` (ver _fill_move).
+    """
+    shift = rng.choice(shifts)
+    assigned = schedule.get_employees_for_shift(shift.id)
+    candidates = available_by_day[shift.day]
+    if not assigned or not candidates:
+        return None
+    first = employees_by_id.get(rng.choice(list(assigned)))
+    second = rng.choice(candidates)
+    if first is None or schedule.is_assigned(second.id, shift.id):
+        return None
+    second_shifts = schedule.get_shifts_for_employee(second.id)
+    if not second_shifts:
+        return None
+    other = schedule.get_shift(rng.choice(list(second_shifts)))
+    if other is None or schedule.is_assigned(first.id, other.id) or not first.is_available(other.day):
+        return None
+    if not _can_take(schedule, first, other, drop=shift) or not _can_take(schedule, second, shift, drop=other):
+        return None
+    moved = other.duration_hours - shift.duration_hours    # Horas que gana first (y pierde second)
+    delta = 2 * moved * (schedule.get_employee_hours(first.id) - schedule.get_employee_hours(second.id) + moved)
+    return delta, 0, [(first.id, shift.id, False), (second.id, other.id, False),
+                      (first.id, other.id, True), (second.id, shift.id, True)]
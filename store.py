@@ -0,0 +1,269 @@
+"""
+Persistencia de horarios en SQLite.
+
+Cada horario se guarda por semana (el mismo índice de semana que usa
+assign_shifts_horizon). Tablas:
+
+    employees   (id, name, max_hours_per_week, unavailable_mask)
+    shifts      (week, id, day, start_hour, duration_hours, required_employees)
+    assignments (week, shift_id, employee_id)
+
+assignments tiene clave primaria (week, shift_id, employee_id) y un índice
+(employee_id, week, shift_id), así que las consultas por turno, por
+empleado y por semana usan índices y no cargan el horario completo.
+
+save_employees escribe con executemany en transacciones de _BATCH_SIZE
+filas. save_shifts reemplaza los turnos de una semana (y borra los que
+ya no están) en una sola transacción. save() escribe solo
+las asignaciones que cambiaron respecto de lo guardado, en una sola
+transacción. Las exportaciones (iter_assignments) recorren un cursor de a
+bloques, sin armar listas con todo el resultado.
+"""
+
+import itertools
+import sqlite3
+
+from models import ALL_DAYS_MASK, DAYS, Employee, Schedule, Shift
+
+# Filas por transacción en las cargas masivas
+_BATCH_SIZE = 10_000
+# Filas por fetchmany() al recorrer resultados
+_FETCH_SIZE = 1_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    max_hours_per_week INTEGER NOT NULL,
+    unavailable_mask INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shifts (
+    week INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    start_hour INTEGER NOT NULL,
+    duration_hours INTEGER NOT NULL,
+    required_employees INTEGER NOT NULL,
+    PRIMARY KEY (week, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS assignments (
+    week INTEGER NOT NULL,
+    shift_id INTEGER NOT NULL,
+    employee_id INTEGER NOT NULL,
+    PRIMARY KEY (week, shift_id, employee_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS assignments_by_employee ON assignments (employee_id, week, shift_id);
+"""
+
+
+class ScheduleStore:
+    """
+    Horarios semanales persistidos en un archivo SQLite.
+
+    Ejemplo:
+        with ScheduleStore('horarios.db') as store:
+            store.save_employees(employees)
+            store.save(week, result['schedule'], shifts)
+            ...
+            schedule = store.load(week)
+            swap_shifts(schedule, ...)
+            store.save(week, schedule)      # escribe solo lo que cambió
+
+    Para cada semana, el store recuerda en memoria el conjunto de pares
+    (employee_id, shift_id) que guardó o cargó por última vez, así que
+    save() compara contra ese conjunto sin leer la base. El Schedule no se
+    modifica ni se copia. Solo cuando la semana no se guardó ni cargó con
+    esta instancia, los cambios se calculan contra las asignaciones leídas
+    de la base. Se asume un único escritor por archivo.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Archivo de la base (se crea si no existe), o ':memory:'
+        """
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(_SCHEMA)
+        # {week: frozenset((employee_id, shift_id)) guardado o cargado por última vez}
+        self._snapshots = {}
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save_employees(self, employees) -> int:
+        """
+        Inserta o reemplaza empleados, en transacciones de _BATCH_SIZE.
+
+        Args:
+            employees: Iterable de Employee (o tables.EmployeeTable)
+
+        Returns:
+            int: Empleados escritos
+        """
+        rows = ((employee.id, employee.name, employee.max_hours_per_week, ALL_DAYS_MASK & ~employee.availability_mask())
+                for employee in employees)
+        return self._write_batches('INSERT OR REPLACE INTO employees VALUES (?, ?, ?, ?)', rows)
+
+    def save_shifts(self, week: int, shifts) -> int:
+        """
+        Guarda los turnos de una semana, que reemplazan a los guardados: los
+        turnos que ya no están se borran junto con sus asignaciones. Todo en
+        una sola transacción.
+
+        Args:
+            week: Índice de semana
+            shifts: Iterable de Shift (o tables.ShiftTable) de la semana
+
+        Returns:
+            int: Turnos escritos
+        """
+        rows = [(week, shift.id, shift.day_index, shift.start_hour, shift.duration_hours, shift.required_employees)
+                for shift in shifts]
+        kept = {shift_id for _, shift_id, *_ in rows}
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO shifts VALUES (?, ?, ?, ?, ?, ?)', rows)
+            dropped = [(week, shift_id)
+                       for shift_id, in self._iter_rows('SELECT id FROM shifts WHERE week = ?', (week,))
+                       if shift_id not in kept]
+            self._connection.executemany('DELETE FROM shifts WHERE week = ? AND id = ?', dropped)
+            self._connection.executemany('DELETE FROM assignments WHERE week = ? AND shift_id = ?', dropped)
+        if dropped and week in self._snapshots:
+            dropped_ids = {shift_id for _, shift_id in dropped}
+            self._snapshots[week] = frozenset(pair for pair in self._snapshots[week] if pair[1] not in dropped_ids)
+        return len(rows)
+
+    def save(self, week: int, schedule: Schedule, shifts=None) -> dict:
+        """
+        Guarda las asignaciones de una semana, escribiendo solo las que
+        cambiaron respecto de lo guardado, en una sola transacción.
+
+        Args:
+            week: Índice de semana
+            schedule: Horario de esa semana
+            shifts: Turnos de la semana para guardar también (opcional; ver save_shifts)
+
+        Returns:
+            dict: {'added': int, 'removed': int} asignaciones escritas y borradas
+        """
+        if shifts is not None:
+            self.save_shifts(week, shifts)
+
+        stored = self._snapshots.get(week)
+        if stored is None:
+            stored = frozenset(self._iter_rows('SELECT employee_id, shift_id FROM assignments WHERE week = ?',
+                                               (week,)))
+        current = _assignment_pairs(schedule)
+        added, removed = sorted(current - stored), sorted(stored - current)
+
+        with self._connection:
+            self._connection.executemany('DELETE FROM assignments WHERE week = ? AND shift_id = ? AND employee_id = ?',
+                                         ((week, shift_id, employee_id) for employee_id, shift_id in removed))
+            self._connection.executemany('INSERT OR IGNORE INTO assignments VALUES (?, ?, ?)',
+                                         ((week, shift_id, employee_id) for employee_id, shift_id in added))
+        self._snapshots[week] = current
+        return {'added': len(added), 'removed': len(removed)}
+
+    def load(self, week: int, employees=None) -> Schedule:
+        """
+        Reconstruye el Schedule de una semana.
+
+        Args:
+            week: Índice de semana
+            employees: Plantilla a registrar (por defecto, la guardada con save_employees)
+
+        Returns:
+            Schedule: Con los turnos y asignaciones guardados de la semana.
+            Las asignaciones de cada turno quedan en orden de employee_id
+        """
+        if employees is None:
+            employees = [Employee(id, name, max_hours, [day for day in range(len(DAYS)) if mask >> day & 1])
+                         for id, name, max_hours, mask in self._iter_rows(
+                             'SELECT id, name, max_hours_per_week, unavailable_mask FROM employees ORDER BY id')]
+        schedule = Schedule(self.get_shifts(week), employees)
+        for shift_id, employee_id in self._iter_rows(
+                'SELECT shift_id, employee_id FROM assignments WHERE week = ? ORDER BY shift_id, employee_id',
+                (week,)):
+            schedule.assign_employee_to_shift(employee_id, shift_id)
+        self._snapshots[week] = _assignment_pairs(schedule)
+        return schedule
+
+    def get_shifts(self, week: int) -> list[Shift]:
+        """Turnos guardados de una semana, por id."""
+        return [Shift(id, day, start_hour, duration, required) for id, day, start_hour, duration, required in
+                self._iter_rows('SELECT id, day, start_hour, duration_hours, required_employees FROM shifts '
+                                'WHERE week = ? ORDER BY id', (week,))]
+
+    def get_shifts_for_employee(self, employee_id: int, week: int) -> list[int]:
+        """IDs de los turnos de un empleado en una semana, por índice y sin cargar el horario."""
+        return [shift_id for shift_id, in self._iter_rows(
+            'SELECT shift_id FROM assignments WHERE employee_id = ? AND week = ? ORDER BY shift_id',
+            (employee_id, week))]
+
+    def get_employees_for_shift(self, shift_id: int, week: int) -> list[int]:
+        """IDs de los empleados de un turno en una semana, por índice y sin cargar el horario."""
+        return [employee_id for employee_id, in self._iter_rows(
+            'SELECT employee_id FROM assignments WHERE week = ? AND shift_id = ? ORDER BY employee_id',
+            (week, shift_id))]
+
+    def weeks(self) -> list[int]:
+        """Semanas con turnos o asignaciones guardados, en orden."""
+        return [week for week, in self._iter_rows(
+            'SELECT week FROM shifts UNION SELECT week FROM assignments ORDER BY week')]
+
+    def iter_assignments(self, first_week: int = None, last_week: int = None, employee_id: int = None):
+        """
+        Recorre asignaciones guardadas como (week, shift_id, employee_id),
+        ordenadas, de a _FETCH_SIZE filas por vez.
+
+        Args:
+            first_week, last_week: Rango de semanas, inclusivo (opcional)
+            employee_id: Solo el historial de este empleado (usa su índice)
+        """
+        conditions, parameters = [], []
+        if first_week is not None:
+            conditions.append('week >= ?')
+            parameters.append(first_week)
+        if last_week is not None:
+            conditions.append('week <= ?')
+            parameters.append(last_week)
+        if employee_id is not None:
+            conditions.append('employee_id = ?')
+            parameters.append(employee_id)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        yield from self._iter_rows(
+            f'SELECT week, shift_id, employee_id FROM assignments{where} ORDER BY week, shift_id, employee_id',
+            parameters)
+
+    def _iter_rows(self, sql: str, parameters=()):
+        """Helper: Ejecuta una consulta en un cursor propio y genera sus filas de a bloques."""
+        cursor = self._connection.execute(sql, parameters)
+        try:
+            while rows := cursor.fetchmany(_FETCH_SIZE):
+                yield from rows
+        finally:
+            cursor.close()
+
+    def _write_batches(self, sql: str, rows) -> int:
+        """Helper: executemany de a _BATCH_SIZE filas, una transacción por bloque."""
+        written = 0
+        rows = iter(rows)
+        while batch := list(itertools.islice(rows, _BATCH_SIZE)):
+            with self._connection:
+                self._connection.executemany(sql, batch)
+            written += len(batch)
+        return written
+
+
+def _assignment_pairs(schedule: Schedule) -> frozenset:
+    """Helper: Asignaciones de un horario como pares (employee_id, shift_id)."""
+    return frozenset((employee_id, shift_id)
+                     for shift_id, employee_ids in schedule.get_all_assignments().items()
+                     for employee_id in employee_ids)
@@ -0,0 +1,289 @@
+"""
+Contenedores columnares de empleados y turnos.
+
+Para plantillas grandes, crear decenas de miles de objetos Employee/Shift
+hace que el overhead por objeto domine memoria y tiempo. EmployeeTable y
+ShiftTable guardan cada atributo en una columna contigua (array.array de
+la biblioteca estándar) y ofrecen operaciones en bloque: end_hour, máscara
+de solapamiento por pares y filtrado de elegibilidad.
+
+NumPy es opcional: si está instalado, las operaciones en bloque se
+vectorizan sobre las mismas columnas sin copiarlas (np.frombuffer); si no,
+se usa una implementación en Python puro con el mismo resultado.
+
+Donde se necesita acceso tipo objeto (por ejemplo assign_shifts), las
+tablas se recorren como EmployeeView/ShiftView: vistas livianas que leen
+de las columnas y se comportan como Employee/Shift.
+"""
+
+from array import array
+
+from models import ALL_DAYS_MASK, DAY_BITS, DAYS, HOURS_PER_DAY, Employee, Shift, _day_index, days_to_mask
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+def _column(values):
+    """Convierte una columna de array.array a ndarray (sin copia) si hay NumPy."""
+    return np.frombuffer(values, dtype=values.typecode) if np is not None and len(values) else values
+
+
+class EmployeeTable:
+    """
+    Empleados en formato columnar.
+
+    Columnas:
+        ids (array 'q'): IDs de empleado
+        max_hours (array 'l'): max_hours_per_week
+        availability (array 'B'): Máscara de 7 bits con los días disponibles
+        names (list): Nombres (no participan en operaciones en bloque)
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.max_hours = array('l')
+        self.availability = array('B')
+        self.names = []
+        self._views = None
+
+    @classmethod
+    def from_employees(cls, employees) -> 'EmployeeTable':
+        """Construye la tabla a partir de objetos Employee."""
+        table = cls()
+        for employee in employees:
+            table.append(employee.id, employee.name, employee.max_hours_per_week, employee.unavailable_days)
+        return table
+
+    def append(self, id: int, name: str, max_hours_per_week: int, unavailable_days: set):
+        """Agrega un empleado, con las mismas validaciones que Employee."""
+        if max_hours_per_week < 0:
+            raise ValueError(f"max_hours_per_week no puede ser negativo: {max_hours_per_week}")
+        availability = ALL_DAYS_MASK & ~days_to_mask(unavailable_days)
+
+        self.ids.append(id)
+        self.names.append(name)
+        self.max_hours.append(max_hours_per_week)
+        self.availability.append(availability)
+        self._views = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> 'EmployeeView':
+        return EmployeeView(self, row)
+
+    def __iter__(self):
+        return iter(self.views())
+
+    def views(self) -> list:
+        """Retorna (y cachea) una EmployeeView por fila."""
+        if self._views is None:
+            self._views = [EmployeeView(self, row) for row in range(len(self))]
+        return self._views
+
+    def eligible_rows(self, day: str, duration_hours: int, used_hours=None) -> list:
+        """
+        Filtra en bloque las filas de empleados disponibles el día `day` y
+        con horas libres para un turno de `duration_hours`.
+
+        Args:
+            day: Día del turno
+            duration_hours: Duración del turno
+            used_hours: Horas ya asignadas por fila (secuencia alineada con la
+                        tabla); None equivale a cero para todos
+
+        Returns:
+            list: Índices de fila elegibles, en orden
+        """
+        day_bit = 1 << _day_index(day)
+        if np is not None and len(self):
+            availability = _column(self.availability)
+            free_hours = _column(self.max_hours) - (0 if used_hours is None else np.asarray(used_hours))
+            mask = ((availability & day_bit) != 0) & (free_hours >= duration_hours)
+            return np.flatnonzero(mask).tolist()
+
+        used_hours = used_hours if used_hours is not None else [0] * len(self)
+        return [row for row in range(len(self))
+                if self.availability[row] & day_bit
+                and self.max_hours[row] - used_hours[row] >= duration_hours]
+
+
+class ShiftTable:
+    """
+    Turnos en formato columnar.
+
+    Columnas:
+        ids (array 'q'): IDs de turno
+        days (array 'B'): Día codificado como índice en DAYS
+        start_hours (array 'B'): Hora de inicio (0-23)
+        durations (array 'H'): Duración en horas
+        required (array 'H'): required_employees
+    """
+
+    def __init__(self):
+        self.ids = array('q')
+        self.days = array('B')
+        self.start_hours = array('B')
+        self.durations = array('H')
+        self.required = array('H')
+        self._views = None
+
+    @classmethod
+    def from_shifts(cls, shifts) -> 'ShiftTable':
+        """Construye la tabla a partir de objetos Shift."""
+        table = cls()
+        for shift in shifts:
+            table.append(shift.id, shift.day, shift.start_hour, shift.duration_hours, shift.required_employees)
+        return table
+
+    def append(self, id: int, day, start_hour: int, duration_hours: int, required_employees: int):
+        """Agrega un turno, con las mismas validaciones que Shift."""
+        day_index = _day_index(day)
+        if not 0 <= start_hour <= 23:
+            raise ValueError(f"start_hour debe estar entre 0 y 23: {start_hour}")
+        if duration_hours <= 0:
+            raise ValueError(f"duration_hours debe ser positivo: {duration_hours}")
+        if required_employees < 0:
+            raise ValueError(f"required_employees no puede ser negativo: {required_employees}")
+
+        self.ids.append(id)
+        self.days.append(day_index)
+        self.start_hours.append(start_hour)
+        self.durations.append(duration_hours)
+        self.required.append(required_employees)
+        self._views = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> 'ShiftView':
+        return ShiftView(self, row)
+
+    def __iter__(self):
+        return iter(self.views())
+
+    def views(self) -> list:
+        """Retorna (y cachea) una ShiftView por fila."""
+        if self._views is None:
+            self._views = [ShiftView(self, row) for row in range(len(self))]
+        return self._views
+
+    def end_hours(self):
+        """Vectorizado de Shift.end_hour() para todas las filas."""
+        if np is not None and len(self):
+            return _column(self.start_hours).astype(np.int32) + _column(self.durations)
+        return array('l', (start + duration for start, duration in zip(self.start_hours, self.durations)))
+
+    def week_starts(self):
+        """Vectorizado de Shift.week_start() para todas las filas."""
+        if np is not None and len(self):
+            return _column(self.days).astype(np.int32) * HOURS_PER_DAY + _column(self.start_hours)
+        return array('l', (day * HOURS_PER_DAY + start for day, start in zip(self.days, self.start_hours)))
+
+    def week_ends(self):
+        """Vectorizado de Shift.week_end() para todas las filas."""
+        if np is not None and len(self):
+            return self.week_starts() + _column(self.durations)
+        return array('l', (start + duration for start, duration in zip(self.week_starts(), self.durations)))
+
+    def overlap_mask(self):
+        """
+        Matriz booleana S x S con mask[i][j] = filas i y j se solapan
+        (misma semántica que Shift.overlaps_with; la diagonal es True).
+
+        Ocupa O(S²): pensada para bloques de turnos (un día, una sede), no
+        para la plantilla completa.
+        """
+        starts, ends = self.week_starts(), self.week_ends()
+        if np is not None and len(self):
+            return (starts[:, None] < ends[None, :]) & (starts[None, :] < ends[:, None])
+        return [[starts[i] < ends[j] and starts[j] < ends[i] for j in range(len(self))]
+                for i in range(len(self))]
+
+
+class EmployeeView:
+    """
+    Vista tipo Employee sobre una fila de EmployeeTable.
+
+    Solo guarda la tabla y el índice de fila; los atributos se leen de las
+    columnas. Sirve donde el código espera objetos Employee.
+    """
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: EmployeeTable, row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._table.ids[self._row]
+
+    @property
+    def name(self) -> str:
+        return self._table.names[self._row]
+
+    @property
+    def max_hours_per_week(self) -> int:
+        return self._table.max_hours[self._row]
+
+    @property
+    def unavailable_days(self) -> set:
+        mask = self._table.availability[self._row]
+        return {day for index, day in enumerate(DAYS) if not mask >> index & 1}
+
+    def availability_mask(self) -> int:
+        return self._table.availability[self._row]
+
+    def is_available(self, day) -> bool:
+        return bool(self._table.availability[self._row] & DAY_BITS[day])
+
+    __repr__ = Employee.__repr__
+
+
+class ShiftView:
+    """
+    Vista tipo Shift sobre una fila de ShiftTable.
+
+    Solo guarda la tabla y el índice de fila; los atributos se leen de las
+    columnas y los métodos se reutilizan de Shift.
+    """
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: ShiftTable, row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._table.ids[self._row]
+
+    @property
+    def day(self) -> str:
+        return DAYS[self._table.days[self._row]]
+
+    @property
+    def day_index(self) -> int:
+        return self._table.days[self._row]
+
+    @property
+    def start_hour(self) -> int:
+        return self._table.start_hours[self._row]
+
+    @property
+    def duration_hours(self) -> int:
+        return self._table.durations[self._row]
+
+    @property
+    def required_employees(self) -> int:
+        return self._table.required[self._row]
+
+    end_hour = Shift.end_hour
+    week_start = Shift.week_start
+    week_end = Shift.week_end
+    overlaps_with = Shift.overlaps_with
+    __repr__ = Shift.__repr__
@@ -0,0 +1,77 @@
+"""
+Tests para el análisis de capacidad previo a la asignación.
+"""
+
+import unittest
+from capacity import analyze_capacity
+from models import Employee, Shift
+from scheduler import MODE_OPTIMAL, assign_shifts
+
+
+class TestAnalyzeCapacity(unittest.TestCase):
+    """Tests para las cotas de capacidad y los faltantes garantizados."""
+
+    def setUp(self):
+        self.employees = [
+            Employee(1, "Ana", max_hours_per_week=16, unavailable_days={'monday'}),
+            Employee(2, "Bob", max_hours_per_week=8, unavailable_days=set()),
+            Employee(3, "Cai", max_hours_per_week=4, unavailable_days=set()),
+        ]
+        self.shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=2),
+            Shift(2, 'monday', start_hour=12, duration_hours=4, required_employees=1),
+            Shift(3, 'tuesday', start_hour=8, duration_hours=10, required_employees=1),
+            Shift(4, 'sunday', start_hour=2, duration_hours=20, required_employees=1),
+        ]
+
+    def test_guaranteed_shortfalls(self):
+        """Reporta turnos imposibles, franjas sin gente y una cota que el solver respeta."""
+        analysis = analyze_capacity(self.employees, self.shifts)
+
+        # Lunes solo Bob tiene 8h; nadie tiene 20h para el domingo
+        self.assertEqual(analysis['shift_limits'], {1: 1, 2: 1, 3: 1, 4: 0})
+        self.assertEqual(analysis['infeasible_shift_ids'], [4])
+        # Lunes 12-16 se solapan los turnos 1 y 2: 3 personas y solo Bob y Cai trabajan ese día
+        self.assertEqual(analysis['shortages'], [{'start': 12, 'end': 16, 'required_staff': 3,
+                                                  'available_staff': 2}])
+        self.assertEqual(analysis['unfilled_lower_bound'], 2)
+        self.assertEqual(analysis['required_hours'], 50)
+        self.assertEqual(analysis['days']['monday'], {'required_hours': 20, 'available_hours': 12})
+        self.assertTrue(any('Shift 4' in warning and 'no se puede cubrir' in warning
+                            for warning in analysis['warnings']))
+        self.assertTrue(any(warning.startswith('monday 12:00-monday 16:00') for warning in analysis['warnings']))
+
+        # Las ventanas son sumas prefijas de la misma demanda por hora
+        self.assertEqual(sum(window['required_hours'] for window in analysis['windows']),
+                         analysis['required_hours'])
+        self.assertEqual(len(analyze_capacity(self.employees, self.shifts, window_hours=24)['windows']), 7)
+        with self.assertRaises(ValueError):
+            analyze_capacity(self.employees, self.shifts, window_hours=0)
+
+        for mode in ('greedy', MODE_OPTIMAL):
+            schedule = assign_shifts(self.employees, self.shifts, mode=mode)['schedule']
+            unfilled = sum(shift.required_employees - len(schedule.get_employees_for_shift(shift.id))
+                           for shift in self.shifts)
+            self.assertGreaterEqual(unfilled, analysis['unfilled_lower_bound'])
+
+    def test_optimal_mode_stops_at_limits(self):
+        """Con turnos imposibles, el modo optimal cubre todo lo alcanzable y la brecha es 0."""
+        result = assign_shifts(self.employees, self.shifts, mode=MODE_OPTIMAL)
+        schedule = result['schedule']
+
+        self.assertEqual(result['optimality_gap'], 0.0)
+        self.assertEqual(list(schedule.get_employees_for_shift(4)), [])
+        self.assertEqual(list(schedule.get_employees_for_shift(3)), [1])
+
+    def test_cross_midnight_overflow(self):
+        """Un turno del domingo que cruza medianoche extiende la línea de tiempo."""
+        shifts = [Shift(1, 'sunday', start_hour=22, duration_hours=4, required_employees=2)]
+        analysis = analyze_capacity(self.employees, shifts)
+
+        self.assertEqual(analysis['windows'][-1]['end'], 24 * 7 + 2)
+        self.assertEqual(analysis['shortages'], [])
+        self.assertEqual(analysis['unfilled_lower_bound'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
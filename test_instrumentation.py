@@ -0,0 +1,72 @@
+"""
+Tests para la instrumentación de assign_shifts y swap_shifts.
+"""
+
+import unittest
+from instrumentation import EVENT_ASSIGNMENT, EVENT_PHASE, EVENT_REJECTION, Instrumentation
+from models import Employee, Shift
+from scheduler import assign_shifts, swap_shifts
+from workloads import generate_workload
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Tests para timers, contadores y hooks."""
+
+    def test_assign_shifts_stats(self):
+        """Mide las fases sin cambiar el resultado, y los contadores cuadran."""
+        employees, shifts = generate_workload(60, seed=3)
+        plain = assign_shifts(employees, shifts)
+        events = {EVENT_PHASE: [], EVENT_REJECTION: [], EVENT_ASSIGNMENT: []}
+        instrumentation = Instrumentation({event: [lambda event=event, **data: events[event].append(data)]
+                                           for event in events})
+
+        result = assign_shifts(employees, shifts, instrumentation=instrumentation)
+
+        self.assertNotIn('stats', plain)
+        self.assertEqual(result['schedule'].get_all_assignments(), plain['schedule'].get_all_assignments())
+        self.assertEqual(result['warnings'], plain['warnings'])
+        timings, counters = result['stats']['timings'], result['stats']['counters']
+        for name in ('setup', 'sort', 'availability', 'selection', 'warnings', 'hours_check', 'overlap_check'):
+            self.assertIn(name, timings)
+        self.assertEqual([event['name'] for event in events[EVENT_PHASE]],
+                         ['setup', 'sort', 'availability', 'selection', 'warnings'])
+
+        assignments = sum(len(ids) for ids in plain['schedule'].get_all_assignments().values())
+        self.assertEqual(counters['assignments'], assignments)
+        self.assertEqual(len(events[EVENT_ASSIGNMENT]), assignments)
+        self.assertEqual(counters['candidates_examined'],
+                         assignments + counters.get('rejected_hours', 0) + counters.get('rejected_overlap', 0))
+        self.assertEqual(len(events[EVENT_REJECTION]),
+                         counters.get('rejected_hours', 0) + counters.get('rejected_overlap', 0))
+        self.assertGreater(counters['rejected_unavailable'], 0)
+
+    def test_swap_shifts_stats(self):
+        """Cuenta el rechazo por regla y acumula entre llamadas."""
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=40, unavailable_days={'monday'}),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set()),
+            Employee(3, "Cai", max_hours_per_week=40, unavailable_days=set()),
+        ]
+        shifts = [Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1)]
+        schedule = assign_shifts(employees, shifts)['schedule']
+        holder = next(iter(schedule.get_employees_for_shift(1)))
+        rejections = []
+        instrumentation = Instrumentation()
+        instrumentation.add_hook(EVENT_REJECTION, lambda **event: rejections.append(event))
+
+        failed = swap_shifts(schedule, 1, holder, 1, employees, shifts, instrumentation=instrumentation)
+        done = swap_shifts(schedule, 5 - holder, holder, 1, employees, shifts, instrumentation=instrumentation)
+
+        self.assertFalse(failed['success'])
+        self.assertTrue(done['success'])
+        self.assertEqual(rejections, [{'employee_id': 1, 'shift_id': 1, 'reason': 'unavailable'}])
+        counters = done['stats']['counters']
+        self.assertEqual(counters, {'candidates_examined': 2, 'rejected_unavailable': 1,
+                                    'swaps_failed': 1, 'swaps_applied': 1})
+        self.assertIn('apply', done['stats']['timings'])
+        with self.assertRaises(ValueError):
+            instrumentation.add_hook('unknown', print)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
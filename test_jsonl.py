@@ -0,0 +1,74 @@
+"""
+Tests para la lectura y escritura en JSONL.
+"""
+
+import io
+import json
+import unittest
+from jsonl import read_employees, read_shifts, write_employees, write_schedule, write_shifts
+from models import Employee, Shift
+from scheduler import assign_shifts
+
+
+def shift_fields(shift) -> tuple:
+    return shift.id, shift.day, shift.start_hour, shift.duration_hours, shift.required_employees
+
+
+class TestJsonl(unittest.TestCase):
+    """Tests para los lectores y escritores en streaming."""
+
+    def setUp(self):
+        self.employees = [
+            Employee(1, "Ana", max_hours_per_week=8, unavailable_days={'sunday', 'monday'}),
+            Employee(2, 'Bob "B"', max_hours_per_week=40, unavailable_days=set()),
+        ]
+        self.shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'tuesday', start_hour=22, duration_hours=6, required_employees=3),
+        ]
+
+    def test_round_trip(self):
+        """Lo que escriben write_employees/write_shifts se lee igual."""
+        employees_out, shifts_out = io.StringIO(), io.StringIO()
+        self.assertEqual(write_employees(self.employees, employees_out), 2)
+        self.assertEqual(write_shifts(self.shifts, shifts_out), 2)
+
+        employees = list(read_employees(io.StringIO(employees_out.getvalue() + "\n")))
+        shifts = list(read_shifts(io.StringIO(shifts_out.getvalue())))
+        self.assertEqual([(e.id, e.name, e.max_hours_per_week, e.unavailable_days) for e in employees],
+                         [(e.id, e.name, e.max_hours_per_week, e.unavailable_days) for e in self.employees])
+        self.assertEqual([shift_fields(s) for s in shifts], [shift_fields(s) for s in self.shifts])
+
+    def test_errors_report_line_number(self):
+        """Los errores de formato o de esquema indican la línea."""
+        valid = '{"id": 1, "day": "monday", "start_hour": 8, "duration_hours": 8, "required_employees": 1}'
+        cases = {
+            '{"id": 2, "day": "monday"': "Línea 3: JSON no válido",
+            valid.replace('"id": 1', '"id": true'): "Línea 3: id debe ser int",
+            valid.replace('"id": 1, ', ''): "Línea 3: faltan campos ['id']",
+            valid.replace('"id": 1', '"id": 1, "site": 4'): "Línea 3: campos desconocidos ['site']",
+            valid.replace('monday', 'funday'): "Línea 3: Día no válido",
+        }
+        for bad_line, message in cases.items():
+            lines = io.StringIO(f"{valid}\n\n{bad_line}\n{valid}\n")
+            shifts = read_shifts(lines)
+            self.assertEqual(next(shifts).id, 1)
+            with self.assertRaisesRegex(ValueError, message.replace('[', r'\[').replace(']', r'\]')):
+                next(shifts)
+
+    def test_write_schedule(self):
+        """Exporta asignaciones y warnings, una línea por registro."""
+        result = assign_shifts(self.employees, self.shifts)
+        out = io.StringIO()
+
+        self.assertEqual(write_schedule(result['schedule'], out, result['warnings']), 3)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(records[:2], [
+            {'type': 'assignment', 'shift_id': 1, 'employee_ids': [2]},
+            {'type': 'assignment', 'shift_id': 2, 'employee_ids': [1, 2]},
+        ])
+        self.assertEqual(records[2], {'type': 'warning', 'message': result['warnings'][0]})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
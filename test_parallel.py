@@ -0,0 +1,44 @@
+"""
+Tests para la asignación en paralelo.
+"""
+
+import unittest
+from models import DAYS, Employee, Shift
+from parallel import _components, assign_shifts_parallel
+from scheduler import assign_shifts
+
+
+class TestAssignShiftsParallel(unittest.TestCase):
+    """Tests para assign_shifts_parallel."""
+
+    def setUp(self):
+        weekdays, weekend = set(DAYS[:5]), set(DAYS[5:])
+        # Dos "departamentos": unos solo trabajan entre semana y otros solo el fin de semana
+        self.employees = [Employee(i, f"E{i}", max_hours_per_week=16 + 4 * (i % 3),
+                                   unavailable_days=weekend if i % 2 else weekdays) for i in range(1, 11)]
+        self.shifts = [Shift(i, DAYS[i % 7], start_hour=(i * 7) % 20, duration_hours=4 + i % 4,
+                             required_employees=1 + i % 2) for i in range(1, 41)]
+
+    def test_splits_independent_departments(self):
+        """Los empleados que no comparten turnos quedan en componentes distintos."""
+        components = _components(self.employees, self.shifts)
+        self.assertEqual(len(components), 2)
+        for employees, shifts in components:
+            self.assertTrue(all(e.is_available(s.day) for e in employees for s in shifts))
+
+    def test_same_result_as_serial_for_any_worker_count(self):
+        """El horario de cada problema coincide con assign_shifts, con 1 o 2 procesos."""
+        problems = [(self.employees, self.shifts), (self.employees[:3], self.shifts[:10]), ([], self.shifts[:2])]
+        expected = [assign_shifts(employees, shifts) for employees, shifts in problems]
+
+        for workers in (1, 2):
+            results = dict(assign_shifts_parallel(problems, max_workers=workers))
+            self.assertEqual(sorted(results), [0, 1, 2])
+            for index, result in results.items():
+                self.assertEqual(repr(result['schedule']), repr(expected[index]['schedule']))
+                self.assertEqual(result['warnings'], expected[index]['warnings'])
+                self.assertEqual(result['employee_hours'], expected[index]['employee_hours'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
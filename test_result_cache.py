@@ -0,0 +1,83 @@
+"""
+Tests para el cache de resultados de assign_shifts.
+"""
+
+import random
+import tempfile
+import unittest
+from models import Employee, Shift
+from result_cache import ResultCache
+from scheduler import MODE_OPTIMAL, assign_shifts
+from workloads import generate_workload
+
+
+def snapshot(result) -> tuple:
+    schedule = result['schedule']
+    return ([(shift_id, list(employee_ids)) for shift_id, employee_ids in schedule.get_all_assignments().items()],
+            list(schedule.get_open_shift_ids()), result['warnings'], list(result['employee_hours'].items()))
+
+
+class TestResultCache(unittest.TestCase):
+    """Tests para los niveles en memoria y en disco."""
+
+    def test_hit_is_identical_and_independent(self):
+        """Un acierto da un Schedule nuevo igual al cálculo fresco, aunque cambie el orden de las listas."""
+        employees, shifts = generate_workload(80, seed=5)
+        cache = ResultCache(max_size=2)
+        first = assign_shifts(employees, shifts, result_cache=cache)
+
+        shuffled_employees, shuffled_shifts = list(employees), list(shifts)
+        random.Random(1).shuffle(shuffled_employees)
+        random.Random(2).shuffle(shuffled_shifts)
+        hit = assign_shifts(shuffled_employees, shuffled_shifts, result_cache=cache)
+        self.assertEqual(snapshot(hit), snapshot(assign_shifts(shuffled_employees, shuffled_shifts)))
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        again = assign_shifts(employees, shifts, result_cache=cache)
+        self.assertEqual(snapshot(again), snapshot(first))
+        shift_id, employee_ids = next(iter(again['schedule'].get_all_assignments().items()))
+        again['schedule'].remove_employee_from_shift(next(iter(employee_ids)), shift_id)
+        self.assertEqual(snapshot(assign_shifts(employees, shifts, result_cache=cache)), snapshot(first))
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (3, 1, 0.75))
+        self.assertGreaterEqual(stats['saved_seconds'], 0.0)
+
+    def test_returned_warnings_are_copies(self):
+        """Modificar los warnings de un resultado no altera lo que dan los aciertos siguientes."""
+        employees = [Employee(1, "Ana", max_hours_per_week=16, unavailable_days=set())]
+        shifts = [Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=2)]
+        cache = ResultCache()
+        first = assign_shifts(employees, shifts, result_cache=cache)
+        expected = list(first['warnings'])
+        self.assertTrue(expected)
+
+        first['warnings'].append('agregado por el llamador')
+        hit = assign_shifts(employees, shifts, result_cache=cache)
+        self.assertEqual(hit['warnings'], expected)
+        hit['warnings'].clear()
+        self.assertEqual(assign_shifts(employees, shifts, result_cache=cache)['warnings'], expected)
+
+    def test_disk_tier_and_eviction(self):
+        """El disco sobrevive a la instancia; el LRU se mantiene acotado; optimal no se cachea."""
+        employees = [Employee(1, "Ana", max_hours_per_week=16, unavailable_days=set())]
+        weeks = [[Shift(1, 'monday', start_hour=hour, duration_hours=8, required_employees=1)] for hour in (6, 8, 10)]
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(max_size=2, directory=directory)
+            for shifts in weeks:
+                assign_shifts(employees, shifts, result_cache=cache)
+            self.assertEqual((len(cache), cache.stats()['evictions']), (2, 1))
+
+            reopened = ResultCache(directory=directory)
+            result = assign_shifts(employees, weeks[0], result_cache=reopened)
+            self.assertEqual(result['employee_hours'], {1: 8})
+            self.assertEqual(reopened.stats()['disk_hits'], 1)
+
+            assign_shifts(employees, weeks[0], mode=MODE_OPTIMAL, time_budget=0.05, result_cache=reopened)
+            self.assertEqual(reopened.stats()['hits'] + reopened.stats()['misses'], 1)
+        with self.assertRaises(ValueError):
+            ResultCache(max_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -3,8 +3,13 @@ Tests para el sistema de gestión de turnos.
 """
 
 import unittest
-from models import Employee, Shift, Schedule
-from scheduler import assign_shifts, swap_shifts
+from models import (
+    DAYS, AvailabilityIndex, ConflictGraph, Employee, FeasibilityCache, FrozenEmployee, FrozenShift, Shift, Schedule
+)
+from scheduler import (
+    assign_shifts, assign_shifts_horizon, improve_schedule, iter_violations, swap_shifts, swap_shifts_batch,
+    update_schedule, validate_schedule, who_can_cover, who_can_cover_batch
+)
 
 
 class TestShiftScheduler(unittest.TestCase):
@@ -306,6 +311,396 @@ class TestShiftScheduler(unittest.TestCase):
                         "El swap debe fallar porque Ana no está disponible los lunes")
         self.assertIsNotNone(result['message'])
 
+    def test_balanced_assignment_is_deterministic(self):
+        """
+        Test 8: Balance de carga con desempate por id
+
+        Escenario:
+        - Empleados con la misma carga: se elige primero el de menor id
+        - Un empleado que ya no tiene horas libres no vuelve a ser elegido
+        """
+        employees = [
+            Employee(3, "Carlos", max_hours_per_week=40, unavailable_days=set()),
+            Employee(1, "Ana", max_hours_per_week=8, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set()),
+        ]
+        shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(3, 'wednesday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(4, 'thursday', start_hour=8, duration_hours=8, required_employees=2),
+        ]
+
+        result = assign_shifts(employees, shifts)
+        schedule = result['schedule']
+
+        self.assertEqual(list(schedule.get_employees_for_shift(1)), [1])
+        self.assertEqual(list(schedule.get_employees_for_shift(2)), [2])
+        self.assertEqual(list(schedule.get_employees_for_shift(3)), [3])
+        self.assertEqual(sorted(schedule.get_employees_for_shift(4)), [2, 3],
+                         "Ana ya cumplió sus 8 horas y no debe volver a ser elegida")
+        self.assertEqual(result['employee_hours'], {3: 16, 1: 8, 2: 16})
+        rerun = assign_shifts(employees, shifts)['schedule']
+        self.assertEqual(repr(rerun), repr(schedule),
+                         "Dos ejecuciones con los mismos datos deben dar el mismo horario")
+
+    def test_optimal_mode_fills_what_greedy_misses(self):
+        """
+        Test 9: El modo óptimo cubre turnos que el greedy deja incompletos
+
+        Escenario:
+        - Ana (8h máx.) puede lunes y martes; Bob solo el lunes
+        - El greedy da el lunes a Ana y el martes queda sin nadie
+        - El modo óptimo mueve a Ana al martes y le da el lunes a Bob
+        """
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=8, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set(DAYS) - {'monday'}),
+        ]
+        shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+        ]
+
+        greedy = assign_shifts(employees, shifts)
+        self.assertEqual(len(greedy['warnings']), 1)
+
+        result = assign_shifts(employees, shifts, mode='optimal')
+        schedule = result['schedule']
+        self.assertEqual(result['warnings'], [])
+        self.assertEqual(list(schedule.get_employees_for_shift(1)), [2])
+        self.assertEqual(list(schedule.get_employees_for_shift(2)), [1])
+        self.assertEqual(result['optimality_gap'], 0.0)
+        self.assertGreaterEqual(result['solve_time'], 0.0)
+
+    def test_optimal_mode_balances_hours(self):
+        """
+        Test 10: El modo óptimo reparte horas sin perder cobertura
+        """
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=40, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set()),
+            Employee(3, "Carlos", max_hours_per_week=40, unavailable_days=set(DAYS) - {'monday'}),
+        ]
+        shifts = [
+            Shift(1, 'monday', start_hour=16, duration_hours=4, required_employees=1),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(3, 'tuesday', start_hour=16, duration_hours=4, required_employees=1),
+        ]
+
+        greedy = assign_shifts(employees, shifts)
+        self.assertEqual(greedy['employee_hours'], {1: 8, 2: 8, 3: 0})
+
+        result = assign_shifts(employees, shifts, mode='optimal')
+        self.assertEqual(result['warnings'], [])
+        self.assertEqual(result['employee_hours'], {1: 4, 2: 8, 3: 4})
+
+    def test_invalid_mode(self):
+        """Un modo desconocido debe fallar explícitamente."""
+        with self.assertRaises(ValueError):
+            assign_shifts([], [], mode='fastest')
+
+
+class TestAssignShiftsHorizon(unittest.TestCase):
+    """Tests para la planificación de varias semanas."""
+
+    def test_weekly_hours_reset_and_sunday_spillover(self):
+        """Las horas se reinician por semana y el turno nocturno del domingo bloquea el lunes."""
+        employees = [Employee(1, "Ana", max_hours_per_week=8, unavailable_days=set())]
+        weekly_shifts = [
+            (0, Shift(1, 'sunday', start_hour=22, duration_hours=6, required_employees=1)),   # hasta lunes 4:00
+            (1, Shift(1, 'monday', start_hour=2, duration_hours=4, required_employees=1)),
+            (1, Shift(2, 'monday', start_hour=8, duration_hours=4, required_employees=1)),
+            (3, Shift(1, 'monday', start_hour=2, duration_hours=4, required_employees=1)),
+        ]
+
+        weeks = assign_shifts_horizon(employees, iter(weekly_shifts))
+        first = next(weeks)
+        self.assertEqual(first['week'], 0)
+        self.assertEqual(first['employee_hours'], {1: 6})
+
+        second = next(weeks)
+        self.assertEqual(second['week'], 1)
+        self.assertEqual(list(second['schedule'].get_employees_for_shift(1)), [])
+        self.assertEqual(list(second['schedule'].get_employees_for_shift(2)), [1])
+        self.assertEqual(len(second['warnings']), 1)
+
+        # La semana 2 no tiene turnos: el bloqueo del domingo no llega a la 3
+        third = next(weeks)
+        self.assertEqual((third['week'], third['employee_hours']), (3, {1: 4}))
+        self.assertEqual(list(weeks), [])
+
+    def test_weeks_out_of_order(self):
+        """Las semanas deben venir en orden creciente."""
+        shift = Shift(1, 'monday', start_hour=8, duration_hours=4, required_employees=1)
+        weeks = assign_shifts_horizon([], [(2, shift), (1, shift)])
+        next(weeks)
+        with self.assertRaises(ValueError):
+            next(weeks)
+
+
+class TestSwapShiftsBatch(unittest.TestCase):
+    """Tests para el lote transaccional de intercambios."""
+
+    def setUp(self):
+        self.employees = [
+            Employee(1, "Ana", max_hours_per_week=8, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set()),
+            Employee(3, "Carlos", max_hours_per_week=40, unavailable_days=set()),
+        ]
+        self.shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+        ]
+        self.schedule = Schedule()
+        self.schedule.assign_employee_to_shift(2, 1)
+        self.schedule.assign_employee_to_shift(3, 2)
+
+    def test_later_swaps_see_earlier_ones(self):
+        """El segundo intercambio falla porque el primero ya consumió las horas de Ana."""
+        result = swap_shifts_batch(self.schedule, [(1, 2, 1), (1, 3, 2)], self.employees, self.shifts,
+                                   mode='best_effort')
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['applied'], 1)
+        self.assertTrue(result['results'][0]['success'])
+        self.assertIn("horas máximas", result['results'][1]['message'])
+        self.assertEqual(list(self.schedule.get_shifts_for_employee(1)), [1])
+
+    def test_all_or_nothing_rolls_back(self):
+        """Si un intercambio falla, el lote completo se revierte."""
+        result = swap_shifts_batch(self.schedule, [(1, 2, 1), (3, 1, 2), (1, 3, 2)],
+                                   self.employees, self.shifts)
+
+        self.assertFalse(result['success'])
+        self.assertIsNone(result['updated_schedule'])
+        self.assertEqual(result['applied'], 0)
+        self.assertEqual(len(result['results']), 3)
+        self.assertEqual(list(self.schedule.get_employees_for_shift(1)), [2])
+        self.assertEqual(list(self.schedule.get_employees_for_shift(2)), [3])
+        self.assertEqual(self.schedule.get_employee_hours(1), 0)
+
+
+class TestWhoCanCover(unittest.TestCase):
+    """Tests para la consulta de candidatos que pueden cubrir un turno."""
+
+    def setUp(self):
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=40, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=20, unavailable_days=set()),
+            Employee(3, "Carlos", max_hours_per_week=40, unavailable_days={'tuesday'}),
+            Employee(4, "Diana", max_hours_per_week=8, unavailable_days=set()),
+        ]
+        self.shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(3, 'tuesday', start_hour=12, duration_hours=8, required_employees=1),
+        ]
+        self.schedule = Schedule(self.shifts, employees)
+        self.schedule.assign_employee_to_shift(1, 2)
+        self.schedule.assign_employee_to_shift(4, 1)
+
+    def test_ranked_by_remaining_hours(self):
+        """Solo los elegibles, de más a menos horas restantes."""
+        candidates = who_can_cover(self.schedule, 3)
+
+        # Ana se solapa (martes 8-16), Carlos no está el martes, Diana no tiene horas
+        self.assertEqual(candidates, [{'employee_id': 2, 'remaining_hours': 20}])
+
+        candidates = who_can_cover(self.schedule, 1)
+        self.assertEqual([c['employee_id'] for c in candidates], [3, 1, 2])
+
+    def test_top_k_and_batch(self):
+        """top_k recorta el ranking y el lote responde por turno."""
+        self.assertEqual(who_can_cover(self.schedule, 1, top_k=1), [{'employee_id': 3, 'remaining_hours': 40}])
+
+        batch = who_can_cover_batch(self.schedule, [1, 3], top_k=2)
+        self.assertEqual([c['employee_id'] for c in batch[1]], [3, 1])
+        self.assertEqual([c['employee_id'] for c in batch[3]], [2])
+
+        with self.assertRaises(ValueError):
+            who_can_cover(self.schedule, 99)
+
+    def test_index_follows_changes(self):
+        """El orden por horas restantes se mantiene al día con altas, bajas, plantilla y fork."""
+        self.assertEqual([c['employee_id'] for c in who_can_cover(self.schedule, 1)], [3, 1, 2])
+
+        self.schedule.assign_employee_to_shift(3, 1)              # Carlos baja a 32h restantes
+        self.schedule.remove_employee_from_shift(4, 1)            # Diana vuelve a 8h
+        self.assertEqual(who_can_cover(self.schedule, 1), [
+            {'employee_id': 1, 'remaining_hours': 32}, {'employee_id': 2, 'remaining_hours': 20},
+            {'employee_id': 4, 'remaining_hours': 8}])
+
+        self.schedule.register_employees([Employee(2, "Bob", max_hours_per_week=50, unavailable_days=set())])
+        self.schedule.unregister_employee(4)
+        self.assertEqual([c['employee_id'] for c in who_can_cover(self.schedule, 1)], [2, 1])
+
+        child = self.schedule.fork()
+        child.assign_employee_to_shift(2, 1)
+        self.assertEqual([c['employee_id'] for c in who_can_cover(child, 1)], [1])
+        self.assertEqual([c['employee_id'] for c in who_can_cover(self.schedule, 1)], [2, 1])
+
+
+class TestUpdateSchedule(unittest.TestCase):
+    """Tests para la re-planificación incremental."""
+
+    def setUp(self):
+        self.employees = [
+            Employee(1, "Ana", max_hours_per_week=40, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set()),
+            Employee(3, "Carlos", max_hours_per_week=40, unavailable_days=set()),
+        ]
+        self.shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(3, 'wednesday', start_hour=8, duration_hours=8, required_employees=1),
+        ]
+        self.schedule = assign_shifts(self.employees, self.shifts)['schedule']
+
+    def test_sick_call_only_touches_affected_shift(self):
+        """Un empleado que falta solo cambia su turno; el resto se conserva."""
+        ana_monday = Employee(1, "Ana", max_hours_per_week=40, unavailable_days={'monday'})
+
+        result = update_schedule(self.schedule, {'changed_employees': [ana_monday]})
+
+        self.assertEqual(result['removed'], [(1, 1)])
+        self.assertEqual(len(result['added']), 1)
+        self.assertNotIn(1, self.schedule.get_employees_for_shift(1))
+        self.assertEqual(list(self.schedule.get_employees_for_shift(2)), [2])
+        self.assertEqual(list(self.schedule.get_employees_for_shift(3)), [3])
+        self.assertEqual(result['warnings'], [])
+
+    def test_new_and_removed_shifts(self):
+        """Turnos nuevos se cubren y los eliminados liberan a sus empleados."""
+        result = update_schedule(self.schedule, {
+            'removed_shifts': [3],
+            'added_shifts': [Shift(4, 'thursday', start_hour=8, duration_hours=8, required_employees=2)],
+        })
+
+        self.assertIn((3, 3), result['removed'])
+        self.assertEqual(sorted(self.schedule.get_employees_for_shift(4)), [1, 3],
+                         "Carlos quedó libre y Ana desempata por id")
+        self.assertEqual(self.schedule.get_employee_hours(3), 8)
+        self.assertEqual(result['warnings'], [])
+
+    def test_added_shift_with_existing_id(self):
+        """Un turno 'nuevo' con un id ya registrado es un error y no se aplica nada."""
+        before = {shift_id: list(ids) for shift_id, ids in self.schedule.get_all_assignments().items()}
+        duplicate = Shift(2, 'friday', start_hour=8, duration_hours=8, required_employees=1)
+
+        with self.assertRaises(ValueError):
+            update_schedule(self.schedule, {'removed_employees': [1], 'added_shifts': [duplicate]})
+        with self.assertRaises(ValueError):
+            update_schedule(self.schedule, {'added_shifts': [Shift(4, 'friday', 8, 8, 1), Shift(4, 'friday', 9, 8, 1)]})
+        self.assertEqual({shift_id: list(ids) for shift_id, ids in self.schedule.get_all_assignments().items()}, before)
+        self.assertEqual(self.schedule.get_shift(2).day, 'tuesday')
+
+        # Quitarlo y agregarlo en el mismo delta sí es válido
+        update_schedule(self.schedule, {'removed_shifts': [2], 'added_shifts': [duplicate]})
+        self.assertEqual(self.schedule.get_shift(2).day, 'friday')
+
+    def test_warnings_only_for_changed_shifts(self):
+        """Solo se reportan los turnos afectados que quedan incompletos."""
+        understaffed = Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=5)
+
+        result = update_schedule(self.schedule, {'changed_shifts': [understaffed]})
+
+        self.assertEqual(len(result['warnings']), 1)
+        self.assertTrue(result['warnings'][0].startswith("Shift 2 "))
+        self.assertEqual(result['removed'], [])
+
+
+class TestImproveSchedule(unittest.TestCase):
+    """Tests para la búsqueda local sobre un horario existente."""
+
+    def test_fills_gap_by_reassigning(self):
+        """Cubre el martes pasando el lunes de Ana a Bob, como el modo óptimo."""
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=8, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set(DAYS) - {'monday'}),
+        ]
+        shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+        ]
+        schedule = assign_shifts(employees, shifts)['schedule']
+
+        result = improve_schedule(schedule, employees, shifts, time_budget=0.1, seed=7)
+        self.assertIs(result['schedule'], schedule)
+        self.assertEqual(result['warnings'], [])
+        self.assertEqual(result['employee_hours'], {1: 8, 2: 8})
+        self.assertGreater(result['iterations'], 0)
+        self.assertGreater(result['iterations_per_second'], 0)
+
+    def test_never_breaks_rules_or_worsens(self):
+        """El resultado respeta las reglas y no empeora cobertura ni balance."""
+        employees = [Employee(i, f"E{i}", max_hours_per_week=8 + 4 * (i % 4),
+                              unavailable_days={DAYS[i % 7], DAYS[(i * 3) % 7]}) for i in range(1, 13)]
+        shifts = [Shift(i, DAYS[i % 7], start_hour=(i * 5) % 20, duration_hours=4 + i % 5,
+                        required_employees=1 + i % 3) for i in range(1, 31)]
+        initial = assign_shifts(employees, shifts)
+        schedule = initial['schedule']
+        deficit = lambda: sum(max(0, s.required_employees - len(schedule.get_employees_for_shift(s.id)))
+                              for s in shifts)
+        spread = lambda hours: sum(h * h for h in hours.values())
+        initial_deficit = deficit()
+
+        result = improve_schedule(schedule, employees, shifts, time_budget=0.2, seed=1)
+        self.assertLessEqual(deficit(), initial_deficit)
+        if deficit() == initial_deficit:
+            self.assertLessEqual(spread(result['employee_hours']), spread(initial['employee_hours']))
+
+        for employee in employees:
+            own = [shift for shift in shifts if schedule.is_assigned(employee.id, shift.id)]
+            self.assertLessEqual(sum(shift.duration_hours for shift in own), employee.max_hours_per_week)
+            self.assertTrue(all(employee.is_available(shift.day) for shift in own))
+            self.assertFalse(any(a.overlaps_with(b) for i, a in enumerate(own) for b in own[i + 1:]))
+
+
+class TestValidateSchedule(unittest.TestCase):
+    """Tests para la auditoría de horarios editados a mano."""
+
+    def test_reports_each_rule(self):
+        """Detecta día no disponible, solapamiento, exceso de horas, referencias desconocidas y faltantes."""
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=10, unavailable_days={'tuesday'}),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set()),
+        ]
+        shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'monday', start_hour=12, duration_hours=4, required_employees=1),
+            Shift(3, 'tuesday', start_hour=8, duration_hours=4, required_employees=2),
+        ]
+        schedule = Schedule(shifts)
+        for employee_id, shift_id in [(1, 3), (1, 2), (1, 1), (2, 3), (2, 99), (7, 1)]:
+            schedule.assign_employee_to_shift(employee_id, shift_id)
+
+        self.assertEqual(validate_schedule(schedule, employees, shifts), [
+            {'rule': 'overlap', 'employee_id': 1, 'shift_id': 2, 'conflicting_shift_id': 1},
+            {'rule': 'unavailable', 'employee_id': 1, 'shift_id': 3},
+            {'rule': 'hours', 'employee_id': 1, 'shift_id': 2, 'excess_hours': 6},
+            {'rule': 'unknown_shift', 'employee_id': 2, 'shift_id': 99},
+            {'rule': 'unknown_employee', 'employee_id': 7, 'shift_id': 1},
+        ])
+
+        schedule.remove_employee_from_shift(2, 3)
+        violations = iter_violations(schedule, employees, shifts)
+        self.assertEqual(next(violations)['rule'], 'overlap')
+        self.assertEqual(list(violations)[-1], {'rule': 'understaffed', 'employee_id': None, 'shift_id': 3,
+                                                'missing': 1})
+
+    def test_assigned_schedule_is_valid(self):
+        """Lo que arma assign_shifts no tiene violaciones salvo los turnos incompletos."""
+        employees = [Employee(i, f"E{i}", max_hours_per_week=8 + 4 * (i % 4),
+                              unavailable_days={DAYS[i % 7], DAYS[(i * 3) % 7]}) for i in range(1, 13)]
+        shifts = [Shift(i, DAYS[i % 7], start_hour=(i * 5) % 20, duration_hours=4 + i % 5,
+                        required_employees=1 + i % 3) for i in range(1, 31)]
+        result = assign_shifts(employees, shifts)
+
+        violations = validate_schedule(result['schedule'], employees, shifts)
+        self.assertEqual({violation['rule'] for violation in violations} - {'understaffed'}, set())
+        self.assertEqual(len(violations), len(result['warnings']))
+
 
 class TestModels(unittest.TestCase):
     """Tests para los modelos."""
@@ -349,6 +744,54 @@ class TestModels(unittest.TestCase):
         self.assertTrue(employee.is_available('wednesday'),
                        "Ana debería estar disponible los miércoles")
 
+    def test_compact_models(self):
+        """Días como entero y máscara de 7 bits, sin __dict__; aceptan nombres o índices."""
+        employee = Employee(1, "Ana", max_hours_per_week=40, unavailable_days={'monday', 4})
+        shift = Shift(1, 2, start_hour=8, duration_hours=8, required_employees=1)
+
+        self.assertEqual(employee.unavailable_mask, 0b10001)
+        self.assertEqual(employee.unavailable_days, {'monday', 'friday'})
+        self.assertFalse(employee.is_available(0))
+        self.assertEqual((shift.day, shift.day_index), ('wednesday', 2))
+        self.assertEqual(Shift(1, 'wednesday', 8, 8, 1).week_start(), shift.week_start())
+        self.assertFalse(hasattr(employee, '__dict__') or hasattr(shift, '__dict__'))
+        for bad_day in ('funday', 7, True):
+            with self.assertRaises(ValueError):
+                Shift(1, bad_day, start_hour=8, duration_hours=8, required_employees=1)
+        with self.assertRaisesRegex(ValueError, "Días no válidos"):
+            Employee(1, "Ana", max_hours_per_week=40, unavailable_days={'funday'})
+
+    def test_frozen_models(self):
+        """Las versiones congeladas no se modifican y se comparan por valor."""
+        frozen = FrozenShift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1)
+        ana = FrozenEmployee(1, "Ana", max_hours_per_week=40, unavailable_days={'monday'})
+
+        self.assertEqual(frozen, FrozenShift(1, 0, 8, 8, 1))
+        self.assertEqual(len({ana, FrozenEmployee(1, "Ana", 40, {'monday'})}), 1)
+        self.assertFalse(ana.is_available('monday'))
+        with self.assertRaises(AttributeError):
+            frozen.start_hour = 9
+        with self.assertRaises(AttributeError):
+            ana.unavailable_days = set()
+        result = assign_shifts([ana], [frozen, FrozenShift(2, 'tuesday', 8, 8, 1)])
+        self.assertEqual(result['employee_hours'], {1: 8})
+
+    def test_availability_index(self):
+        """Verifica el índice de disponibilidad por día y su actualización incremental."""
+        ana = Employee(1, "Ana", max_hours_per_week=40, unavailable_days={'monday'})
+        bob = Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set())
+        index = AvailabilityIndex([ana, bob])
+
+        self.assertEqual(index.employees_available('monday'), [2])
+        self.assertEqual(index.employees_available('tuesday'), [1, 2])
+
+        # Ana cambia su disponibilidad: solo se actualizan sus bits
+        ana.unavailable_days = {'tuesday'}
+        index.update_employee(ana)
+        self.assertTrue(index.is_available(1, 'monday'))
+        self.assertFalse(index.is_available(1, 'tuesday'))
+        self.assertTrue(index.is_available(2, 'tuesday'))
+
     def test_shift_end_hour(self):
         """Verifica el cálculo de hora de finalización del turno."""
         # Arrange & Act
@@ -357,7 +800,8 @@ class TestModels(unittest.TestCase):
 
         # Assert
         self.assertEqual(shift1.end_hour(), 16, "Turno de 8:00 con 8 horas debe terminar a las 16:00")
-        self.assertEqual(shift2.end_hour(), 26, "Turno de 20:00 con 6 horas debe terminar a las 26:00 (02:00 del día siguiente)")
+        self.assertEqual(shift2.end_hour(), 26,
+                         "Turno de 20:00 con 6 horas debe terminar a las 26:00 (02:00 del día siguiente)")
 
     def test_schedule_basic_operations(self):
         """Verifica operaciones básicas del Schedule."""
@@ -382,7 +826,241 @@ class TestModels(unittest.TestCase):
         # Verificar remove_employee_from_shift
         schedule.remove_employee_from_shift(1, 101)
         employees_shift_101_after = schedule.get_employees_for_shift(101)
-        self.assertNotIn(1, employees_shift_101_after, "Employee 1 no debería estar en shift 101 después de removerlo")
+        self.assertNotIn(1, employees_shift_101_after,
+                         "Employee 1 no debería estar en shift 101 después de removerlo")
+
+    def test_schedule_indexes_stay_in_sync(self):
+        """Verifica que ambos índices del Schedule se actualicen juntos."""
+        schedule = Schedule()
+        schedule.assign_employee_to_shift(1, 101)
+        schedule.assign_employee_to_shift(1, 101)  # Reasignar no duplica
+        schedule.assign_employee_to_shift(1, 102)
+
+        self.assertEqual(list(schedule.get_employees_for_shift(101)), [1])
+        self.assertTrue(schedule.is_assigned(1, 102))
+
+        schedule.remove_employee_from_shift(1, 101)
+        self.assertNotIn(101, schedule.get_shifts_for_employee(1),
+                         "Remover del turno también debe actualizar el índice por empleado")
+        self.assertNotIn(101, schedule.get_all_assignments(),
+                         "Un turno sin empleados no debe aparecer en las asignaciones")
+
+    def test_schedule_conflict_across_midnight(self):
+        """Verifica que un turno nocturno del lunes bloquee uno temprano del martes."""
+        late_monday = Shift(1, 'monday', start_hour=22, duration_hours=6, required_employees=1)     # 22-04
+        early_tuesday = Shift(2, 'tuesday', start_hour=2, duration_hours=6, required_employees=1)   # 02-08
+        later_tuesday = Shift(3, 'tuesday', start_hour=4, duration_hours=4, required_employees=1)   # 04-08
+        schedule = Schedule([late_monday, early_tuesday, later_tuesday])
+        schedule.assign_employee_to_shift(1, 1)
+
+        self.assertTrue(late_monday.overlaps_with(early_tuesday))
+        self.assertTrue(schedule.has_conflict(1, early_tuesday),
+                        "El turno del lunes 22-04 debe bloquear el del martes 02-08")
+        self.assertFalse(schedule.has_conflict(1, later_tuesday),
+                         "El turno del martes 04-08 es consecutivo, no se solapa")
+
+        schedule.remove_employee_from_shift(1, 1)
+        self.assertFalse(schedule.has_conflict(1, early_tuesday))
+
+    def test_schedule_hours_ledger(self):
+        """Verifica que las horas por empleado se actualicen con cada alta y baja."""
+        shift1 = Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1)
+        shift2 = Shift(2, 'tuesday', start_hour=8, duration_hours=6, required_employees=1)
+        schedule = Schedule([shift1])
+
+        schedule.assign_employee_to_shift(1, 1)
+        schedule.assign_employee_to_shift(1, 2)  # Turno aún no registrado
+        self.assertEqual(schedule.get_employee_hours(1), 8)
+        self.assertFalse(schedule.is_fully_registered(1))
+
+        schedule.register_shifts([shift1, shift2])
+        self.assertEqual(schedule.get_employee_hours(1), 14)
+
+        schedule.remove_employee_from_shift(1, 1)
+        self.assertEqual(schedule.get_employee_hours(1), 6)
+
+    def test_conflict_graph_matches_overlaps_with(self):
+        """Verifica que el grafo de barrido coincida con overlaps_with, incluso cruzando medianoche."""
+        shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),     # 8-16
+            Shift(2, 'monday', start_hour=14, duration_hours=6, required_employees=1),    # 14-20
+            Shift(3, 'monday', start_hour=16, duration_hours=4, required_employees=1),    # 16-20
+            Shift(4, 'monday', start_hour=22, duration_hours=6, required_employees=1),    # 22-04
+            Shift(5, 'tuesday', start_hour=2, duration_hours=4, required_employees=1),    # 02-06
+            Shift(6, 'sunday', start_hour=20, duration_hours=8, required_employees=1),    # 20-04
+        ]
+        graph = ConflictGraph(shifts)
+        graph.add_shift(Shift(7, 'monday', start_hour=15, duration_hours=2, required_employees=1))  # 15-17
+        shifts.append(graph.get_shift(7))
+
+        for shift in shifts:
+            expected = {other.id for other in shifts if other.id != shift.id and shift.overlaps_with(other)}
+            self.assertEqual(set(graph.conflicting_shifts(shift.id)), expected,
+                             f"Vecinos incorrectos para {shift}")
+
+        graph.remove_shift(2)
+        self.assertNotIn(2, graph.conflicting_shifts(1))
+
+    def test_conflict_graph_shared_start_hours(self):
+        """Agregar y quitar turnos que empiezan a la misma hora deja el grafo igual a uno recalculado."""
+        graph = ConflictGraph([Shift(1, 'monday', start_hour=8, duration_hours=2, required_employees=1)])  # 8-10
+        graph.add_shift(Shift(2, 'monday', start_hour=8, duration_hours=6, required_employees=1))          # 8-14
+        graph.add_shift(Shift(3, 'monday', start_hour=8, duration_hours=4, required_employees=1))          # 8-12
+        graph.remove_shift(1)
+        graph.add_shift(Shift(4, 'monday', start_hour=12, duration_hours=2, required_employees=1))         # 12-14
+        graph.remove_shift(3)
+        graph.add_shift(Shift(5, 'monday', start_hour=8, duration_hours=1, required_employees=1))          # 8-9
+
+        shifts = [graph.get_shift(shift_id) for shift_id in (2, 4, 5)]
+        rebuilt = ConflictGraph(shifts)
+        for shift in shifts:
+            self.assertEqual(set(graph.conflicting_shifts(shift.id)), set(rebuilt.conflicting_shifts(shift.id)),
+                             f"Vecinos incorrectos para {shift}")
+
+        # Lo mismo a través de update_schedule sobre un horario con grafo adjunto
+        employees = [Employee(1, "Ana", max_hours_per_week=40, unavailable_days=set())]
+        first = Shift(1, 'monday', start_hour=8, duration_hours=2, required_employees=1)
+        schedule = assign_shifts(employees, [first], conflict_graph=ConflictGraph([first]))['schedule']
+        update_schedule(schedule, {'added_shifts': [Shift(2, 'monday', start_hour=8, duration_hours=6,
+                                                          required_employees=1)]})
+        update_schedule(schedule, {'removed_shifts': [1]})
+        update_schedule(schedule, {'added_shifts': [Shift(3, 'monday', start_hour=8, duration_hours=4,
+                                                          required_employees=1)]})
+        self.assertEqual(set(schedule.get_conflict_graph().conflicting_shifts(2)), {3})
+
+    def test_assign_with_conflict_graph(self):
+        """assign_shifts debe dar el mismo horario con o sin grafo de conflictos."""
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=40, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days={'tuesday'}),
+        ]
+        shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=2),
+            Shift(2, 'monday', start_hour=14, duration_hours=6, required_employees=1),
+            Shift(3, 'monday', start_hour=22, duration_hours=6, required_employees=1),
+            Shift(4, 'tuesday', start_hour=2, duration_hours=4, required_employees=1),
+        ]
+
+        plain = assign_shifts(employees, shifts)
+        with_graph = assign_shifts(employees, shifts, conflict_graph=ConflictGraph(shifts))
+
+        self.assertEqual(repr(with_graph['schedule']), repr(plain['schedule']))
+        self.assertEqual(with_graph['warnings'], plain['warnings'])
+
+        # Ana tiene el turno del lunes 22-04, que bloquea el del martes 02-06
+        schedule = with_graph['schedule']
+        self.assertIsNotNone(schedule.get_conflict_graph())
+        self.assertIn(1, schedule.get_employees_for_shift(3))
+        self.assertTrue(schedule.has_conflict(1, shifts[3]))
+
+    def test_feasibility_cache_targeted_invalidation(self):
+        """Verifica que el cache solo descarte las entradas del empleado que cambió."""
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=8, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set()),
+        ]
+        shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+        ]
+        cache = FeasibilityCache()
+        schedule = Schedule(shifts, employees)
+        schedule.attach_feasibility_cache(cache)
+
+        schedule.assign_employee_to_shift(2, 1)
+        result = swap_shifts(schedule, 1, 2, 1, employees, shifts)   # Ana toma el lunes de Bob
+        self.assertTrue(result['success'])
+        self.assertEqual(cache.stats()['misses'], 1)
+
+        self.assertEqual(cache.get(1, 1), FeasibilityCache.MISS, "La asignación de Ana invalidó su entrada")
+        cache.put(2, 2, None)
+        schedule.assign_employee_to_shift(1, 2)   # Solo cambia Ana
+        self.assertIsNone(cache.get(2, 2), "La entrada de Bob no debe invalidarse")
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_feasibility_cache_reused_across_calls(self):
+        """Reutilizar un cache en otra llamada no aplica veredictos del horario anterior."""
+        employees = [
+            Employee(1, "Ana", max_hours_per_week=16, unavailable_days=set()),
+            Employee(2, "Bob", max_hours_per_week=16, unavailable_days=set()),
+        ]
+        first = Shift(1, 'monday', start_hour=8, duration_hours=4, required_employees=1)
+        second = Shift(2, 'monday', start_hour=10, duration_hours=4, required_employees=2)
+        cache = FeasibilityCache()
+        assign_shifts(employees, [first, second], feasibility_cache=cache)
+
+        result = assign_shifts(employees, [second], feasibility_cache=cache)
+        fresh = assign_shifts(employees, [second])
+        self.assertEqual(sorted(result['schedule'].get_employees_for_shift(2)), [1, 2])
+        self.assertEqual(result['warnings'], fresh['warnings'])
+
+    def test_feasibility_cache_lru_bound(self):
+        """El cache no crece más allá de max_size."""
+        cache = FeasibilityCache(max_size=2)
+        cache.put(1, 1, None)
+        cache.put(1, 2, 'hours')
+        cache.get(1, 1)             # (1, 1) pasa a ser el más reciente
+        cache.put(2, 1, 'overlap')  # Desaloja (1, 2)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get(1, 2), FeasibilityCache.MISS)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        cache.invalidate_shift(1)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats()['invalidations'], 2)
+
+    def test_schedule_assignments_view_is_read_only(self):
+        """Verifica que get_all_assignments sea una vista de solo lectura, no una copia."""
+        schedule = Schedule()
+        assignments = schedule.get_all_assignments()
+
+        schedule.assign_employee_to_shift(1, 101)
+        self.assertIs(schedule.get_all_assignments(), assignments)
+        self.assertIn(1, assignments[101], "La vista debe reflejar asignaciones posteriores")
+
+        with self.assertRaises(TypeError):
+            assignments[102] = [2]
+
+    def test_fork_is_isolated_copy_on_write(self):
+        """Verifica que padre e hijo de fork() no vean los cambios del otro."""
+        employees = [Employee(1, "Ana", 40, set()), Employee(2, "Luis", 40, set())]
+        shifts = [Shift(1, 'monday', 8, 8, 1), Shift(2, 'tuesday', 8, 8, 1)]
+        schedule = assign_shifts(employees, shifts)['schedule']
+        before = repr(schedule)
+
+        child = schedule.fork()
+        result = swap_shifts(child, 2, 1, 1, employees, shifts)
+        self.assertTrue(result['success'])
+        child.unregister_employee(1)
+
+        self.assertEqual(repr(schedule), before)
+        self.assertEqual(schedule.get_employee_hours(1), 8)
+        self.assertEqual(schedule.get_employees_available('monday'), [1, 2])
+        self.assertEqual(list(child.get_employees_for_shift(1)), [2])
+        self.assertEqual(child.get_employee_hours(2), 16)
+        self.assertEqual(child.get_employees_available('monday'), [2])
+
+        schedule.remove_employee_from_shift(2, 2)
+        self.assertEqual(list(child.get_employees_for_shift(2)), [2])
+        self.assertEqual(list(child.get_open_shift_ids()), [])
+
+    def test_diff_between_forks(self):
+        """Verifica que diff() liste solo las asignaciones que difieren."""
+        schedule = Schedule([Shift(1, 'monday', 8, 8, 2), Shift(2, 'monday', 20, 4, 1)])
+        schedule.assign_employee_to_shift(1, 1)
+        schedule.assign_employee_to_shift(2, 2)
+
+        child = schedule.fork()
+        grandchild = child.fork()
+        child.assign_employee_to_shift(3, 1)
+        grandchild.remove_employee_from_shift(2, 2)
+        grandchild.assign_employee_to_shift(4, 2)
+
+        self.assertEqual(schedule.diff(child), {'added': [(3, 1)], 'removed': []})
+        self.assertEqual(child.diff(grandchild), {'added': [(4, 2)], 'removed': [(3, 1), (2, 2)]})
+        self.assertEqual(schedule.diff(Schedule()), {'added': [], 'removed': [(1, 1), (2, 2)]})
+        self.assertEqual(schedule.diff(schedule.fork()), {'added': [], 'removed': []})
 
 
 # ============================================================================
@@ -0,0 +1,165 @@
+"""
+Tests para el servicio asyncio de horarios.
+"""
+
+import asyncio
+import json
+import random
+import sys
+import unittest
+from jsonl import EMPLOYEE_FIELDS, SHIFT_FIELDS
+from scheduler import VIOLATION_UNDERSTAFFED, validate_schedule
+from service import ScheduleService
+from workloads import generate_workload
+
+EMPLOYEES = [
+    {'id': 1, 'name': "Ana", 'max_hours_per_week': 40},
+    {'id': 2, 'name': "Bob", 'max_hours_per_week': 40, 'unavailable_days': ['monday']},
+] + [{'id': employee_id, 'name': f"Employee {employee_id}", 'max_hours_per_week': 8} for employee_id in range(3, 11)]
+SHIFTS = [
+    {'id': 1, 'day': 'monday', 'start_hour': 8, 'duration_hours': 8, 'required_employees': 1},
+    {'id': 2, 'day': 'tuesday', 'start_hour': 8, 'duration_hours': 8, 'required_employees': 1},
+]
+
+
+class TestScheduleService(unittest.TestCase):
+    """Tests para las operaciones y la concurrencia del servicio."""
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_operations(self):
+        """assign, consultas, swap y errores como respuestas."""
+        async def scenario():
+            service = ScheduleService()
+            assigned = await service.handle({'id': 1, 'op': 'assign', 'schedule': 's', 'employees': EMPLOYEES,
+                                             'shifts': SHIFTS})
+            self.assertEqual(assigned, {'id': 1, 'ok': True, 'result': {'warnings': [],
+                                        'employee_hours': {1: 8, 2: 8, **{i: 0 for i in range(3, 11)}}}})
+            self.assertEqual((await service.handle({'op': 'get_shifts_for_employee', 'schedule': 's',
+                                                    'employee_id': 1}))['result'], [1])
+            cover = await service.handle({'op': 'who_can_cover', 'schedule': 's', 'shift_id': 2, 'top_k': 1})
+            self.assertEqual(cover['result'], [{'employee_id': 1, 'remaining_hours': 32}])
+            swap = await service.handle({'op': 'swap', 'schedule': 's', 'employee1_id': 2, 'employee2_id': 1,
+                                         'shift_id': 1})
+            self.assertEqual(swap['result'], {'success': False, 'message': "Employee 2 no está disponible el monday"})
+
+            errors = [
+                ({'id': 7, 'op': 'nope'}, "Operación desconocida: 'nope'"),
+                ({'op': 'swap', 'schedule': 'x'}, "No existe el horario 'x'"),
+                ({'op': 'swap', 'schedule': 's', 'employee1_id': 2}, "Falta el campo 'employee2_id'"),
+                ({'op': 'assign', 'schedule': 's', 'employees': [{'id': 1}], 'shifts': []},
+                 "employees[0]: faltan campos"),
+            ]
+            for request, message in errors:
+                response = await service.handle(request)
+                self.assertFalse(response['ok'])
+                self.assertEqual(response['id'], request.get('id'))
+                self.assertIn(message, response['error'])
+
+        self.run_async(scenario())
+
+    def test_conflicting_swaps_are_serialized(self):
+        """Muchos intercambios a la vez por el turno de Ana: gana uno solo, por TCP."""
+        async def scenario():
+            service = ScheduleService()
+            server = await service.serve(port=0)
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            assign = {'id': 0, 'op': 'assign', 'schedule': 's', 'employees': EMPLOYEES, 'shifts': SHIFTS}
+            writer.write(json.dumps(assign).encode() + b'\n')
+            self.assertTrue(json.loads(await reader.readline())['ok'])
+
+            for employee_id in range(3, 11):
+                writer.write(json.dumps({'id': employee_id, 'op': 'swap', 'schedule': 's',
+                                         'employee1_id': employee_id, 'employee2_id': 1,
+                                         'shift_id': 1}).encode() + b'\n')
+                # Las consultas intercaladas no corren a la vez que los intercambios, pero todas responden
+                writer.write(json.dumps({'id': -employee_id, 'op': 'who_can_cover', 'schedule': 's',
+                                         'shift_id': 2}).encode() + b'\n')
+            responses = [json.loads(await reader.readline()) for _ in range(2 * 8)]
+            covers = [response for response in responses if response['id'] < 0]
+            responses = [response for response in responses if response['id'] > 0]
+            self.assertTrue(all(response['ok'] for response in covers))
+            writer.close()
+            server.close()
+            await server.wait_closed()
+
+            self.assertEqual(sorted(response['id'] for response in responses), list(range(3, 11)))
+            self.assertEqual(sum(response['result']['success'] for response in responses), 1)
+            self.assertEqual(len(service._entries['s'].schedule.get_employees_for_shift(1)), 1)
+
+        self.run_async(scenario())
+
+    def test_threaded_swaps_keep_schedule_valid(self):
+        """Intercambios independientes en hilos, con el índice de horas restantes ya armado."""
+        employees, shifts = generate_workload(300, seed=3)
+        rng = random.Random(3)
+
+        def reverse(request):
+            return {**request, 'employee1_id': request['employee2_id'], 'employee2_id': request['employee1_id']}
+
+        async def scenario():
+            service = ScheduleService()
+            assigned = await service.handle({
+                'op': 'assign', 'schedule': 's',
+                'employees': [{name: (sorted(e.unavailable_days) if name == 'unavailable_days' else getattr(e, name))
+                               for name in EMPLOYEE_FIELDS} for e in employees],
+                'shifts': [{name: getattr(s, name) for name in SHIFT_FIELDS} for s in shifts]})
+            self.assertTrue(assigned['ok'])
+            entry = service._entries['s']
+            headcount = {shift_id: len(ids) for shift_id, ids in entry.schedule.get_all_assignments().items()}
+
+            # Intercambios válidos sin empleados ni turnos en común: todos se aplican, y al revés también
+            requests = []
+            used = set()
+            for shift_id in rng.sample(sorted(headcount), len(headcount)):
+                holders = [employee_id for employee_id in entry.schedule.get_employees_for_shift(shift_id)
+                           if employee_id not in used]
+                candidates = [candidate['employee_id'] for candidate in (await service.handle(
+                    {'op': 'who_can_cover', 'schedule': 's', 'shift_id': shift_id}))['result']
+                    if candidate['employee_id'] not in used]
+                if holders and candidates:
+                    used.update((holders[0], candidates[0]))
+                    requests.append({'op': 'swap', 'schedule': 's', 'shift_id': shift_id,
+                                     'employee1_id': candidates[0], 'employee2_id': holders[0]})
+            self.assertGreater(len(requests), 50)
+
+            # El intercambio espera el lock de escritura del horario aunque sus claves estén libres
+            entry._write_lock.acquire()
+            try:
+                pending = asyncio.create_task(service.handle(requests[0]))
+                await asyncio.sleep(0.05)
+                self.assertFalse(pending.done())
+                self.assertFalse(entry.schedule.is_assigned(requests[0]['employee1_id'], requests[0]['shift_id']))
+            finally:
+                entry._write_lock.release()
+            self.assertTrue((await pending)['result']['success'])
+            self.assertTrue((await service.handle(reverse(requests[0])))['result']['success'])
+
+            # Cambios de hilo muy frecuentes, para que los hilos se intercalen dentro de cada intercambio
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            try:
+                for _ in range(20):
+                    responses = await asyncio.gather(*(service.handle(request) for request in requests))
+                    self.assertTrue(all(response['ok'] and response['result']['success']
+                                        for response in responses), responses)
+                    requests = [reverse(request) for request in requests]
+            finally:
+                sys.setswitchinterval(switch_interval)
+
+            schedule = entry.schedule
+            self.assertEqual({shift_id: len(ids) for shift_id, ids in schedule.get_all_assignments().items()},
+                             headcount)
+            self.assertEqual([violation for violation in validate_schedule(schedule, employees, shifts)
+                              if violation['rule'] != VIOLATION_UNDERSTAFFED], [])
+            self.assertEqual(schedule.get_employees_by_remaining_hours('monday'),
+                             sorted((schedule.get_employee_hours(employee.id) - employee.max_hours_per_week,
+                                     employee.id) for employee in employees if employee.is_available('monday')),
+                             "El índice de horas restantes sigue ordenado y al día")
+
+        self.run_async(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+"""
+Tests para la persistencia de horarios en SQLite.
+"""
+
+import os
+import tempfile
+import unittest
+from models import Employee, Shift
+from scheduler import assign_shifts, swap_shifts
+from store import ScheduleStore
+
+
+class TestScheduleStore(unittest.TestCase):
+    """Tests para guardar, consultar y cargar horarios por semana."""
+
+    def setUp(self):
+        self.employees = [
+            Employee(1, "Ana", max_hours_per_week=16, unavailable_days={'sunday'}),
+            Employee(2, "Bob", max_hours_per_week=16, unavailable_days=set()),
+            Employee(3, "Cai", max_hours_per_week=16, unavailable_days=set()),
+        ]
+        self.shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=2),
+            Shift(2, 'tuesday', start_hour=8, duration_hours=8, required_employees=1),
+        ]
+
+    def test_round_trip_and_indexed_queries(self):
+        """Lo guardado se consulta sin cargar y se recarga igual, también desde otra conexión."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'schedules.db')
+            schedule = assign_shifts(self.employees, self.shifts)['schedule']
+            with ScheduleStore(path) as store:
+                self.assertEqual(store.save_employees(self.employees), 3)
+                self.assertEqual(store.save(7, schedule, self.shifts), {'added': 3, 'removed': 0})
+
+            with ScheduleStore(path) as store:
+                self.assertEqual(store.weeks(), [7])
+                self.assertEqual(store.get_employees_for_shift(1, week=7), sorted(schedule.get_employees_for_shift(1)))
+                self.assertEqual(store.get_shifts_for_employee(1, week=7), sorted(schedule.get_shifts_for_employee(1)))
+                self.assertEqual(store.get_shifts_for_employee(1, week=8), [])
+
+                loaded = store.load(7)
+                self.assertEqual({k: set(v) for k, v in loaded.get_all_assignments().items()},
+                                 {k: set(v) for k, v in schedule.get_all_assignments().items()})
+                self.assertEqual(loaded.get_employee(1).unavailable_days, {'sunday'})
+                self.assertEqual(loaded.get_employee_hours(1), schedule.get_employee_hours(1))
+                self.assertEqual(list(store.iter_assignments(first_week=7, employee_id=1)),
+                                 [(7, shift_id, 1) for shift_id in sorted(schedule.get_shifts_for_employee(1))])
+
+    def test_save_writes_only_changes(self):
+        """Después de un cambio, save() escribe solo la diferencia, con o sin el mismo objeto."""
+        with ScheduleStore(':memory:') as store:
+            schedule = assign_shifts(self.employees, self.shifts)['schedule']
+            store.save(1, schedule, self.shifts)
+            holder = next(iter(schedule.get_employees_for_shift(2)))
+            taker = next(e.id for e in self.employees if not schedule.is_assigned(e.id, 2) and
+                         swap_shifts(schedule.fork(), e.id, holder, 2, self.employees, self.shifts)['success'])
+            swap_shifts(schedule, taker, holder, 2, self.employees, self.shifts)
+
+            self.assertEqual(store.save(1, schedule), {'added': 1, 'removed': 1})
+            self.assertEqual(store.save(1, schedule), {'added': 0, 'removed': 0})
+            self.assertEqual(store.get_employees_for_shift(2, week=1), [taker])
+
+            fresh = assign_shifts(self.employees, self.shifts)['schedule']
+            representation = {name: type(value) for name, value in vars(fresh).items()}
+            self.assertEqual(store.save(1, fresh), {'added': 1, 'removed': 1})
+            self.assertEqual(store.get_employees_for_shift(2, week=1), [holder])
+
+            # Guardar o cargar no cambia la representación interna del Schedule (no lo copia con fork)
+            for _ in range(3):
+                store.save(1, fresh)
+            self.assertEqual({name: type(value) for name, value in vars(fresh).items()}, representation)
+            loaded = store.load(1)
+            store.save(1, loaded)
+            self.assertEqual({name: type(value) for name, value in vars(loaded).items()}, representation)
+
+    def test_save_shifts_replaces_week(self):
+        """Volver a guardar los turnos de una semana borra los que ya no están y sus asignaciones."""
+        with ScheduleStore(':memory:') as store:
+            store.save_employees(self.employees)
+            schedule = assign_shifts(self.employees, self.shifts)['schedule']
+            store.save(1, schedule, self.shifts)
+            store.save(2, schedule, self.shifts)
+
+            self.assertEqual(store.save_shifts(1, self.shifts[:1]), 1)
+            self.assertEqual([shift.id for shift in store.get_shifts(1)], [1])
+            self.assertEqual(store.get_employees_for_shift(2, week=1), [])
+            self.assertEqual([shift.id for shift in store.get_shifts(2)], [1, 2])
+            self.assertEqual(store.get_employees_for_shift(2, week=2), sorted(schedule.get_employees_for_shift(2)))
+
+            # Lo que queda se recarga sin el turno borrado y volver a guardar no escribe nada
+            loaded = store.load(1)
+            self.assertEqual(set(loaded.get_all_assignments()), {1})
+            self.assertEqual(store.save(1, loaded), {'added': 0, 'removed': 0})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
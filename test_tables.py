@@ -0,0 +1,75 @@
+"""
+Tests para los contenedores columnares.
+"""
+
+import unittest
+from models import Employee, Shift
+from scheduler import assign_shifts
+from tables import EmployeeTable, ShiftTable
+
+
+class TestTables(unittest.TestCase):
+    """Tests para EmployeeTable y ShiftTable."""
+
+    def setUp(self):
+        self.employees = [
+            Employee(1, "Ana", max_hours_per_week=10, unavailable_days={'monday'}),
+            Employee(2, "Bob", max_hours_per_week=40, unavailable_days=set()),
+        ]
+        self.shifts = [
+            Shift(1, 'monday', start_hour=8, duration_hours=8, required_employees=1),    # 8-16
+            Shift(2, 'monday', start_hour=14, duration_hours=6, required_employees=1),   # 14-20
+            Shift(3, 'monday', start_hour=22, duration_hours=4, required_employees=1),   # 22-02
+            Shift(4, 'tuesday', start_hour=1, duration_hours=6, required_employees=1),   # 01-07
+        ]
+
+    def test_vectorized_end_hours_and_overlaps(self):
+        """Verifica que las operaciones en bloque coincidan con las de Shift."""
+        table = ShiftTable.from_shifts(self.shifts)
+
+        self.assertEqual(list(table.end_hours()), [s.end_hour() for s in self.shifts])
+        mask = table.overlap_mask()
+        for i, shift1 in enumerate(self.shifts):
+            for j, shift2 in enumerate(self.shifts):
+                self.assertEqual(bool(mask[i][j]), shift1.overlaps_with(shift2),
+                                 f"La máscara debe coincidir con overlaps_with para {shift1} y {shift2}")
+
+    def test_eligible_rows(self):
+        """Verifica el filtrado en bloque por día y horas libres."""
+        table = EmployeeTable.from_employees(self.employees)
+
+        self.assertEqual(table.eligible_rows('monday', 8), [1])
+        self.assertEqual(table.eligible_rows('tuesday', 8), [0, 1])
+        self.assertEqual(table.eligible_rows('tuesday', 8, used_hours=[4, 0]), [1])
+        self.assertEqual(table.eligible_rows(0, 8), [1])
+
+    def test_day_indices(self):
+        """Las tablas aceptan días por nombre o por índice, igual que los modelos."""
+        employees = EmployeeTable()
+        employees.append(1, "Ana", 10, {0, 'sunday'})
+        shifts = ShiftTable()
+        shifts.append(1, 1, start_hour=8, duration_hours=8, required_employees=1)
+
+        view = employees[0]
+        employee = Employee(1, "Ana", 10, {0, 'sunday'})
+        for day in (0, 'monday', 1, 'tuesday', 6):
+            self.assertEqual(view.is_available(day), employee.is_available(day))
+        self.assertEqual(shifts[0].day, 'tuesday')
+        with self.assertRaises(ValueError):
+            employees.append(2, "Bob", 10, {7})
+        with self.assertRaises(ValueError):
+            shifts.append(2, 'funday', start_hour=8, duration_hours=8, required_employees=1)
+
+    def test_assign_shifts_accepts_tables(self):
+        """Verifica que assign_shifts dé el mismo horario con tablas que con objetos."""
+        from_objects = assign_shifts(self.employees, self.shifts)
+        from_tables = assign_shifts(EmployeeTable.from_employees(self.employees),
+                                    ShiftTable.from_shifts(self.shifts))
+
+        self.assertEqual(repr(from_tables['schedule']), repr(from_objects['schedule']))
+        self.assertEqual(from_tables['employee_hours'], from_objects['employee_hours'])
+        self.assertEqual(from_tables['warnings'], from_objects['warnings'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
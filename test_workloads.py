@@ -0,0 +1,52 @@
+"""
+Tests para el generador de cargas sintéticas y el benchmark.
+"""
+
+import unittest
+from bench_scheduler import compare, run_size
+from workloads import generate_workload
+
+
+def shift_fields(shift) -> tuple:
+    return shift.id, shift.day, shift.start_hour, shift.duration_hours, shift.required_employees
+
+
+class TestWorkloads(unittest.TestCase):
+    """Tests para generate_workload y el harness de bench_scheduler."""
+
+    def test_seeded_and_shaped_by_parameters(self):
+        """La misma semilla da la misma carga, también en formato columnar."""
+        employees, shifts = generate_workload(200, seed=3)
+        again_employees, again_shifts = generate_workload(200, seed=3)
+        table_employees, table_shifts = generate_workload(200, seed=3, columnar=True)
+
+        self.assertEqual([shift_fields(s) for s in shifts], [shift_fields(s) for s in again_shifts])
+        self.assertEqual([e.unavailable_days for e in employees], [e.unavailable_days for e in again_employees])
+        self.assertEqual([(s.id, s.day, s.start_hour) for s in shifts],
+                         [(s.id, s.day, s.start_hour) for s in table_shifts])
+        self.assertEqual([e.unavailable_days for e in employees], [e.unavailable_days for e in table_employees])
+        self.assertNotEqual([shift_fields(s) for s in shifts],
+                            [shift_fields(s) for s in generate_workload(200, seed=4)[1]])
+
+        busy, _ = generate_workload(200, unavailability=0.0)
+        self.assertTrue(all(not e.unavailable_days for e in busy))
+        _, peaks = generate_workload(200, overlap=1.0)
+        self.assertEqual({s.start_hour for s in peaks}, {6, 8, 14, 22})
+        _, double = generate_workload(200, staffing_ratio=1.8)
+        self.assertGreater(len(double), 1.5 * len(shifts))
+
+    def test_harness_flags_regressions(self):
+        """El benchmark mide un tamaño chico y detecta regresiones contra un baseline."""
+        metrics = run_size(50, seed=0, columnar=False, swaps=10, measure_memory=True)
+        self.assertEqual(metrics['employees'], 50)
+        self.assertGreater(metrics['assignments_per_second'], 0)
+        self.assertGreater(metrics['peak_memory_mib'], 0)
+
+        slower = dict(metrics, wall_time=max(metrics['wall_time'], 0.02) * 2, coverage=metrics['coverage'] - 0.1)
+        self.assertEqual(compare({'50': metrics}, {'50': metrics}, 0.25), [])
+        regressions = compare({'50': slower}, {'50': dict(metrics, wall_time=max(metrics['wall_time'], 0.02))}, 0.25)
+        self.assertEqual(len(regressions), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)